@@ -0,0 +1,12 @@
+"""Guideline decision logic shared by the Streamlit app and batch tooling.
+
+Nothing in this package imports Streamlit. The scalar core (``decision``,
+``rules``, ``codes``, ``catalog``, ``pathways``) is pure Python and imports
+in a few milliseconds, so workers, CLIs and services start fast; NumPy is
+loaded only by the batch modules (``cohort``, ``lookup``, ``cli``,
+``parallel``) or when a rule is vectorized.
+"""
+
+from .decision import calculate_risk_local, get_bcr_risk, get_diagnosis_rec, score_patient
+
+__all__ = ["calculate_risk_local", "get_bcr_risk", "get_diagnosis_rec", "score_patient"]
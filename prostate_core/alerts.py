@@ -0,0 +1,190 @@
+"""Streaming PSADT alerts over an incoming PSA lab feed.
+
+``AlertStream.push(patient_id, time, psa)`` folds one result into that
+patient's running regression (Welford-style updates of the centered sums,
+O(1) per result, no refit over the history). It then re-derives PSADT,
+scores the patient with ``decision.score_patient`` and returns an ``Alert``
+when the recommendation key changes, e.g. ``rec_bcr_low`` ->
+``rec_bcr_embark`` as PSADT drops below 9 months, or ``rec_nmcrpc_low`` ->
+``rec_nmcrpc_high`` below 10.
+
+The remaining sidebar inputs (phase, primary therapy, ISUP, ...) come from a
+per-patient ``context`` record, falling back to ``default``. PSADT follows
+``kinetics.psa_kinetics``: it agrees with a full refit of the same values.
+
+Memory is bounded: at most ``max_patients`` trends are kept, least
+recently updated first out, and trends idle for ``max_idle_days`` of feed
+time are dropped. An evicted patient simply starts a new trend.
+
+    python -m prostate_core.alerts feed.csv --context patients.parquet
+
+reads ``patient_id,date,psa`` rows (``-`` for stdin) and prints one JSON
+line per alert.
+"""
+
+import argparse
+import collections
+import csv
+import datetime
+import json
+import math
+import sys
+
+from . import kinetics, record
+from .codes import PHASE_BCR, PHASE_KEYS
+from .decision import score_patient
+
+Alert = collections.namedtuple("Alert", "patient_id time old_key new_key psadt n_psa")
+
+
+class PsaTrend:
+    """Running least-squares fit of ln(PSA) and PSA over time for one patient."""
+
+    __slots__ = ("t0", "n", "mean_t", "mean_log", "mean_psa", "s_tt", "s_tlog", "s_tpsa", "last", "key")
+
+    def __init__(self, t0):
+        self.t0 = t0  # days; times are stored relative to the first result
+        self.n = 0
+        self.mean_t = self.mean_log = self.mean_psa = 0.0
+        self.s_tt = self.s_tlog = self.s_tpsa = 0.0
+        self.last = t0
+        self.key = None
+
+    def add(self, t, psa):
+        x = t - self.t0
+        y = math.log(psa)
+        self.n += 1
+        dx = x - self.mean_t
+        self.mean_t += dx / self.n
+        dx_new = x - self.mean_t
+        self.s_tt += dx * dx_new
+        self.mean_log += (y - self.mean_log) / self.n
+        self.s_tlog += dx * (y - self.mean_log)
+        self.mean_psa += (psa - self.mean_psa) / self.n
+        self.s_tpsa += dx * (psa - self.mean_psa)
+        self.last = max(self.last, t)
+
+    def psadt(self, min_points=kinetics.MIN_POINTS):
+        """Doubling time in months (inf if not rising, NaN if undefined)."""
+        if self.n < min_points or self.s_tt <= 0:
+            return math.nan
+        slope = self.s_tlog / self.s_tt * kinetics.DAYS_PER_MONTH
+        return math.log(2) / slope if slope > 0 else math.inf
+
+    def velocity(self, min_points=kinetics.MIN_POINTS):
+        """ng/ml per year (NaN if undefined)."""
+        if self.n < min_points or self.s_tt <= 0:
+            return math.nan
+        return self.s_tpsa / self.s_tt * kinetics.DAYS_PER_YEAR
+
+
+class AlertStream:
+    def __init__(self, context=None, default=None, max_patients=500_000, max_idle_days=730,
+                 min_points=kinetics.MIN_POINTS):
+        self.context = context if context is not None else {}
+        self.default = dict(default if default is not None else {"phase": PHASE_BCR})
+        self.max_patients = max_patients
+        self.max_idle_days = max_idle_days
+        self.min_points = min_points
+        self.trends = collections.OrderedDict()  # patient id -> PsaTrend, least recent first
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.trends)
+
+    def push(self, patient_id, time, psa):
+        """Add one PSA result; returns an ``Alert`` if the recommendation changed."""
+        if psa is None or not psa > 0:
+            return None
+        t = kinetics.to_days(time)
+        trend = self.trends.get(patient_id)
+        if trend is None:
+            trend = self.trends[patient_id] = PsaTrend(t)
+        else:
+            self.trends.move_to_end(patient_id)
+        trend.add(t, float(psa))
+        self._evict(t)
+
+        psadt = trend.psadt(self.min_points)
+        if psadt != psadt:
+            return None
+        record = dict(self.context.get(patient_id, self.default), psadt=psadt)
+        key = score_patient(record)
+        old, trend.key = trend.key, key
+        if old is None or old == key:
+            return None
+        return Alert(patient_id, time, old, key, psadt, trend.n)
+
+    def _evict(self, now):
+        trends = self.trends
+        while len(trends) > self.max_patients:
+            trends.popitem(last=False)
+            self.evicted += 1
+        horizon = now - self.max_idle_days
+        while trends:
+            oldest = next(iter(trends.values()))
+            if oldest.last >= horizon:
+                break
+            trends.popitem(last=False)
+            self.evicted += 1
+
+
+def load_context(path):
+    """Patient records keyed by ``patient_id`` from a CSV/Parquet file of sidebar columns.
+
+    Kept as a ``record.PatientArray`` (44 bytes per patient) behind a mapping.
+    """
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path) if path.endswith((".parquet", ".pq")) else pa_csv.read_csv(path)
+    columns = {}
+    for name in table.column_names:
+        if name in record.FIELDS:
+            col = table.column(name)
+            if col.null_count:
+                col = col.fill_null(record.DEFAULTS[name])
+            columns[name] = col.to_numpy()
+    return record.PatientArray.from_columns(columns).by_id(table.column("patient_id").to_pylist())
+
+
+def _parse_time(text):
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.datetime.fromisoformat(text) if "T" in text or " " in text else datetime.date.fromisoformat(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.alerts", description=__doc__.splitlines()[0])
+    parser.add_argument("feed", help="CSV with patient_id,date,psa rows in arrival order ('-' = stdin)")
+    parser.add_argument("--context", help="CSV/Parquet with patient_id and sidebar columns (phase, ...)")
+    parser.add_argument("--default-phase", choices=PHASE_KEYS, default="bcr",
+                        help="phase of patients missing from --context (default bcr)")
+    parser.add_argument("--max-patients", type=int, default=500_000)
+    parser.add_argument("--max-idle-days", type=float, default=730)
+    args = parser.parse_args(argv)
+
+    stream = AlertStream(
+        context=load_context(args.context) if args.context else None,
+        default={"phase": PHASE_KEYS.index(args.default_phase)},
+        max_patients=args.max_patients,
+        max_idle_days=args.max_idle_days,
+    )
+    fh = sys.stdin if args.feed == "-" else open(args.feed, newline="", encoding="utf-8")
+    try:
+        for row in csv.DictReader(fh):
+            pid = row["patient_id"]
+            pid = int(pid) if pid.isdigit() else pid
+            alert = stream.push(pid, _parse_time(row["date"]), float(row["psa"]) if row["psa"] else None)
+            if alert:
+                print(json.dumps(dict(alert._asdict(), time=row["date"])), flush=True)
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    print(f"{len(stream)} active trends, {stream.evicted} evicted", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""Benchmark suite: ``python -m prostate_core.bench [-o results.json]``.
+
+Groups (``--only`` selects a subset):
+
+- ``startup``: cold ``import prostate_core`` in a fresh interpreter
+- ``scalar``: every rule in ``rules.py`` and the lookup-table variants
+- ``catalog``: translation loading, cold (cache cleared) and warm
+- ``mermaid``: pathway source generation and uncached SVG rendering
+- ``apptest``: a full rerun of ``Prostate-Cancer1.py`` for every entry of
+  ``extent_opts`` in every language, through Streamlit's AppTest harness
+- ``batch``: ``cohort.score_sidebar`` throughput on a random cohort
+
+Each result records the median and minimum time per call over ``repeat``
+rounds (plus ``rows_per_s`` for batch scoring). The JSON also stores the
+Python/NumPy versions and the git commit. ``--compare old.json`` prints the
+ratio to an earlier run and exits with status 1 when any median is slower
+than ``--tolerance`` times the old one, so a new guideline version can be
+checked before it is deployed.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from . import catalog, codes, cohort, lookup, mermaid_svg, pathways, rules
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Prostate-Cancer1.py")
+GROUPS = ("startup", "scalar", "catalog", "mermaid", "apptest", "batch")
+
+# One representative call per rule; option inputs take their code.
+SCALAR_CASES = {
+    rules.ROTTERDAM: (0.12, False, True),
+    rules.DIAGNOSIS: (codes.PIRADS_3, 0.12, False, False),
+    rules.LOCALIZED: (12.0, 0, 1),
+    rules.BCR: (codes.PRIMARY_RP, 14.0, 1, 0.0),
+    rules.BCR_PANEL: (codes.PRIMARY_EBRT, 10.0, 2, 24.0),
+    rules.LOCALLY_ADVANCED: (True,),
+    rules.NMCRPC: (8.0,),
+    rules.MHSPC: (False,),
+    rules.MCRPC: (codes.PRIOR_ARPI,),
+    rules.LOCALIZED_FIRST_TRY: (12.0, 0, 2),
+}
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """Seconds per call of ``func()``: median and minimum over ``repeat`` rounds.
+
+    Each round runs ``func`` often enough to take about ``min_time`` seconds.
+    """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9))))
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(rounds), "min_s": min(rounds), "calls": number * repeat}
+
+
+def bench_startup(repeat):
+    """Cold import of the scalar core, timed inside a fresh interpreter."""
+    code = ("import time; t = time.perf_counter(); import prostate_core; "
+            "print(time.perf_counter() - t)")
+    root = os.path.dirname(APP)
+    rounds = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True,
+                             text=True, check=True)
+        rounds.append(float(out.stdout))
+    return {"startup.import_prostate_core": {
+        "median_s": statistics.median(rounds), "min_s": min(rounds), "calls": repeat,
+    }}
+
+
+def bench_scalar(repeat):
+    results = {}
+    for rule, args in SCALAR_CASES.items():
+        func = rule.scalar
+        results[f"scalar.{rule.name}"] = measure(lambda: func(*args), repeat)
+    for name, table in lookup.TABLES.items():
+        args = SCALAR_CASES[next(r for r in SCALAR_CASES if r.name == name)]
+        results[f"lookup.{name}"] = measure(lambda: table(*args), repeat)
+    return results
+
+
+def bench_catalog(repeat):
+    results = {}
+    for app in ("", "first_try"):
+        prefix = f"catalog.{app or 'main'}"
+        for lang_name, lang_key in catalog.LANGUAGES.items():
+            def cold():
+                catalog.load.cache_clear()
+                catalog.load(lang_name, app)
+            results[f"{prefix}.{lang_key}.cold"] = measure(cold, repeat)
+            results[f"{prefix}.{lang_key}.warm"] = measure(lambda: catalog.load(lang_name, app), repeat)
+    return results
+
+
+def bench_mermaid(repeat):
+    builders = {
+        "diagnosis": lambda: pathways.diagnosis(0.12),
+        "localized": lambda: pathways.localized("rec_multi_high"),
+        "locally_advanced": lambda: pathways.locally_advanced(True),
+        "bcr": lambda: pathways.BCR["embark"],
+        "nmcrpc": lambda: pathways.nmcrpc(True),
+        "mhspc": lambda: pathways.mhspc(True),
+        "mcrpc": lambda: pathways.mcrpc(catalog.load("English")["prior_opts"][0]),
+    }
+    results = {}
+    for name, build in builders.items():
+        results[f"mermaid.source.{name}"] = measure(build, repeat)
+        code = build()
+        results[f"mermaid.svg.{name}"] = measure(lambda: mermaid_svg.to_svg(code), repeat)
+    return results
+
+
+def bench_apptest(repeat, app=APP):
+    import logging
+
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    sys.path.insert(0, os.path.dirname(app))
+    try:
+        at = AppTest.from_file(app).run()
+    finally:
+        sys.path.pop(0)
+    if at.exception:
+        raise RuntimeError(f"{app}: {at.exception[0].message}")
+
+    results = {}
+    for lang_name, lang_key in catalog.LANGUAGES.items():
+        at.sidebar.selectbox[0].set_value(lang_name).run()
+        extent_opts = catalog.load(lang_name)["extent_opts"]
+        for phase_key, option in zip(cohort.PHASE_KEYS, extent_opts):
+            at.sidebar.selectbox[2].set_value(option).run()  # switch phase outside the timing
+            rounds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                at.run()
+                rounds.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(f"{lang_key}/{phase_key}: {at.exception[0].message}")
+            results[f"apptest.{phase_key}.{lang_key}"] = {
+                "median_s": statistics.median(rounds), "min_s": min(rounds), "calls": repeat,
+            }
+    return results
+
+
+def random_cohort(n, seed=0):
+    """Columns for ``cohort.score_sidebar`` spread over every phase."""
+    rng = np.random.default_rng(seed)
+    return {
+        "phase": rng.integers(0, len(cohort.PHASE_KEYS), n).astype(np.int8),
+        "psa": rng.uniform(0, 30, n),
+        "vol": rng.uniform(10, 80, n),
+        "isup_idx": rng.integers(0, 5, n).astype(np.int8),
+        "t_idx": rng.integers(0, 4, n).astype(np.int8),
+        "pirads_idx": rng.integers(0, 3, n).astype(np.int8),
+        "dre_abnormal": rng.random(n) < 0.2,
+        "fam_hist": rng.random(n) < 0.1,
+        "primary_idx": rng.integers(0, 2, n).astype(np.int8),
+        "psadt": rng.uniform(0, 24, n),
+        "interval": rng.uniform(0, 48, n),
+        "n_idx": rng.integers(0, 2, n).astype(np.int8),
+        "m_idx": rng.integers(0, 2, n).astype(np.int8),
+        "high_vol": rng.random(n) < 0.5,
+        "prior_idx": rng.integers(0, 4, n).astype(np.int8),
+    }
+
+
+def bench_batch(repeat, rows=1_000_000):
+    columns = random_cohort(rows)
+    res = measure(lambda: cohort.score_sidebar(columns), repeat, min_time=0.2)
+    res["rows"] = rows
+    res["rows_per_s"] = rows / res["median_s"]
+    return {"batch.score_sidebar": res}
+
+
+BENCHES = {
+    "startup": bench_startup,
+    "scalar": bench_scalar,
+    "catalog": bench_catalog,
+    "mermaid": bench_mermaid,
+    "apptest": bench_apptest,
+    "batch": bench_batch,
+}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(APP),
+                             capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(groups=GROUPS, repeat=5):
+    """Run the selected groups; returns the JSON-ready report."""
+    results = {}
+    for group in groups:
+        results.update(BENCHES[group](repeat))
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print median ratios against ``baseline``; returns the regressed names."""
+    old = baseline["results"]
+    regressed = []
+    for name, res in report["results"].items():
+        if name not in old:
+            continue
+        ratio = res["median_s"] / old[name]["median_s"]
+        flag = ""
+        if ratio > tolerance:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:45s} {old[name]['median_s'] * 1e6:12.2f} -> {res['median_s'] * 1e6:12.2f} us  x{ratio:.2f}{flag}")
+    return regressed
+
+
+def _print(report):
+    for name, res in report["results"].items():
+        extra = f"  ({res['rows_per_s']:,.0f} rows/s)" if "rows_per_s" in res else ""
+        median = res["median_s"]
+        text = f"{median * 1e3:10.2f} ms" if median >= 1e-3 else f"{median * 1e6:10.3f} us"
+        print(f"{name:45s} {text}{extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS), metavar="GROUP",
+                        help=f"groups to run ({', '.join(GROUPS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per benchmark (default 5)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="compare medians with an earlier report")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="slow-down factor counted as a regression (default 1.25)")
+    args = parser.parse_args(argv)
+
+    report = run(args.only, args.repeat)
+    _print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, allow_nan=False)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print()
+        regressed = compare(report, baseline, args.tolerance)
+        if regressed:
+            print(f"\n{len(regressed)} regression(s) above x{args.tolerance:g}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
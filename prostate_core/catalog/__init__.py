@@ -0,0 +1,31 @@
+"""Per-language text catalogs, loaded on first use and shared process-wide.
+
+Each language lives in its own module (``en.py``, ``first_try_de.py``, ...),
+so Python keeps it as cached bytecode and only the selected language is
+ever imported. ``load`` returns a read-only mapping with interned keys and
+strings and option lists frozen to tuples; every Streamlit session gets the
+same object instead of rebuilding the dict on each rerun.
+"""
+
+import functools
+import importlib
+import sys
+from types import MappingProxyType
+
+LANGUAGES = {"English": "en", "Deutsch": "de", "Español": "es"}
+
+
+def _freeze(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def load(lang_key, app=""):
+    """Text for ``lang_key`` ("English", ...); ``app="first_try"`` for First_Try_app.py."""
+    prefix = f"{app}_" if app else ""
+    module = importlib.import_module(f"{__name__}.{prefix}{LANGUAGES[lang_key]}")
+    return MappingProxyType({sys.intern(k): _freeze(v) for k, v in module.TEXT.items()})
@@ -0,0 +1,236 @@
+"""Deutsch text catalog for Prostate-Cancer1.py."""
+
+TEXT = {
+    "title": "Prostatakarzinom Algorithmus (EAU / S3-Leitlinie 2025)",
+    "sidebar_title": "Konfiguration",
+    "form_mode_label": "Formularmodus (Eingaben gesammelt übernehmen)",
+    "apply_label": "Übernehmen",
+    "screening_note": "ℹ️ **Hinweis:** DRU ist für das **Staging** (cT2 vs cT3) wichtig, für das **Screening** (PROBASE) jedoch umstritten.",
+
+    "extent_label": "Krankheitsphase",
+    "genetic_label": "Genetische Testung (Keimbahn/Somatisch)",
+    "psa_label": "PSA-Wert (ng/ml)",
+    "vol_label": "Prostatavolumen (ml/cc)",
+    "pirads_label": "mpMRT PIRADS",
+    "isup_label": "ISUP Grad",
+    "tstage_label": "Klinisches T-Stadium",
+    "n_stage_label": "N-Stadium (Regionär)",
+    "meta_state_label": "Metastasen-Status",
+    "psadt_label": "PSA-Verdopplungszeit (Monate)",
+    "primary_tx_label": "Primärtherapie",
+    "recurrence_time_label": "Zeit bis Rezidiv (Monate)",
+    
+    "rotterdam_header": "Rotterdam Risiko-Kalkulator Inputs",
+    "age_label": "Alter (Jahre)",
+    "dre_label": "DRU Befund",
+    "fam_hist_label": "Familienanamnese PCa?",
+    "prev_bx_label": "Vorherige negative Biopsie?",
+    "dre_opts": ["Normal", "Abnormal (Suspekt)"],
+
+    "extent_opts": ["Diagnose (Rotterdam & Biopsie)", "Lokalisiert (cT1-2 N0)", "Lokal Fortgeschritten (cT3-4 oder cN1)", "Biochemisches Rezidiv (BCR)", "nmCRPC (M0 CRPC)", "Metastasiert (M1)"],
+    "genetic_opts": ["Nicht durchgeführt/Unbekannt", "Negativ", "BRCA1/2 Positiv", "Andere HRR Positiv", "MSI-High / dMMR"],
+    "pirads_opts": ["PIRADS 1-2", "PIRADS 3", "PIRADS 4-5"],
+    "n_stages": ["cN0 (Knoten Negativ)", "cN1 (Knoten Positiv)"],
+    "m_states": ["mHSPC (Hormonsensitiv)", "mCRPC (Kastrationsresistent)"],
+    "prior_opts": ["Nur ADT (Naiv)", "ADT + Docetaxel", "ADT + ARPI", "Tripel-Therapie"],
+    "primary_tx_opts": ["Radikale Prostatektomie (RP)", "Strahlentherapie (EBRT)"],
+
+    "header_diag": "Diagnose: Risiko & Biopsie",
+    "rotterdam_high": """
+        🔴 **Hochrisiko-Profil (Rotterdam Kriterien)**
+        *Risikofaktoren:* Suspekte DRU, Hohe PSA-Dichte (>0,15) oder Familienanamnese.
+        - **Empfehlung:** **mpMRT** obligatorisch. Bei PIRADS ≥ 3 **Biopsie**.
+        """,
+    "rotterdam_low": """
+        🟢 **Niedrigrisiko-Profil**
+        *Normale DRU, Geringe PSA-Dichte.*
+        - **Empfehlung:** MRT erwägen. Bei PIRADS 1-2 kann Biopsie ggf. unterbleiben (PSA-Monitoring).
+        """,
+    "rec_diag_biopsy": """
+        🔴 **Biopsie durchführen**
+        - **Methode:** Transperineal (1. Wahl) oder Transrektal.
+        - **Ziel:** Systematisch + Gezielt (Fusion) bei PIRADS ≥ 3.
+        """,
+    "rec_diag_consider": """
+        🟡 **Biopsie erwägen**
+        - **Kontext:** PIRADS 3 mit Grenzbefunden.
+        - **Entscheidung:** Abhängig von PSA-Dichte (≥ 0,10) und Patientenwunsch.
+        """,
+    "rec_diag_obs": """
+        🟢 **Beobachtung**
+        - **Kontext:** Unwahrscheinliches Karzinom.
+        - **Vorgehen:** PSA-Kontrolle. Keine sofortige Biopsie zur Vermeidung von Überdiagnose.
+        """,
+
+    "header_local": "Lokalisiertes Stadium (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Aktive Überwachung (AS)**
+        *S3-Leitlinie Besonderheit:*
+        - **Kriterium:** PSA ≤ 15 ng/ml (ISUP 1, cT1c/2a) in DE möglich (EAU <10).
+        - **Protokoll:** PSA alle 3-6 Mon, DRU 1x/Jahr, Re-Biopsie/MRT nach 12-18 Mon.
+        """,
+    "rec_curative": """
+        **Kurative Standardtherapie**
+        - **OP:** Radikale Prostatektomie + LAE.
+        - **RT:** IMRT/VMAT (74-80 Gy) + Kurzzeit-ADT (4-6 Mon).
+        """,
+    "rec_multi_high": """
+        **Hochrisiko Lokalisiert**
+        - **RT:** Dosis-eskaliert + **Langzeit-ADT** (2-3 Jahre).
+        - **OP:** RP + ausgedehnte LAE (Multimodal).
+        """,
+
+    "header_la": "Lokal Fortgeschritten (cT3-4 oder cN1)",
+    "rec_la_cn0": """
+        **Lokal Fortgeschritten (cT3-4 cN0)**
+        *High Risk Protokoll:*
+        - **Standard:** EBRT (Prostata + SB) + **Langzeit-ADT** (2-3 Jahre).
+        - **OP:** RP nur im multimodalen Setting.
+        """,
+    "rec_la_cn1": """
+        **Regionär Nodal Positiv (cN1)**
+        *STAMPEDE Protokoll (High Risk M0):*
+        1. **ADT:** Kontinuierlich (3 Jahre).
+        2. **Strahlentherapie:** Prostata + gesamtes Becken.
+        3. **Abirateron:** 1000 mg + Prednison 5 mg.
+           - *Dauer:* 2 Jahre.
+        
+        ⚠️ **Zulassungshinweis:**
+        - 🇪🇺 **EMA:** Abirateron für mHSPC zugelassen.
+        - 🇩🇪 **Deutschland:** cN1-Einsatz oft **Off-Label**. Kostenübernahmeantrag (Verweis auf STAMPEDE/S3) erforderlich.
+        """,
+
+    "header_bcr": "Biochemisches Rezidiv (BCR)",
+    "rec_bcr_rp": """
+        **Rezidiv nach RP (PSA > 0,2)**
+        - **Diagnostik:** PSMA-PET/CT.
+        - **Therapie:** Salvage-RT (Loge) +/- Lymphabfluss.
+        - **ADT:** Kurzzeit-ADT (6 Mon) addieren, wenn PSA >0,6.
+        """,
+    "rec_bcr_embark": """
+        🔴 **High Risk BCR (EMBARK / EAU High Risk)**
+        *Kriterium: PSADT < 9 Monate (EMBARK) oder PSADT < 1 Jahr (EAU).*
+        
+        **Therapie:**
+        - **Enzalutamid** (160 mg OD) + ADT.
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **EMA:** Enzalutamide seit 2024 für High-Risk BCR zugelassen.
+        """,
+    "rec_bcr_low": """
+        🟢 **Low Risk BCR (EAU)**
+        *Kriterium: PSADT > 1 Jahr UND ISUP < 4.*
+        - **Vorgehen:** Beobachtung (Monitoring) oder Salvage-RT.
+        """,
+
+    "header_nmcrpc": "Nicht-Metastasiertes CRPC (nmCRPC / M0)",
+    "crpc_criteria": """
+        **CRPC Definition (EAU):**
+        1. **Kastrationsniveau:** Testosteron < 50 ng/dL.
+        2. **Progress:** 3 PSA-Anstiege > 2,0 ng/mL.
+        3. **Keine Metastasen:** Im CT/Szinti.
+        """,
+    "rec_nmcrpc_high": """
+        🔴 **Hochrisiko nmCRPC (PSADT < 10 Monate)**
+        *1. Linie Standard:*
+        - **Apalutamid:** 240 mg.
+        - **Enzalutamid:** 160 mg.
+        - **Darolutamid:** 600 mg 2x tgl.
+        ✅ 🇪🇺 Alle voll zugelassen.
+        """,
+    "rec_nmcrpc_low": """
+        🟢 **Niedrigrisiko nmCRPC (PSADT > 10 Monate)**
+        - **Empfehlung:** Beobachtung unter ADT.
+        """,
+
+    "bone_prot_mhspc": """
+        🦴 **Osteoprotektion (mHSPC)**
+        *Ziel: Prävention ADT-induzierter Osteoporose.*
+        - **Denosumab:** 60 mg s.c. alle 6 Monate.
+        - **Zoledronsäure:** 4 mg i.v. jährlich.
+        - *Cave:* Hochdosis (120mg) in mHSPC nicht Standard.
+        """,
+    "bone_prot_mcrpc": """
+        🦴 **SRE-Prävention (mCRPC)**
+        *Ziel: Vermeidung pathologischer Frakturen.*
+        - **Denosumab (Xgeva):** 120 mg s.c. alle 4 Wochen.
+        - **Zoledronsäure:** 4 mg i.v. alle 3-4 Wochen.
+        - *Support:* Calcium + Vit D obligat.
+        """,
+
+    "header_mhspc": "Metastasiert Hormonsensitiv (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **Hohes Volumen / High Risk**
+        *Viszerale Met. ODER ≥4 Knochenmet.*
+        
+        **1. Linie Standard: Tripel-Therapie**
+        1. **ADT** (Kontinuierlich).
+        2. **Docetaxel:** 75 mg/m² q3w (6 Zyklen) ODER 50 mg/m² q2w.
+        3. **ARPI:**
+           - **Darolutamid:** 600 mg 2x tgl.
+           - *ODER* **Abirateron:** 1000 mg + Prednison.
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **Darolutamid:** Zugelassen für mHSPC + Docetaxel (ARASENS).
+        - 🇪🇺 **Abirateron:** Zugelassen für High Risk mHSPC (LATITUDE).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Geringes Volumen**
+        
+        **1. Linie Standard: Doublet + Lokaltherapie**
+        1. **ADT** + **ARPI** (Enzalutamid / Apalutamida).
+        2. **Prostata-RT:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **Cave:** Kein Docetaxel bei Low Volume (Toxizität > Nutzen).
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **Enzalutamid:** 160 mg (ARCHES).
+        - 🇪🇺 **Apalutamida:** 240 mg (TITAN).
+        """,
+
+    "header_mcrpc": "Metastasiert Kastrationsresistent (mCRPC)",
+    
+    "line1_naive": """
+        **1. Linie (ARPI-Naiv)**
+        - **Enzalutamid** oder **Abirateron**.
+        - *Alternativ:* Docetaxel bei hoher Symptomlast.
+        """,
+    
+    "line1_post_arpi": """
+        **1./2. Linie (Nach ARPI-Progress)**
+        *Mechanismus wechseln!*
+        - **Docetaxel:** 75 mg/m² q3w ODER 50 mg/m² q2w (PROSTY).
+        """,
+    
+    "line2_post_doc": """
+        **2./3. Linie (Nach Docetaxel)**
+        - **Cabazitaxel:** 25 mg/m² q3w.
+        - **Lu-177-PSMA:** 7,4 GBq q6w (wenn PSMA+).
+        - **Olaparib:** 300 mg 2x tgl (wenn BRCA+).
+        """,
+    
+    "rec_mcrpc_pembro": """
+        **Immuntherapie (Jede Linie)**
+        - **Pembrolizumab:** 200 mg q3w.
+        - *Indikation:* Nur bei MSI-High / dMMR.
+        """,
+    
+    "rec_mcrpc_lutetium": """
+        **Radioligandentherapie (PSMA+)**
+        - **Lu-177-PSMA-617:** 7,4 GBq alle 6 Wochen.
+        ✅ 🇪🇺 Zugelassen (VISION).
+        """,
+
+    "rec_mcrpc_parp": """
+        **PARP-Inhibitoren (BRCA1/2 Mutation)**
+        - **Olaparib:** 300 mg 2x tgl.
+        - **Talazoparib:** 0,5 mg 1x tgl.
+        ✅ 🇪🇺 Zugelassen.
+        """,
+    
+    "rec_mcrpc_ra223": """
+        **Knochen-Zielgerichtet (3. Linie/Symptome)**
+        - **Radium-223:** 55 kBq/kg q4w.
+        - *Indikation:* Nur Knochenmetastasen (keine viszeralen).
+        """
+}
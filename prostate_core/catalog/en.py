@@ -0,0 +1,242 @@
+"""English text catalog for Prostate-Cancer1.py."""
+
+TEXT = {
+    "title": "Prostate Cancer Algorithm (EAU / S3 Guidelines 2025)",
+    "sidebar_title": "Configuration",
+    "form_mode_label": "Form mode (apply inputs together)",
+    "apply_label": "Apply",
+    "screening_note": "ℹ️ **Note:** DRE is critical for **Staging** (cT2 vs cT3) but questionable for **Screening** (PROBASE study).",
+
+    # Labels
+    "extent_label": "Clinical Phase",
+    "genetic_label": "Genetic Testing Results",
+    "psa_label": "PSA Level (ng/ml)",
+    "vol_label": "Prostate Volume (cc)",
+    "psad_label": "PSA Density (ng/ml/cc)",
+    "pirads_label": "mpMRI PIRADS Score",
+    "isup_label": "ISUP Grade (Gleason)",
+    "tstage_label": "Clinical T-Stage",
+    "n_stage_label": "N-Stage (Regional Nodes)",
+    "meta_state_label": "Metastatic State",
+    "psadt_label": "PSA Doubling Time (months)",
+    "primary_tx_label": "Primary Therapy Received",
+    "recurrence_time_label": "Time to Recurrence (months)",
+    
+    # Rotterdam Specific
+    "rotterdam_header": "Rotterdam Risk Calculator Inputs",
+    "age_label": "Age (years)",
+    "dre_label": "DRE Findings (Digital Rectal Exam)",
+    "fam_hist_label": "Family History of PCa?",
+    "prev_bx_label": "Previous Negative Biopsy?",
+    "dre_opts": ["Normal", "Abnormal (Suspicious)"],
+    
+    # Options
+    "extent_opts": ["Diagnosis (Biopsy Decision)", "Localized (cT1-2 N0)", "Locally Advanced (cT3-4 or cN1)", "Biochemical Recurrence (BCR)", "nmCRPC (M0 CRPC)", "Metastatic (M1)"],
+    "genetic_opts": ["Not Performed/Unknown", "Negative", "BRCA1/2 Positive", "Other HRR Positive", "MSI-High / dMMR"],
+    "pirads_opts": ["PIRADS 1-2", "PIRADS 3", "PIRADS 4-5"],
+    "n_stages": ["cN0 (Nodes Negative)", "cN1 (Regional Nodes Positive)"],
+    "m_states": ["mHSPC (Hormone Sensitive)", "mCRPC (Castration Resistant)"],
+    "prior_opts": ["ADT Only", "ADT + Docetaxel", "ADT + ARPI", "Triple Therapy"],
+    "primary_tx_opts": ["Radical Prostatectomy (RP)", "Radiotherapy (EBRT)"],
+
+    # --- DIAGNOSIS ---
+    "header_diag": "Diagnosis: Risk Stratification & Biopsy",
+    "rotterdam_high": """
+        🔴 **High Risk Profile (Rotterdam Criteria)**
+        *Risk Factors:* Abnormal DRE, High PSA Density (>0.15), or Family History.
+        - **Recommendation:** **mpMRI** is mandatory. If PIRADS ≥ 3, perform **Biopsy**.
+        """,
+    "rotterdam_low": """
+        🟢 **Low Risk Profile**
+        *Normal DRE, Low PSA Density.*
+        - **Recommendation:** Discuss MRI. If PIRADS 1-2, biopsy can likely be omitted (Safety Net: PSA monitoring).
+        """,
+    "rec_diag_biopsy": """
+        🔴 **Perform Biopsy**
+        - **Method:** Transperineal (1st choice) or Transrectal.
+        - **Target:** Systematic + Targeted (fusion) for PIRADS ≥ 3.
+        """,
+    "rec_diag_consider": """
+        🟡 **Consider Biopsy**
+        - **Context:** PIRADS 3 with borderline risk.
+        - **Decision:** Driven by PSA Density (≥ 0.10) and patient preference.
+        """,
+    "rec_diag_obs": """
+        🟢 **Observation / Follow-up**
+        - **Context:** Low probability of csPCa.
+        - **Action:** PSA monitoring. Avoid immediate biopsy to reduce overdiagnosis.
+        """,
+
+    # --- LOCALIZED ---
+    "header_local": "Localized Disease (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Active Surveillance (AS)**
+        *Guideline Variation:*
+        - **EAU:** Strict PSA < 10 ng/ml.
+        - **S3 Germany:** PSA ≤ 15 ng/ml (ISUP 1, cT1c/2a, <50% cores) is eligible.
+        - **Protocol:** PSA q3-6mo, DRE q12mo, Re-biopsy/MRI at 12-18mo.
+        """,
+    "rec_curative": """
+        **Standard Curative Therapy**
+        - **Surgery:** Radical Prostatectomy (RP) + ePLND.
+        - **Radiotherapy:** IMRT/VMAT (74-80 Gy) + Short-term ADT (4-6 mo).
+        """,
+    "rec_multi_high": """
+        **High Risk Localized**
+        - **Radiotherapy:** Dose-escalated + **Long-term ADT** (2-3 years).
+        - **Surgery:** RP + Extended ePLND (Multimodal).
+        """,
+
+    # --- LOCALLY ADVANCED ---
+    "header_la": "Locally Advanced (cT3-4 or cN1)",
+    "rec_la_cn0": """
+        **Locally Advanced (cT3-4 cN0)**
+        *High Risk Protocol:*
+        - **Standard:** EBRT (Prostate + SV) + **Long-term ADT** (2-3 years).
+        - **Surgery:** RP only in multimodal setting.
+        """,
+    "rec_la_cn1": """
+        **Regional Nodal Disease (cN1)**
+        *STAMPEDE Protocol (High Risk M0):*
+        1. **ADT:** Continuous (3 years).
+        2. **Radiotherapy:** Prostate + Whole Pelvis.
+        3. **Abiraterone:** 1000 mg OD + Prednisone 5 mg.
+           - *Duration:* 2 years.
+        
+        ⚠️ **Approval Note:**
+        - 🇪🇺 **EMA:** Abiraterone approved for mHSPC. Use in cN1/M0 is Level 1 evidence (STAMPEDE) but label may vary.
+        - 🇩🇪 **Germany:** Often **Off-Label** for M0. Request reimbursement (Kostenübernahme).
+        """,
+
+    # --- BCR ---
+    "header_bcr": "Biochemical Recurrence (BCR)",
+    "rec_bcr_rp": """
+        **Post-RP Recurrence (PSA > 0.2)**
+        - **Diagnostic:** PSMA-PET/CT recommended.
+        - **Therapy:** Salvage RT (Prostate Bed) +/- Pelvic Nodes.
+        - **ADT:** Add Short-term ADT (6mo) if PSA >0.6 (GETUG-AFU 16).
+        """,
+    "rec_bcr_embark": """
+        🔴 **High Risk BCR (EMBARK / EAU High Risk)**
+        *Criteria: PSADT < 9 months (EMBARK) or PSADT < 1y (EAU).*
+        
+        **Therapy:**
+        - **Enzalutamide** (160 mg OD) + ADT (Leuprolide).
+        
+        ✅ **Approval:**
+        - 🇪🇺 **EMA:** Enzalutamide approved for High-Risk BCR (2024).
+        """,
+    "rec_bcr_low": """
+        🟢 **Low Risk BCR (EAU)**
+        *Criteria: PSADT > 1 year AND ISUP < 4.*
+        - **Action:** Observation (Monitoring) or Salvage RT.
+        """,
+
+    # --- nmCRPC ---
+    "header_nmcrpc": "Non-Metastatic CRPC (M0)",
+    "crpc_criteria": """
+        **CRPC Definition:**
+        1. Castrate Testosterone < 50 ng/dl.
+        2. PSA Progression (3 consecutive rises).
+        3. No visible metastases on conventional imaging.
+        """,
+    "rec_nmcrpc_high": """
+        🔴 **High Risk (PSADT < 10 mo)**
+        **1st Line Options:**
+        - **Apalutamide:** 240 mg OD.
+        - **Enzalutamide:** 160 mg OD.
+        - **Darolutamide:** 600 mg BID.
+        ✅ All approved (EMA/FDA).
+        """,
+    "rec_nmcrpc_low": """
+        🟢 **Low Risk (PSADT > 10 mo)**
+        - **Recommendation:** Observation (Continue ADT).
+        """,
+
+    # --- BONE PROTECTION ---
+    "bone_prot_mhspc": """
+        🦴 **Bone Health (mHSPC)**
+        *Goal: Prevent Osteoporosis/Fractures from ADT.*
+        - **Denosumab:** 60 mg s.c. every 6 months.
+        - **Zoledronic Acid:** 4 mg i.v. annually (or q3-6mo).
+        - *Note:* High-dose (120mg) is **NOT** standard for mHSPC unless specific high-risk/CRPC features exist.
+        """,
+    "bone_prot_mcrpc": """
+        🦴 **SRE Prevention (mCRPC)**
+        *Goal: Prevent Skeletal Related Events (Pathological fractures, cord compression).*
+        - **Denosumab (Xgeva):** 120 mg s.c. every 4 weeks.
+        - **Zoledronic Acid:** 4 mg i.v. every 3-4 weeks.
+        - *Supplement:* Calcium + Vit D. Dental check mandatory.
+        """,
+
+    # --- mHSPC ---
+    "header_mhspc": "Metastatic Hormone-Sensitive (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **High Volume / High Risk**
+        *Visceral Mets OR ≥4 Bone Mets*
+        
+        **1st Line Standard: Triple Therapy**
+        1. **ADT** (Continuous).
+        2. **Docetaxel:** 75 mg/m² q3w OR 50 mg/m² q2w (PROSTY).
+        3. **ARPI:**
+           - **Darolutamide:** 600 mg BID (ARASENS).
+           - *OR* **Abiraterone:** 1000 mg OD + Prednisone (PEACE-1).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Low Volume**
+        
+        **1st Line Standard: Doublet + Local RT**
+        1. **ADT** + **ARPI** (Enzalutamide / Apalutamide).
+        2. **Prostate RT:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **Don't:** No Docetaxel for Low Volume.
+        """,
+
+    # --- mCRPC ---
+    "header_mcrpc": "Metastatic Castration-Resistant (mCRPC)",
+    
+    "line1_naive": """
+        **1st Line (ARPI-Naïve)**
+        - **Enzalutamide:** 160 mg OD.
+        - **Abiraterone:** 1000 mg + Prednisone.
+        - *Alternative:* Docetaxel if symptomatic/visceral crisis.
+        """,
+    
+    "line1_post_arpi": """
+        **1st/2nd Line (Post-ARPI Progression)**
+        *Switch Mechanism! Do not use 2nd ARPI.*
+        - **Docetaxel:** 75 mg/m² q3w OR 50 mg/m² q2w.
+        """,
+    
+    "line2_post_doc": """
+        **2nd/3rd Line (Post-Docetaxel)**
+        - **Cabazitaxel:** 25 mg/m² q3w (CARD Trial).
+        - **Lu-177-PSMA:** 7.4 GBq q6w (if PSMA+).
+        - **Olaparib:** 300 mg BID (if BRCA+).
+        """,
+    
+    "rec_mcrpc_pembro": """
+        **Immunotherapy (Any Line)**
+        - **Pembrolizumab:** 200 mg q3w.
+        - *Indication:* MSI-High / dMMR only.
+        """,
+    
+    "rec_mcrpc_lutetium": """
+        **Radioligand Therapy (PSMA+)**
+        - **Lu-177-PSMA-617:** 7.4 GBq q6w (6 cycles).
+        ✅ 🇪🇺 Approved post-ARPI & Chemo (VISION).
+        """,
+
+    "rec_mcrpc_parp": """
+        **PARP Inhibitors (BRCA1/2 Mutation)**
+        - **Olaparib:** 300 mg BID.
+        - **Talazoparib:** 0.5 mg OD.
+        ✅ 🇪🇺 Approved.
+        """,
+    
+    "rec_mcrpc_ra223": """
+        **Bone-Targeted (3rd Line/Symptomatic)**
+        - **Radium-223:** 55 kBq/kg q4w.
+        - *Indication:* Symptomatic bone mets, NO visceral mets.
+        """
+}
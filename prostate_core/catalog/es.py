@@ -0,0 +1,237 @@
+"""Español text catalog for Prostate-Cancer1.py."""
+
+TEXT = {
+    "title": "Algoritmo Cáncer de Próstata (Guía S3 / EAU 2025)",
+    "sidebar_title": "Configuración",
+    "form_mode_label": "Modo formulario (aplicar datos juntos)",
+    "apply_label": "Aplicar",
+    "screening_note": "ℹ️ **Nota:** El tacto rectal es crítico para el **Estadiaje** (cT2 vs cT3) pero cuestionable para **Tamizaje** (PROBASE).",
+
+    "extent_label": "Fase de la Enfermedad",
+    "genetic_label": "Pruebas Genéticas",
+    "psa_label": "Nivel de PSA (ng/ml)",
+    "vol_label": "Volumen Prostático (cc)",
+    "psad_label": "Densidad de PSA",
+    "pirads_label": "Puntuación mpMRI PIRADS",
+    "isup_label": "Grado ISUP",
+    "tstage_label": "Estadio T Clínico",
+    "n_stage_label": "Estadio N (Regional)",
+    "meta_state_label": "Estado Metastásico",
+    "psadt_label": "Tiempo Duplicación PSA (meses)",
+    "primary_tx_label": "Terapia Primaria Recibida",
+    "recurrence_time_label": "Tiempo hasta Recurrencia (meses)",
+    
+    "rotterdam_header": "Calculadora Rotterdam Inputs",
+    "age_label": "Edad (años)",
+    "dre_label": "Hallazgos Tacto Rectal",
+    "fam_hist_label": "¿Historia Familiar?",
+    "prev_bx_label": "¿Biopsia previa negativa?",
+    "dre_opts": ["Normal", "Anormal (Sospechoso)"],
+
+    "extent_opts": ["Diagnóstico (Rotterdam & Biopsia)", "Localizado (cT1-2 N0)", "Localmente Avanzado (cT3-4 o cN1)", "Recurrencia Bioquímica (BCR)", "nmCRPC (M0 CRPC)", "Metastásico (M1)"],
+    "genetic_opts": ["No realizado/Desconocido", "Negativo", "BRCA1/2 Positivo", "Otro HRR Positivo", "MSI-Alto / dMMR"],
+    "pirads_opts": ["PIRADS 1-2", "PIRADS 3", "PIRADS 4-5"],
+    "n_stages": ["cN0 (Ganglios Negativos)", "cN1 (Ganglios Positivos)"],
+    "m_states": ["mHSPC (Hormonosensible)", "mCRPC (Resistente a Castración)"],
+    "prior_opts": ["Solo ADT (Naïve)", "ADT + Docetaxel", "ADT + ARPI", "Terapia Triple"],
+    "primary_tx_opts": ["Prostatectomía Radical (PR)", "Radioterapia (EBRT)"],
+
+    "header_diag": "Diagnóstico: Decisión de Biopsia",
+    "rotterdam_high": """
+        🔴 **Perfil Alto Riesgo (Rotterdam)**
+        *Factores:* Tacto Anormal, Densidad PSA >0.15 o Historia Familiar.
+        - **Recomendación:** **mpMRI** obligatoria. Si PIRADS ≥ 3 **Biopsia**.
+        """,
+    "rotterdam_low": """
+        🟢 **Perfil Bajo Riesgo**
+        *Tacto Normal, Densidad PSA Baja.*
+        - **Recomendación:** Considerar MRI. Si PIRADS 1-2, evitar biopsia (monitorizar PSA).
+        """,
+    "rec_diag_biopsy": """
+        🔴 **Realizar Biopsia**
+        - **Método:** Transperineal (1ª elección) o Transrectal.
+        - **Objetivo:** Sistemática + Dirigida (Fusión) si PIRADS ≥ 3.
+        """,
+    "rec_diag_consider": """
+        🟡 **Considerar Biopsia**
+        - **Contexto:** PIRADS 3 con hallazgos límite.
+        - **Decisión:** Depende de Densidad PSA (≥ 0.10) y preferencia paciente.
+        """,
+    "rec_diag_obs": """
+        🟢 **Observación**
+        - **Contexto:** Baja probabilidad de cáncer significativo.
+        - **Acción:** Monitorización PSA. Evitar biopsia inmediata.
+        """,
+
+    "header_local": "Enfermedad Localizada (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Vigilancia Activa (AS)**
+        *Variación Guía S3:*
+        - **Criterio:** PSA ≤ 15 ng/ml (ISUP 1, cT1c/2a) es elegible en Alemania (EAU estricto <10).
+        - **Protocolo:** PSA c/3-6m, Tacto c/12m, Re-biopsia/MRI a 12-18m.
+        """,
+    "rec_curative": """
+        **Terapia Curativa Estándar**
+        - **Cirugía:** Prostatectomía Radical (PR) + Linfadenectomía.
+        - **Radioterapia:** IMRT/VMAT (74-80 Gy) + ADT corto (4-6 m).
+        """,
+    "rec_multi_high": """
+        **Alto Riesgo Localizado**
+        - **Radioterapia:** Dosis escalada + **ADT Largo** (2-3 años).
+        - **Cirugía:** PR + Linfadenectomía Extendida.
+        """,
+
+    "header_la": "Localmente Avanzado (cT3-4 o cN1)",
+    "rec_la_cn0": """
+        **Localmente Avanzado (cT3-4 cN0)**
+        *Protocolo Alto Riesgo:*
+        - **Estándar:** EBRT (Próstata + VS) + **ADT Largo** (2-3 años).
+        - **Cirugía:** PR solo en entorno multimodal.
+        """,
+    "rec_la_cn1": """
+        **Enfermedad Nodal Regional (cN1)**
+        *Protocolo STAMPEDE (Alto Riesgo No Metastásico):*
+        1. **ADT:** Continuo (3 años).
+        2. **Radioterapia:** Próstata + Pelvis Completa.
+        3. **Abiraterona:** 1000 mg OD + Prednisona 5 mg.
+           - *Duración:* 2 años.
+        
+        ⚠️ **Nota Aprobación:**
+        - 🇪🇺 **EMA:** Abiraterona aprobada mHSPC. Uso en cN1/M0 basado en Evidencia Nivel 1 (STAMPEDE).
+        - 🇩🇪 **Alemania:** A menudo considera cN1 **Off-Label**. Solicitar reembolso.
+        """,
+
+    "header_bcr": "Recurrencia Bioquímica",
+    "rec_bcr_rp": """
+        **Recurrencia Post-PR (PSA > 0.2)**
+        - **Diagnóstico:** PSMA-PET/CT recomendado.
+        - **Terapia:** RT de Rescate (Lecho) +/- Ganglios.
+        - **ADT:** Añadir ADT corto (6m) si PSA >0.6.
+        """,
+    "rec_bcr_embark": """
+        🔴 **BCR Alto Riesgo (EMBARK / EAU High Risk)**
+        *Criterio: PSADT < 9 meses (EMBARK) o < 1 año (EAU).*
+        
+        **Terapia:**
+        - **Enzalutamida** (160 mg OD) + ADT.
+        
+        ✅ **Aprobación:**
+        - 🇪🇺 **EMA:** Enzalutamida aprobada para BCR Alto Riesgo (2024).
+        """,
+    "rec_bcr_low": """
+        🟢 **BCR Bajo Riesgo (EAU)**
+        *Criterio: PSADT > 1 año Y ISUP < 4.*
+        - **Acción:** Observación o RT de Rescate.
+        """,
+
+    "header_nmcrpc": "nmCRPC (CRPC No Metastásico / M0)",
+    "crpc_criteria": """
+        **Definición CRPC (EAU):**
+        1. **Testosterona Castrada:** < 50 ng/dL.
+        2. **Progresión PSA:** 3 aumentos consecutivos.
+        3. **Sin Metástasis:** En imagen convencional.
+        """,
+    "rec_nmcrpc_high": """
+        🔴 **nmCRPC Alto Riesgo (PSADT < 10 meses)**
+        *1ª Línea Estándar:*
+        - **Apalutamida:** 240 mg.
+        - **Enzalutamida:** 160 mg.
+        - **Darolutamida:** 600 mg 2x día.
+        ✅ 🇪🇺 Aprobados.
+        """,
+    "rec_nmcrpc_low": """
+        🟢 **nmCRPC Bajo Riesgo (PSADT > 10 meses)**
+        - **Recomendación:** Observación bajo ADT.
+        """,
+
+    "bone_prot_mhspc": """
+        🦴 **Osteoprotección (mHSPC)**
+        *Objetivo: Prevenir osteoporosis por ADT.*
+        - **Denosumab:** 60 mg s.c. c/6 meses.
+        - **Ác. Zoledrónico:** 4 mg i.v. anual.
+        - *Nota:* Dosis alta (120mg) no indicada en mHSPC estándar.
+        """,
+    "bone_prot_mcrpc": """
+        🦴 **Prevención SRE (mCRPC)**
+        *Objetivo: Prevenir fracturas patológicas.*
+        - **Denosumab (Xgeva):** 120 mg s.c. c/4 sem.
+        - **Ác. Zoledrónico:** 4 mg i.v. c/3-4 sem.
+        - *Suplemento:* Calcio + Vit D obligatorio.
+        """,
+
+    "header_mhspc": "Metastásico Hormonosensible (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **Alto Volumen / Alto Riesgo**
+        *Mets Viscerales O ≥4 Mets Óseas*
+        
+        **1ª Línea Estándar: Terapia Triple**
+        1. **ADT** (Continuo).
+        2. **Docetaxel:** 75 mg/m² q3w (6 ciclos) O 50 mg/m² q2w.
+        3. **ARPI:**
+           - **Darolutamida:** 600 mg BID.
+           - *O* **Abiraterona:** 1000 mg OD + Prednisona.
+        
+        ✅ **Aprobaciones:**
+        - 🇪🇺 **Darolutamida:** Aprobada mHSPC + Docetaxel (ARASENS).
+        - 🇪🇺 **Abiraterona:** Aprobada Alto Riesgo mHSPC (LATITUDE).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Bajo Volumen**
+        
+        **1ª Línea Estándar: Doble + RT Local**
+        1. **ADT** + **ARPI** (Enzalututamida / Apalutamida).
+        2. **RT Próstata:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **No:** Evitar Docetaxel (toxicidad > beneficio).
+        
+        ✅ **Aprobaciones:**
+        - 🇪🇺 **Enzalutamida:** 160 mg (ARCHES).
+        - 🇪🇺 **Apalutamida:** 240 mg (TITAN).
+        """,
+
+    "header_mcrpc": "Metastásico Resistente a Castración (mCRPC)",
+    
+    "line1_naive": """
+        **1ª Línea (Naïve a ARPI)**
+        - **Enzalutamida** o **Abiraterona**.
+        - *Alternativa:* Docetaxel.
+        """,
+    
+    "line1_post_arpi": """
+        **1ª/2ª Línea (Tras ARPI)**
+        *¡Cambiar Mecanismo!*
+        - **Docetaxel:** 75 mg/m² q3w O 50 mg/m² q2w (PROSTY).
+        """,
+    
+    "line2_post_doc": """
+        **2ª/3ª Línea (Tras Docetaxel)**
+        - **Cabazitaxel:** 25 mg/m² q3w.
+        - **Lu-177-PSMA:** 7.4 GBq q6w.
+        - **Olaparib:** 300 mg 2x día (si BRCA+).
+        """,
+    
+    "rec_mcrpc_pembro": """
+        **Inmunoterapia (Cualquier Línea)**
+        - **Pembrolizumab:** 200 mg q3w.
+        - *Indicación:* MSI-Alto / dMMR.
+        """,
+    
+    "rec_mcrpc_lutetium": """
+        **Terapia Radioligandos (PSMA+)**
+        - **Lu-177-PSMA-617:** 7.4 GBq q6w (6 ciclos).
+        ✅ 🇪🇺 Aprobado post-ARPI & Quimio (VISION).
+        """,
+
+    "rec_mcrpc_parp": """
+        **Inhibidores PARP (Mutación BRCA1/2)**
+        - **Olaparib:** 300 mg BID.
+        - **Talazoparib:** 0.5 mg OD.
+        ✅ 🇪🇺 Aprobado.
+        """,
+    
+    "rec_mcrpc_ra223": """
+        **Dirigido a Hueso (3ª Línea)**
+        - **Radium-223:** 55 kBq/kg c/4sem.
+        - *Indicación:* Solo hueso, no visceral.
+        """
+}
@@ -0,0 +1,142 @@
+"""Deutsch text catalog for First_Try_app.py."""
+
+TEXT = {
+    "title": "Prostatakarzinom Algorithmus (S3-Leitlinie 2025 / EAU)",
+    "sidebar_title": "Konfiguration",
+    "screening_note": "ℹ️ **Hinweis:** DRU ist für das **Staging** (cT2 vs cT3) wichtig, für das **Screening** (PROBASE) jedoch umstritten.",
+
+    "extent_label": "Krankheitsphase",
+    "psa_label": "PSA-Wert (ng/ml)",
+    "isup_label": "ISUP Grad",
+    "tstage_label": "Klinisches T-Stadium",
+    "n_stage_label": "N-Stadium (Regionär)",
+    "meta_state_label": "Metastasen-Status",
+    "psadt_label": "PSA-Verdopplungszeit (Monate)",
+    "primary_tx_label": "Primärtherapie",
+
+    "extent_opts": ["Lokalisiert (cT1-2 N0 M0)", "Lokal Fortgeschritten (cT3-4 oder cN1)", "Biochemisches Rezidiv (BCR)", "Metastasiert (M1)"],
+    "n_stages": ["cN0 (Knoten Negativ)", "cN1 (Knoten Positiv)"],
+    "m_states": ["mHSPC (Hormonsensitiv)", "mCRPC (Kastrationsresistent)"],
+    "prior_opts": ["Nur ADT", "ADT + Docetaxel", "ADT + ARPI", "Tripel-Therapie"],
+    "primary_tx_opts": ["Radikale Prostatektomie (RP)", "Strahlentherapie (EBRT)"],
+
+    "header_local": "Lokalisiertes Stadium (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Aktive Überwachung (AS)**
+        *S3-Leitlinie Besonderheit:*
+        - **Kriterium:** PSA $\le$ 15 ng/ml (ISUP 1, cT1c/2a) ist in DE möglich (EAU strikt <10).
+        - **Protokoll:** PSA alle 3-6 Mon, DRU 1x/Jahr, Re-Biopsie/MRT nach 12-18 Mon.
+        """,
+    "rec_curative": """
+        **Kurative Standardtherapie**
+        - **OP:** Radikale Prostatektomie + LAE.
+        - **RT:** IMRT/VMAT ($74$-$80$ Gy) + Kurzzeit-ADT (4-6 Mon) bei Intermediärem Risiko.
+        """,
+    "rec_multi_high": """
+        **Hochrisiko Lokalisiert**
+        - **RT:** Dosis-eskaliert + **Langzeit-ADT** (2-3 Jahre).
+        - **OP:** RP + ausgedehnte LAE.
+        """,
+
+    "header_la": "Lokal Fortgeschritten (cT3-4 oder cN1)",
+    "rec_la_cn0": """
+        **Lokal Fortgeschritten (cT3-4 cN0)**
+        *High Risk Protokoll:*
+        - **Standard:** EBRT (Prostata + SB) + **Langzeit-ADT** (2-3 Jahre).
+        - **OP:** RP nur im multimodalen Setting (hohe Wahrscheinlichkeit für adj. RT).
+        - 🇪🇺 **Zulassung:** ADT voll zugelassen.
+        """,
+    "rec_la_cn1": """
+        **Regionär Nodal Positiv (cN1)**
+        *STAMPEDE Protokoll (High Risk M0):*
+        1. **ADT:** Kontinuierlich (3 Jahre).
+        2. **Strahlentherapie:** Prostata + gesamtes Becken.
+        3. **Abirateron:** $1000$ mg + Prednison $5$ mg.
+           - *Dauer:* 2 Jahre.
+        
+        ⚠️ **Zulassungshinweis:**
+        - 🇪🇺 **EMA:** Abirateron für mHSPC zugelassen. cN1/M0 Status im Label nicht explizit genannt.
+        - 🇩🇪 **Deutschland:** cN1-Einsatz oft **Off-Label**. Kostenübernahmeantrag (Verweis auf STAMPEDE/S3) erforderlich.
+        """,
+
+    "header_bcr": "Biochemisches Rezidiv (BCR)",
+    "rec_bcr_rp": """
+        **Rezidiv nach RP (PSA > 0,2)**
+        - **Diagnostik:** PSMA-PET/CT.
+        - **Therapie:** Salvage-RT (Loge) +/- Lymphabfluss.
+        - **ADT:** Kurzzeit-ADT (6 Mon) addieren, wenn PSA >0,6 (GETUG-AFU 16).
+        """,
+    "rec_bcr_embark": """
+        🔴 **High Risk BCR (EMBARK Studie)**
+        *Kriterium: PSADT < 9 Monate.*
+        
+        **Empfehlung:**
+        - **Enzalutamid** ($160$ mg) + ADT.
+        - *Ergebnis:* Signifikant verlängertes MFS.
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **EMA:** Enzalutamide seit 2024 für High-Risk BCR zugelassen.
+        """,
+
+    "header_mhspc": "Metastasiert Hormonsensitiv (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **Hohes Volumen / High Risk**
+        *Viszerale Met. ODER $\ge$4 Knochenmet.*
+        
+        **Standard: Tripel-Therapie**
+        1. **ADT** (Kontinuierlich).
+        2. **Docetaxel:** $75 \\text{ mg/m}^2$ q3w (6 Zyklen).
+        3. **ARPI:**
+           - **Darolutamid:** $600$ mg 2x tgl.
+           - *ODER* **Abirateron:** $1000$ mg + Prednison.
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **Darolutamid:** Zugelassen für mHSPC + Docetaxel (ARASENS).
+        - 🇪🇺 **Abirateron:** Zugelassen für High Risk mHSPC (LATITUDE).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Geringes Volumen**
+        
+        **Standard: Doublet + Lokaltherapie**
+        1. **ADT** + **ARPI** (Enzalutamid / Apalutamida).
+        2. **Prostata-RT:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **Cave:** Kein Docetaxel bei Low Volume (Toxizität > Nutzen).
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 **Enzalutamid:** $160$ mg (ARCHES).
+        - 🇪🇺 **Apalutamida:** $240$ mg (TITAN).
+        """,
+
+    "header_mcrpc": "Metastasiert Kastrationsresistent (mCRPC)",
+    "rec_mcrpc_chemo": """
+        **Chemotherapie Optionen**
+        
+        **1. Docetaxel (2-Wochen-Schema):**
+        - **Dosis:** $50 \\text{ mg/m}^2$ alle 2 Wochen.
+        - *Evidenz:* **PROSTY-Studie** (Kellokumpu-Lehtinen 2013) - weniger Neutropenien bei gleicher Wirkung wie 3-Wochen-Schema.
+        
+        **2. Cabazitaxel:**
+        - **Dosis:** $25 \\text{ mg/m}^2$ alle 3 Wochen.
+        - *Indikation:* 2. Linie oder nach Docetaxel-Versagen.
+        """,
+    "rec_mcrpc_parp": """
+        **PARP-Inhibitoren (Präzisionsmedizin)**
+        *Nur bei BRCA1/2 Mutation*
+        
+        - **Olaparib:** $300$ mg 2x tgl (PROfound).
+        - **Talazoparib:** $0,5$ mg 1x tgl (TALAPRO).
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 Zugelassen für mCRPC (Olaparib mono nach ARPI; Talazoparib+Enza 1. Linie).
+        """,
+    "rec_mcrpc_lutetium": """
+        **Radioligandentherapie**
+        *Nur bei PSMA+ PET*
+        
+        - **Lu-177-PSMA-617:** $7,4$ GBq alle 6 Wochen (4-6 Zyklen).
+        
+        ✅ **Zulassung:**
+        - 🇪🇺 Zugelassen nach ARPI und Chemo (VISION).
+        """
+}
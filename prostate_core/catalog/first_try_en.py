@@ -0,0 +1,151 @@
+"""English text catalog for First_Try_app.py."""
+
+TEXT = {
+    "title": "Prostate Cancer Algorithm (S3 Guidelines 2025 / EAU)",
+    "sidebar_title": "Configuration",
+    "screening_note": "ℹ️ **Note:** DRE is critical for **Staging** (cT2 vs cT3) but questionable for **Screening** (PROBASE).",
+
+    # UI Labels
+    "extent_label": "Disease Phase",
+    "psa_label": "PSA Level (ng/ml)",
+    "isup_label": "ISUP Grade",
+    "tstage_label": "Clinical T-Stage",
+    "n_stage_label": "N-Stage (Regional Nodes)",
+    "meta_state_label": "Metastatic State",
+    "psadt_label": "PSA Doubling Time (months)",
+    "primary_tx_label": "Primary Therapy Received",
+    
+    # Options
+    "extent_opts": ["Localized (cT1-2 N0 M0)", "Locally Advanced (cT3-4 or cN1)", "Biochemical Recurrence (BCR)", "Metastatic (M1)"],
+    "n_stages": ["cN0 (Nodes Negative)", "cN1 (Regional Nodes Positive)"],
+    "m_states": ["mHSPC (Hormone Sensitive)", "mCRPC (Castration Resistant)"],
+    "prior_opts": ["ADT Only", "ADT + Docetaxel", "ADT + ARPI", "Triple Therapy"],
+    "primary_tx_opts": ["Radical Prostatectomy (RP)", "Radiotherapy (EBRT)"],
+
+    # --- CONTENT BLOCKS ---
+    
+    # 1. Localized
+    "header_local": "Localized Disease (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Active Surveillance (AS)**
+        *S3 Guideline Variation:*
+        - **Criteria:** PSA $\le$ 15 ng/ml (ISUP 1, cT1c/2a) is eligible in Germany (EAU strict <10).
+        - **Protocol:** PSA q3-6mo, DRE q12mo, Re-biopsy/MRI at 12-18mo.
+        """,
+    "rec_curative": """
+        **Standard Curative Therapy**
+        - **Surgery:** Radical Prostatectomy (RP) + Lymph Node Dissection.
+        - **Radiotherapy:** IMRT/VMAT ($74$-$80$ Gy) + Short-term ADT (4-6 mo) for Intermediate Risk.
+        """,
+    "rec_multi_high": """
+        **High Risk Localized**
+        - **Radiotherapy:** Dose-escalated + **Long-term ADT** (2-3 years).
+        - **Surgery:** RP + Extended ePLND.
+        """,
+
+    # 2. Locally Advanced
+    "header_la": "Locally Advanced (cT3-4 or cN1)",
+    "rec_la_cn0": """
+        **Locally Advanced (cT3-4 cN0)**
+        *High Risk / Locally Advanced Protocol:*
+        - **Standard:** EBRT (Prostate + SV) + **Long-term ADT** (2-3 years).
+        - **Surgery:** RP only in multimodal setting (expect adjuvant RT).
+        - 🇪🇺 **Approval:** ADT (GnRH agonists/antagonists) fully approved.
+        """,
+    "rec_la_cn1": """
+        **Regional Nodal Disease (cN1)**
+        *STAMPEDE Protocol (High Risk Non-Metastatic):*
+        1. **ADT:** Continuous (3 years).
+        2. **Radiotherapy:** Prostate + Whole Pelvis.
+        3. **Abiraterone:** $1000$ mg OD + Prednisone $5$ mg.
+           - *Duration:* 2 years.
+        
+        ⚠️ **Approval Note:**
+        - 🇪🇺 **EMA:** Abiraterone approved for mHSPC. Use in cN1/M0 is based on Level 1 evidence (STAMPEDE) but label may vary.
+        - 🇩🇪 **Germany:** Often considers cN1 usage **Off-Label**. Request reimbursement (Kostenübernahme).
+        """,
+
+    # 3. BCR
+    "header_bcr": "Biochemical Recurrence",
+    "rec_bcr_rp": """
+        **Post-RP Recurrence (PSA > 0.2)**
+        - **Diagnostic:** PSMA-PET/CT recommended.
+        - **Therapy:** Salvage RT (Prostate Bed) +/- Pelvic Nodes.
+        - **ADT:** Add Short-term ADT (6mo) if PSA >0.6 or ISUP >3 (GETUG-AFU 16).
+        """,
+    "rec_bcr_embark": """
+        🔴 **High Risk BCR (EMBARK Trial)**
+        *Criteria: PSADT < 9 months.*
+        
+        **Recommendation:**
+        - **Enzalutamide** ($160$ mg OD) + ADT (Leuprolide).
+        - *Outcome:* Superior Metastasis-Free Survival (MFS).
+        
+        ✅ **Approval:**
+        - 🇪🇺 **EMA:** Enzalutamide approved for High-Risk BCR (2024).
+        """,
+
+    # 4. mHSPC
+    "header_mhspc": "Metastatic Hormone-Sensitive (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **High Volume / High Risk**
+        *Visceral Mets OR $\ge$4 Bone Mets*
+        
+        **Standard: Triple Therapy**
+        1. **ADT** (Continuous).
+        2. **Docetaxel:** $75 \\text{ mg/m}^2$ q3w (6 cycles).
+        3. **ARPI:**
+           - **Darolutamide:** $600$ mg BID.
+           - *OR* **Abiraterone:** $1000$ mg OD + Prednisone.
+        
+        ✅ **Approvals:**
+        - 🇪🇺 **Darolutamide:** Approved for mHSPC + Docetaxel (ARASENS).
+        - 🇪🇺 **Abiraterone:** Approved for High Risk mHSPC (LATITUDE).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Low Volume**
+        
+        **Standard: Doublet + Local RT**
+        1. **ADT** + **ARPI** (Enzalutamide / Apalutamide).
+        2. **Prostate RT:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **Don't:** Do not use Docetaxel (toxicity > benefit).
+        
+        ✅ **Approvals:**
+        - 🇪🇺 **Enzalutamide:** $160$ mg OD (ARCHES).
+        - 🇪🇺 **Apalutamide:** $240$ mg OD (TITAN).
+        """,
+
+    # 5. mCRPC
+    "header_mcrpc": "Metastatic Castration-Resistant (mCRPC)",
+    "rec_mcrpc_chemo": """
+        **Chemotherapy Options**
+        
+        **1. Docetaxel (Bi-weekly):**
+        - **Dosis:** $50 \\text{ mg/m}^2$ every 2 weeks.
+        - *Evidence:* **PROSTY Trial** (Kellokumpu-Lehtinen 2013) - comparable efficacy to 3-weekly, less toxicity.
+        
+        **2. Cabazitaxel:**
+        - **Dosis:** $25 \\text{ mg/m}^2$ q3w.
+        - *Setting:* 2nd line chemo or post-Docetaxel.
+        """,
+    "rec_mcrpc_parp": """
+        **PARP Inhibitors (Precision Medicine)**
+        *Requires BRCA1/2 Mutation*
+        
+        - **Olaparib:** $300$ mg BID (PROfound).
+        - **Talazoparib:** $0.5$ mg OD (TALAPRO).
+        
+        ✅ **Approval:**
+        - 🇪🇺 Approved for mCRPC post-ARPI (Olaparib) or 1st line mCRPC (Talazoparib+Enza).
+        """,
+    "rec_mcrpc_lutetium": """
+        **Radioligand Therapy (Theranostics)**
+        *Requires PSMA+ PET*
+        
+        - **Lu-177-PSMA-617:** $7.4$ GBq q6w (4-6 cycles).
+        
+        ✅ **Approval:**
+        - 🇪🇺 Approved for pre-treated mCRPC (ARPI + Chemo) [VISION].
+        """
+}
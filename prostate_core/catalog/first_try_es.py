@@ -0,0 +1,142 @@
+"""Español text catalog for First_Try_app.py."""
+
+TEXT = {
+    "title": "Algoritmo Cáncer de Próstata (Guía S3 / EAU 2025)",
+    "sidebar_title": "Configuración",
+    "screening_note": "ℹ️ **Nota:** El tacto rectal es crítico para el **Estadiaje** (cT2 vs cT3) pero cuestionable para **Tamizaje** (PROBASE).",
+
+    "extent_label": "Fase de la Enfermedad",
+    "psa_label": "Nivel de PSA (ng/ml)",
+    "isup_label": "Grado ISUP",
+    "tstage_label": "Estadio T Clínico",
+    "n_stage_label": "Estadio N (Regional)",
+    "meta_state_label": "Estado Metastásico",
+    "psadt_label": "Tiempo Duplicación PSA (meses)",
+    "primary_tx_label": "Terapia Primaria Recibida",
+
+    "extent_opts": ["Localizado (cT1-2 N0 M0)", "Localmente Avanzado (cT3-4 o cN1)", "Recurrencia Bioquímica (BCR)", "Metastásico (M1)"],
+    "n_stages": ["cN0 (Ganglios Negativos)", "cN1 (Ganglios Positivos)"],
+    "m_states": ["mHSPC (Hormonosensible)", "mCRPC (Resistente a Castración)"],
+    "prior_opts": ["Solo ADT", "ADT + Docetaxel", "ADT + ARPI", "Terapia Triple"],
+    "primary_tx_opts": ["Prostatectomía Radical (PR)", "Radioterapia (EBRT)"],
+
+    "header_local": "Enfermedad Localizada (cT1-2 cN0)",
+    "rec_as_extended": """
+        **Vigilancia Activa (AS)**
+        *Variación Guía S3:*
+        - **Criterio:** PSA $\le$ 15 ng/ml (ISUP 1, cT1c/2a) es elegible en Alemania (EAU estricto <10).
+        - **Protocolo:** PSA c/3-6m, Tacto c/12m, Re-biopsia/MRI a 12-18m.
+        """,
+    "rec_curative": """
+        **Terapia Curativa Estándar**
+        - **Cirugía:** Prostatectomía Radical (PR) + Linfadenectomía.
+        - **Radioterapia:** IMRT/VMAT ($74$-$80$ Gy) + ADT corto (4-6 m) para Riesgo Intermedio.
+        """,
+    "rec_multi_high": """
+        **Alto Riesgo Localizado**
+        - **Radioterapia:** Dosis escalada + **ADT Largo** (2-3 años).
+        - **Cirugía:** PR + Linfadenectomía Extendida.
+        """,
+
+    "header_la": "Localmente Avanzado (cT3-4 o cN1)",
+    "rec_la_cn0": """
+        **Localmente Avanzado (cT3-4 cN0)**
+        *Protocolo Alto Riesgo:*
+        - **Estándar:** EBRT (Próstata + VS) + **ADT Largo** (2-3 años).
+        - **Cirugía:** PR solo en entorno multimodal.
+        - 🇪🇺 **Aprobación:** ADT totalmente aprobado.
+        """,
+    "rec_la_cn1": """
+        **Enfermedad Nodal Regional (cN1)**
+        *Protocolo STAMPEDE (Alto Riesgo No Metastásico):*
+        1. **ADT:** Continuo (3 años).
+        2. **Radioterapia:** Próstata + Pelvis Completa.
+        3. **Abiraterona:** $1000$ mg OD + Prednisona $5$ mg.
+           - *Duración:* 2 años.
+        
+        ⚠️ **Nota Aprobación:**
+        - 🇪🇺 **EMA:** Abiraterona aprobada mHSPC. Uso en cN1/M0 basado en Evidencia Nivel 1 (STAMPEDE).
+        - 🇩🇪 **Alemania:** A menudo considera cN1 **Off-Label**. Solicitar reembolso.
+        """,
+
+    "header_bcr": "Recurrencia Bioquímica",
+    "rec_bcr_rp": """
+        **Recurrencia Post-PR (PSA > 0.2)**
+        - **Diagnóstico:** PSMA-PET/CT recomendado.
+        - **Terapia:** RT de Rescate (Lecho) +/- Ganglios.
+        - **ADT:** Añadir ADT corto (6m) si PSA >0.6 o ISUP >3 (GETUG-AFU 16).
+        """,
+    "rec_bcr_embark": """
+        🔴 **BCR Alto Riesgo (Estudio EMBARK)**
+        *Criterio: PSADT < 9 meses.*
+        
+        **Recomendación:**
+        - **Enzalutamida** ($160$ mg OD) + ADT.
+        - *Resultado:* Sobrevida Libre de Metástasis superior.
+        
+        ✅ **Aprobación:**
+        - 🇪🇺 **EMA:** Enzalutamida aprobada para BCR Alto Riesgo (2024).
+        """,
+
+    "header_mhspc": "Metastásico Hormonosensible (mHSPC)",
+    "rec_mhspc_high": """
+        🔴 **Alto Volumen / Alto Riesgo**
+        *Mets Viscerales O $\ge$4 Mets Óseas*
+        
+        **Estándar: Terapia Triple**
+        1. **ADT** (Continuo).
+        2. **Docetaxel:** $75 \\text{ mg/m}^2$ q3w (6 ciclos).
+        3. **ARPI:**
+           - **Darolutamida:** $600$ mg BID.
+           - *O* **Abiraterona:** $1000$ mg OD + Prednisona.
+        
+        ✅ **Aprobaciones:**
+        - 🇪🇺 **Darolutamida:** Aprobada mHSPC + Docetaxel (ARASENS).
+        - 🇪🇺 **Abiraterona:** Aprobada Alto Riesgo mHSPC (LATITUDE).
+        """,
+    "rec_mhspc_low": """
+        🟢 **Bajo Volumen**
+        
+        **Estándar: Doble + RT Local**
+        1. **ADT** + **ARPI** (Enzalutamida / Apalutamida).
+        2. **RT Próstata:** 55 Gy / 20 Fx (STAMPEDE H).
+        
+        ⛔ **No:** Evitar Docetaxel (toxicidad > beneficio).
+        
+        ✅ **Aprobaciones:**
+        - 🇪🇺 **Enzalutamida:** $160$ mg (ARCHES).
+        - 🇪🇺 **Apalutamida:** $240$ mg (TITAN).
+        """,
+
+    "header_mcrpc": "Metastásico Resistente a Castración (mCRPC)",
+    "rec_mcrpc_chemo": """
+        **Opciones Quimioterapia**
+        
+        **1. Docetaxel (Esquema Bisemanal):**
+        - **Dosis:** $50 \\text{ mg/m}^2$ cada 2 semanas.
+        - *Evidencia:* **Estudio PROSTY** (Kellokumpu-Lehtinen 2013) - eficacia comparable al trisemanal, menos toxicidad.
+        
+        **2. Cabazitaxel:**
+        - **Dosis:** $25 \\text{ mg/m}^2$ q3w.
+        - *Escenario:* 2ª línea o tras Docetaxel.
+        """,
+    "rec_mcrpc_parp": """
+        **Inhibidores PARP (Medicina Precisión)**
+        *Requiere Mutación BRCA1/2*
+        
+        - **Olaparib:** $300$ mg BID (PROfound).
+        - **Talazoparib:** $0.5$ mg OD (TALAPRO).
+        
+        ✅ **Aprobación:**
+        - 🇪🇺 Aprobado para mCRPC post-ARPI (Olaparib) o 1ª línea (Talazoparib+Enza).
+        """,
+    "rec_mcrpc_lutetium": """
+        **Terapia Radioligandos**
+        *Requiere PSMA+ PET*
+        
+        - **Lu-177-PSMA-617:** $7.4$ GBq q6w (4-6 ciclos).
+        
+        ✅ **Aprobación:**
+        - 🇪🇺 Aprobado post-ARPI y Quimio (VISION).
+        """
+}
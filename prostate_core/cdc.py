@@ -0,0 +1,233 @@
+"""Incremental scoring of a cohort store from a change log of field updates.
+
+    python -m prostate_core.cdc cohort.store changes.csv [--batch-rows 10000] [-o changed.csv]
+
+The change log (CSV with a header, or JSON lines) has one update per row:
+``patient_id``, ``field`` (a ``record.FIELDS`` name: ``psa``, ``pirads_idx``,
+``genetic``, ...), ``value`` (a number or code; empty resets the field to
+its default) and optionally ``seq``, an increasing sequence number. Within a
+batch the last update of a patient's field wins.
+
+``IncrementalScorer.apply`` writes a batch into the store's column files
+and bitmaps (``store.update``) and marks a patient dirty when an updated
+field lies on the decision path of the patient's phase (``PATHS``, as in
+``cohort.score_sidebar``) or the phase itself changed; a new genetic result
+or a PSA value of a metastatic patient updates the store without
+rescoring. Only the dirty patients are rescored, with the threshold changes
+``rescore.py`` applied to the store, and those whose ``rec`` code differs
+are written back. The batch result lists them, from which key to which.
+
+``meta.json`` records the last ``seq`` applied, so running a log again
+skips what is already in the store. Applying the same updates twice gives
+the same store: dirty patients are rescored whether or not a value changed.
+Patient ids not in the store are reported and skipped (new patients come
+in with ``store build``); without a ``patient_id`` column the ids are row
+numbers.
+"""
+
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import cohort, record, rescore, store as store_mod
+from .codes import OUTCOME_CODES, PHASE_BCR, PHASE_DIAG, PHASE_LA, PHASE_LOCAL, PHASE_META, PHASE_NMCRPC
+
+# phase -> columns its decision in ``cohort.score_sidebar`` reads
+PATHS = {
+    PHASE_DIAG: {"psa", "vol", "pirads_idx", "dre_abnormal", "fam_hist"},
+    PHASE_LOCAL: {"psa", "isup_idx", "t_idx"},
+    PHASE_LA: {"n_idx"},
+    PHASE_BCR: {"primary_idx", "psadt", "isup_idx", "interval"},
+    PHASE_NMCRPC: {"psadt"},
+    PHASE_META: {"m_idx", "high_vol", "prior_idx"},
+}
+_TRUE = frozenset(("1", "true", "yes"))
+_FALSE = frozenset(("0", "false", "no"))
+
+Change = collections.namedtuple("Change", "patient_id field value seq", defaults=(None,))
+Batch = collections.namedtuple("Batch", "seq changes unknown dirty changed")
+
+
+def _value(field, raw):
+    """Field value from a change log entry (text from CSV, typed from JSON)."""
+    if field not in record.FIELDS:
+        raise ValueError(f"unknown field '{field}' (fields: {', '.join(record.FIELDS)})")
+    if isinstance(raw, str):
+        text = raw.strip().lower()
+        if not text:
+            raw = None
+        elif record.FIELDS[field] == "d":
+            raw = float(text)
+        elif field in record.BOOLS:
+            if text not in _TRUE | _FALSE:
+                raise ValueError(f"{field}: expected true/false, got '{raw}'")
+            raw = text in _TRUE
+        else:
+            raw = int(text)
+    return record.coerce(field, raw)
+
+
+def read_changes(path, batch_rows=10_000):
+    """Batches (lists) of ``Change`` from a CSV or JSON-lines change log."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.endswith((".jsonl", ".json")):
+            entries = (json.loads(line) for line in fh if line.strip())
+        else:
+            entries = csv.DictReader(fh)
+        batch = []
+        for n, entry in enumerate(entries, 1):
+            try:
+                seq = entry.get("seq")
+                batch.append(Change(int(entry["patient_id"]), entry["field"], _value(entry["field"], entry["value"]),
+                                    int(seq) if seq not in (None, "") else None))
+            except (KeyError, ValueError) as exc:
+                raise ValueError(f"{path}: entry {n}: {exc}") from None
+            if len(batch) == batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class IncrementalScorer:
+    """Applies batches of ``Change`` to a store and rescores the dirty patients."""
+
+    def __init__(self, store):
+        self.store = store
+        self.boundary = rescore.BoundaryIndex(store)
+        self._ids = None
+        self._rules = {}
+
+    @property
+    def seq(self):
+        """Sequence number of the last change applied (``None`` before the first)."""
+        return self.store.meta.get("cdc", {}).get("seq")
+
+    def rows(self, ids):
+        """``(rows, found)`` of patient ``ids``; ``rows`` is only valid where ``found``."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if "patient_id" not in self.store.meta["columns"]:
+            found = (ids >= 0) & (ids < self.store.n)
+            return np.where(found, ids, 0), found
+        if self._ids is None:
+            self._ids = self._id_index()
+        sorted_ids, order = self._ids
+        pos = np.minimum(np.searchsorted(sorted_ids, ids), max(sorted_ids.size - 1, 0))
+        found = sorted_ids[pos] == ids if sorted_ids.size else np.zeros(ids.shape, dtype=bool)
+        return np.asarray(order[pos]) if order.size else pos, found
+
+    def _id_index(self):
+        """Patient ids ascending and their rows, built on first use and kept with the store."""
+        ids_path = os.path.join(self.store.path, "patient_id.sorted")
+        order_path = os.path.join(self.store.path, "patient_id.order")
+        if not os.path.exists(ids_path):
+            ids = np.asarray(self.store.column("patient_id"))
+            order = np.argsort(ids, kind="stable")
+            order.astype("<i8").tofile(order_path)
+            ids[order].astype("<i8").tofile(ids_path)
+        if self.store.n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return (np.memmap(ids_path, dtype="<i8", mode="r", shape=self.store.n),
+                np.memmap(order_path, dtype="<i8", mode="r", shape=self.store.n))
+
+    def score(self, rows):
+        """``rec`` codes of ``rows`` from the stored columns and applied thresholds."""
+        columns = {name: self.store.column(name, rows) for name in cohort.SIDEBAR_COLUMNS}
+        codes = cohort.score_sidebar(columns)
+        for name, changes in self.store.meta.get("thresholds", {}).items():
+            rule, phase = rescore.RULES[name]
+            sel = np.flatnonzero(columns["phase"] == phase)
+            if sel.size:
+                key = (name, json.dumps(changes))
+                if key not in self._rules:
+                    self._rules[key] = rescore.effective_rule(self.store, name).vectorized(OUTCOME_CODES)
+                codes[sel] = self._rules[key](*rescore.store_inputs(self.store, rule, rows[sel]))
+        return codes
+
+    def apply(self, changes):
+        """Write one batch of ``Change`` into the store and rescore the dirty patients."""
+        last = self.seq
+        if last is not None:
+            changes = [c for c in changes if c.seq is None or c.seq > last]
+        latest = {}  # field -> {patient id: value}, the last update wins
+        for c in changes:
+            latest.setdefault(c.field, {})[c.patient_id] = c.value
+        seqs = [c.seq for c in changes if c.seq is not None]
+
+        unknown = set()
+        touched = {}
+        for field, values in latest.items():
+            ids = np.fromiter(values, dtype=np.int64, count=len(values))
+            rows, found = self.rows(ids)
+            unknown.update(ids[~found].tolist())
+            new = np.fromiter(values.values(), dtype=np.float64 if record.FIELDS[field] == "d" else np.uint8,
+                              count=len(values))
+            touched[field] = rows[found]
+            store_mod.update(self.store, field, rows[found], new[found])
+
+        phase = self.store.column("phase")
+        dirty = [np.empty(0, dtype=np.int64)]
+        for field, rows in touched.items():
+            if field == "phase":
+                dirty.append(rows)
+            else:
+                on_path = [p for p, fields in PATHS.items() if field in fields]
+                dirty.append(rows[np.isin(phase[rows], on_path)])
+        dirty = np.unique(np.concatenate(dirty))
+        old = np.asarray(self.store.column("rec", dirty))
+        new = self.score(dirty)
+        flipped = old != new
+        store_mod.update(self.store, "rec", dirty[flipped], new[flipped])
+        self.boundary.invalidate(touched)
+
+        rows = dirty[flipped]
+        ids = self.store.column("patient_id", rows) if "patient_id" in self.store.meta["columns"] else rows
+        changed = [(pid, rescore.rec_key(a), rescore.rec_key(b))
+                   for pid, a, b in zip(ids.tolist(), old[flipped].tolist(), new[flipped].tolist())]
+        state = self.store.meta.setdefault("cdc", {"seq": None, "changes": 0})
+        if seqs:
+            state["seq"] = max(seqs)
+        state["changes"] += len(changes)
+        store_mod.write_meta(self.store)
+        return Batch(state["seq"], len(changes), sorted(unknown), int(dirty.size), changed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.cdc", description=__doc__.splitlines()[0])
+    parser.add_argument("store", help="cohort store directory (prostate_core.store build)")
+    parser.add_argument("log", help="change log: .csv or .jsonl with patient_id, field, value[, seq]")
+    parser.add_argument("--batch-rows", type=int, default=10_000, help="changes per batch (default 10000)")
+    parser.add_argument("-o", "--output", help="write the patients whose recommendation changed as CSV")
+    args = parser.parse_args(argv)
+
+    scorer = IncrementalScorer(store_mod.CohortStore(args.store))
+    fh = open(args.output, "w", newline="", encoding="utf-8") if args.output else None
+    try:
+        writer = csv.writer(fh) if fh else None
+        if writer:
+            writer.writerow(["batch", "seq", "patient_id", "old_key", "new_key"])
+        for i, changes in enumerate(read_changes(args.log, args.batch_rows), 1):
+            start = time.perf_counter()
+            batch = scorer.apply(changes)
+            elapsed = time.perf_counter() - start
+            print(f"batch {i}: {batch.changes} changes applied, {batch.dirty} patients rescored, "
+                  f"{len(batch.changed)} recommendations changed ({elapsed * 1e3:.1f} ms)")
+            if batch.unknown:
+                print(f"  {len(batch.unknown)} unknown patient ids skipped, e.g. {batch.unknown[:5]}", file=sys.stderr)
+            if writer:
+                writer.writerows([i, batch.seq, pid, a, b] for pid, a, b in batch.changed)
+    finally:
+        if fh:
+            fh.close()
+    print(f"{args.store}: changes applied up to seq {scorer.seq}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
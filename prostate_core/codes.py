@@ -0,0 +1,78 @@
+"""Recommendation, phase and option codes shared by the scalar and batch paths.
+
+Plain integers and tuples, so importing them does not pull in NumPy.
+``REC_KEYS[code]`` is the translation key of a recommendation code; the
+option-index conventions are listed in ``cohort.py``.
+"""
+
+import math
+
+REC_KEYS = (
+    "rec_diag_biopsy",
+    "rec_diag_consider",
+    "rec_diag_obs",
+    "rec_as_extended",
+    "rec_curative",
+    "rec_multi_high",
+    "rec_bcr_low",
+    "rec_bcr_embark",
+    "rec_la_cn0",
+    "rec_la_cn1",
+    "rec_nmcrpc_high",
+    "rec_nmcrpc_low",
+    "rec_mhspc_high",
+    "rec_mhspc_low",
+    "line1_naive",
+    "line1_post_arpi",
+    "line2_post_doc",
+)
+REC_CODES = {key: code for code, key in enumerate(REC_KEYS)}
+
+DIAG_BIOPSY, DIAG_CONSIDER, DIAG_OBS = 0, 1, 2
+AS_EXTENDED, CURATIVE, MULTI_HIGH = 3, 4, 5
+BCR_LOW, BCR_EMBARK = 6, 7
+LA_CN0, LA_CN1 = 8, 9
+NMCRPC_HIGH, NMCRPC_LOW = 10, 11
+MHSPC_HIGH, MHSPC_LOW = 12, 13
+LINE1_NAIVE, LINE1_POST_ARPI, LINE2_POST_DOC = 14, 15, 16
+NO_REC = 255  # phase not handled by these rules
+# rule outcome -> rec code; a rule returning None (no recommendation) gives NO_REC
+OUTCOME_CODES = {**REC_CODES, None: NO_REC}
+
+# Option codes are the index of the option in its catalog list
+# (``t["pirads_opts"]``, ``t["primary_tx_opts"]``, ...), so they are the same
+# in every language: ``t["primary_tx_opts"].index(choice)`` is PRIMARY_RP for
+# "Radikale Prostatektomie (RP)" as for "Radical Prostatectomy (RP)".
+PIRADS_1_2, PIRADS_3, PIRADS_4_5 = 0, 1, 2
+PRIMARY_RP, PRIMARY_EBRT = 0, 1
+PHASE_DIAG, PHASE_LOCAL, PHASE_LA, PHASE_BCR, PHASE_NMCRPC, PHASE_META = range(6)
+PHASE_KEYS = ("diagnosis", "localized", "locally_advanced", "bcr", "nmcrpc", "metastatic")
+PRIOR_ADT, PRIOR_DOCETAXEL, PRIOR_ARPI, PRIOR_TRIPLE = range(4)
+GENETIC_UNKNOWN, GENETIC_NEGATIVE, GENETIC_BRCA, GENETIC_HRR, GENETIC_MSI = range(5)
+N_CN0, N_CN1 = 0, 1
+M_HSPC, M_CRPC = 0, 1
+
+# ISUP grade and T stage widgets use these labels in every language.
+ISUP_OPTS = ("ISUP 1", "ISUP 2", "ISUP 3", "ISUP 4", "ISUP 5")
+ISUP_1, ISUP_2, ISUP_3, ISUP_4, ISUP_5 = range(5)
+TSTAGE_OPTS = ("cT1c", "cT2a", "cT2b", "cT2c")
+T_CT1C, T_CT2A, T_CT2B, T_CT2C = range(4)
+
+# Columns read by ``score_sidebar`` and the value used when one is absent.
+SIDEBAR_COLUMNS = {
+    "phase": 0,
+    "psa": math.nan,
+    "vol": math.nan,
+    "isup_idx": 0,
+    "t_idx": 0,
+    "pirads_idx": 0,
+    "dre_abnormal": False,
+    "fam_hist": False,
+    "primary_idx": PRIMARY_RP,
+    "psadt": math.nan,
+    "interval": 0.0,
+    "n_idx": 0,
+    "m_idx": 0,
+    "high_vol": False,
+    "prior_idx": PRIOR_ADT,
+}
@@ -0,0 +1,148 @@
+"""Vectorized cohort engine: the rules of ``rules.py`` over column arrays.
+
+Every function takes equally long 1-D arrays (one entry per patient) and
+returns a ``uint8`` array of recommendation codes. ``REC_KEYS[code]`` is the
+translation key the scalar functions would have returned for that patient.
+
+Every decision is one index per patient into the checked tables of
+``lookup.py`` (``CompiledRule.codes``); codes outside an input's options
+give ``NO_REC``.
+
+Categorical inputs are the option codes of ``codes.py`` (the index of the
+option in its catalog list), as for the scalar rules:
+
+- ``pirads_idx``: index into ``pirads_opts`` (0 = PIRADS 1-2, 1 = 3, 2 = 4-5)
+- ``isup_idx``: 0 = ISUP 1 ... 4 = ISUP 5
+- ``t_idx``: 0 = cT1c, 1 = cT2a, 2 = cT2b, 3 = cT2c
+- ``primary_idx``: index into ``primary_tx_opts`` (0 = RP, 1 = EBRT)
+- ``phase``: index into ``extent_opts`` (0 = Diagnosis ... 5 = Metastatic)
+- ``n_idx``: index into ``n_stages`` (0 = cN0, 1 = cN1)
+- ``m_idx``: index into ``m_states`` (0 = mHSPC, 1 = mCRPC)
+- ``prior_idx``: index into ``prior_opts`` (0 = ADT only, 1 = + Docetaxel,
+  2 = + ARPI, 3 = Triple)
+"""
+
+import numpy as np
+
+from . import lookup
+from .codes import (  # noqa: F401  re-exported for the batch tooling
+    REC_KEYS, REC_CODES, DIAG_BIOPSY, DIAG_CONSIDER, DIAG_OBS, AS_EXTENDED,
+    CURATIVE, MULTI_HIGH, BCR_LOW, BCR_EMBARK, LA_CN0, LA_CN1, NMCRPC_HIGH,
+    NMCRPC_LOW, MHSPC_HIGH, MHSPC_LOW, LINE1_NAIVE, LINE1_POST_ARPI,
+    LINE2_POST_DOC, NO_REC, PIRADS_1_2, PIRADS_3, PIRADS_4_5, PRIMARY_RP,
+    PRIMARY_EBRT, PHASE_DIAG, PHASE_LOCAL, PHASE_LA, PHASE_BCR, PHASE_NMCRPC,
+    PHASE_META, PHASE_KEYS, PRIOR_ADT, PRIOR_DOCETAXEL, PRIOR_ARPI,
+    PRIOR_TRIPLE, SIDEBAR_COLUMNS,
+)
+from .decision import score_patient  # noqa: F401  scalar twin of score_sidebar
+
+
+def _f64(a):
+    return np.asarray(a, dtype=np.float64)
+
+
+_TABLES = lookup.TABLES
+
+
+def diagnosis_codes(pirads_idx, psad, dre_abnormal, fam_hist):
+    """Batch version of ``get_diagnosis_rec``."""
+    return _TABLES["get_diagnosis_rec"].codes(pirads_idx, psad, dre_abnormal, fam_hist)
+
+
+def local_codes(psa, isup_idx, t_idx):
+    """Batch version of ``calculate_risk_local``."""
+    return _TABLES["calculate_risk_local"].codes(psa, isup_idx, t_idx)
+
+
+def bcr_codes(primary_idx, psadt, isup_idx, interval):
+    """Batch version of ``get_bcr_risk``."""
+    return _TABLES["get_bcr_risk"].codes(primary_idx, psadt, isup_idx, interval)
+
+
+_bcr_panel_codes = _TABLES["get_bcr_panel_rec"].codes
+_la_codes = _TABLES["get_la_rec"].codes
+_nmcrpc_codes = _TABLES["get_nmcrpc_rec"].codes
+_mhspc_codes = _TABLES["get_mhspc_rec"].codes
+_mcrpc_codes = _TABLES["get_mcrpc_line"].codes
+
+
+def score_cohort(phase, psa, isup_idx, t_idx, pirads_idx, psad, dre_abnormal,
+                 fam_hist, primary_idx, psadt, interval):
+    """Route each patient to the rule of its phase; other phases get ``NO_REC``.
+
+    Columns a phase does not read may hold any value (e.g. NaN or 0).
+    """
+    phase = np.asarray(phase)
+    out = np.full(phase.shape, NO_REC, dtype=np.uint8)
+
+    sel = np.flatnonzero(phase == PHASE_DIAG)
+    if sel.size:
+        out[sel] = diagnosis_codes(np.take(pirads_idx, sel), np.take(psad, sel),
+                                   np.take(dre_abnormal, sel), np.take(fam_hist, sel))
+    sel = np.flatnonzero(phase == PHASE_LOCAL)
+    if sel.size:
+        out[sel] = local_codes(np.take(psa, sel), np.take(isup_idx, sel), np.take(t_idx, sel))
+    sel = np.flatnonzero(phase == PHASE_BCR)
+    if sel.size:
+        out[sel] = bcr_codes(np.take(primary_idx, sel), np.take(psadt, sel),
+                             np.take(isup_idx, sel), np.take(interval, sel))
+    return out
+
+
+def psa_density(psa, vol):
+    """PSA / volume as computed in the Diagnosis sidebar (0 when volume <= 0)."""
+    psa, vol = _f64(psa), _f64(vol)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(vol > 0, psa / vol, 0.0)
+
+
+def score_sidebar(columns):
+    """Recommendation codes for the key decision the app shows in each phase.
+
+    ``columns`` maps names from ``SIDEBAR_COLUMNS`` to arrays; missing names
+    take their default. On top of the scalar rules this applies the inline
+    branches of the main panel: PSADT < 9 forces EMBARK in BCR, PSADT < 10
+    in nmCRPC, nodal status in locally advanced disease, volume in mHSPC and
+    the first-column sequencing by prior therapy in mCRPC (``NO_REC`` for
+    triple therapy, where the app shows no line).
+    """
+    phase = np.asarray(columns["phase"])
+    n = phase.shape[0]
+
+    def col(name, sel):
+        if name in columns:
+            return np.take(columns[name], sel)
+        return np.full(sel.size, SIDEBAR_COLUMNS[name])
+
+    out = np.full(n, NO_REC, dtype=np.uint8)
+
+    sel = np.flatnonzero(phase == PHASE_DIAG)
+    if sel.size:
+        psad = psa_density(col("psa", sel), col("vol", sel))
+        out[sel] = diagnosis_codes(col("pirads_idx", sel), psad,
+                                   col("dre_abnormal", sel), col("fam_hist", sel))
+    sel = np.flatnonzero(phase == PHASE_LOCAL)
+    if sel.size:
+        out[sel] = local_codes(col("psa", sel), col("isup_idx", sel), col("t_idx", sel))
+    sel = np.flatnonzero(phase == PHASE_LA)
+    if sel.size:
+        out[sel] = _la_codes(col("n_idx", sel) == 1)
+    sel = np.flatnonzero(phase == PHASE_BCR)
+    if sel.size:
+        out[sel] = _bcr_panel_codes(col("primary_idx", sel), col("psadt", sel),
+                                    col("isup_idx", sel), col("interval", sel))
+    sel = np.flatnonzero(phase == PHASE_NMCRPC)
+    if sel.size:
+        out[sel] = _nmcrpc_codes(col("psadt", sel))
+    sel = np.flatnonzero(phase == PHASE_META)
+    if sel.size:
+        mcrpc = _mcrpc_codes(col("prior_idx", sel))
+        mhspc = _mhspc_codes(col("high_vol", sel))
+        out[sel] = np.where(col("m_idx", sel) == 1, mcrpc, mhspc)
+    return out
+
+
+def decode(codes):
+    """Map recommendation codes back to translation keys (``None`` for NO_REC)."""
+    lookup = np.array(REC_KEYS + (None,) * (256 - len(REC_KEYS)), dtype=object)
+    return lookup[np.asarray(codes, dtype=np.uint8)]
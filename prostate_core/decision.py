@@ -0,0 +1,44 @@
+"""Scalar decision functions (one patient at a time), used by the UI.
+
+Generated from the rule definitions in ``rules.py``; importing this module
+does not load NumPy.
+"""
+
+from . import rules
+from .codes import PHASE_BCR, PHASE_DIAG, PHASE_LA, PHASE_LOCAL, PHASE_META, PHASE_NMCRPC, SIDEBAR_COLUMNS
+
+get_diagnosis_rec = rules.DIAGNOSIS.scalar
+get_bcr_risk = rules.BCR.scalar
+calculate_risk_local = rules.LOCALIZED.scalar
+
+
+def score_patient(record):
+    """Scalar twin of ``cohort.score_sidebar`` for one patient; returns the key or None.
+
+    ``record`` maps ``SIDEBAR_COLUMNS`` names to plain Python values (option
+    inputs as codes), e.g. a dict or a ``record.Patient``.
+    """
+    def get(name):
+        value = record.get(name)
+        return SIDEBAR_COLUMNS[name] if value is None else value
+
+    phase = get("phase")
+    if phase == PHASE_DIAG:
+        psa, vol = get("psa"), get("vol")
+        psad = psa / vol if vol > 0 else 0.0
+        return rules.DIAGNOSIS.scalar(get("pirads_idx"), psad,
+                                      bool(get("dre_abnormal")), bool(get("fam_hist")))
+    if phase == PHASE_LOCAL:
+        return rules.LOCALIZED.scalar(get("psa"), get("isup_idx"), get("t_idx"))
+    if phase == PHASE_LA:
+        return rules.LOCALLY_ADVANCED.scalar(get("n_idx") == 1)
+    if phase == PHASE_BCR:
+        return rules.BCR_PANEL.scalar(get("primary_idx"), get("psadt"),
+                                      get("isup_idx"), get("interval"))
+    if phase == PHASE_NMCRPC:
+        return rules.NMCRPC.scalar(get("psadt"))
+    if phase == PHASE_META:
+        if get("m_idx") == 1:
+            return rules.MCRPC.scalar(get("prior_idx"))
+        return rules.MHSPC.scalar(bool(get("high_vol")))
+    return None
@@ -0,0 +1,90 @@
+"""Incremental recomputation over a small dependency graph.
+
+A ``Graph`` names derived values and the inputs (or other derived values)
+each one is computed from::
+
+    graph = Graph()
+    graph.add("psad", lambda psa, vol: psa / vol if vol > 0 else 0.0, "psa", "vol")
+    graph.add("diagnosis", get_diagnosis_rec, "pirads", "psad", "dre", "fam")
+
+    run = graph.bind(store)           # store: a dict kept between reruns
+    run.set(psa=5.0, vol=40, pirads=PIRADS_3, dre=False, fam=False)
+    run["diagnosis"]                  # computes psad, then diagnosis
+
+``store`` keeps every value with a version number. ``set`` bumps an input's
+version only when its value changed, and a node is recomputed only when the
+version of one of its dependencies moved since its last evaluation. A node
+whose new value equals the old one keeps its version, so nodes downstream of
+it are not recomputed either. Nodes are evaluated on demand: values that the
+current phase never asks for are not computed, and their inputs need not be
+set. Node functions must be pure.
+
+In the app the store lives in ``st.session_state``, so each session keeps
+its own results between reruns.
+"""
+
+
+def _same(a, b):
+    # type check so that 1 == 1.0 == True do not count as unchanged
+    return a is b or (type(a) is type(b) and a == b)
+
+
+class Graph:
+    def __init__(self):
+        self._nodes = {}  # name -> (func, dependency names)
+
+    def add(self, name, func, *deps):
+        if name in self._nodes:
+            raise ValueError(f"node '{name}' is already defined")
+        self._nodes[name] = (func, deps)
+        return func
+
+    def bind(self, store):
+        """Evaluation against ``store`` (a mutable mapping kept between runs)."""
+        return Evaluation(self, store)
+
+
+class Evaluation:
+    """One run of a ``Graph``; ``recomputed`` lists the nodes evaluated so far."""
+
+    def __init__(self, graph, store):
+        self._nodes = graph._nodes
+        self._store = store  # name -> [value, version, dependency versions]
+        self.recomputed = []
+
+    def set(self, **inputs):
+        for name, value in inputs.items():
+            if name in self._nodes:
+                raise ValueError(f"'{name}' is a computed node, not an input")
+            entry = self._store.get(name)
+            if entry is None:
+                self._store[name] = [value, 0, None]
+            elif not _same(entry[0], value):
+                entry[0] = value
+                entry[1] += 1
+
+    def __getitem__(self, name):
+        return self._pull(name)[0]
+
+    def _pull(self, name):
+        if name not in self._nodes:
+            try:
+                return self._store[name]
+            except KeyError:
+                raise KeyError(f"input '{name}' has not been set") from None
+        func, deps = self._nodes[name]
+        entries = [self._pull(dep) for dep in deps]
+        versions = tuple(e[1] for e in entries)
+        entry = self._store.get(name)
+        if entry is not None and entry[2] == versions:
+            return entry
+        value = func(*(e[0] for e in entries))
+        self.recomputed.append(name)
+        if entry is None:
+            entry = self._store[name] = [value, 0, versions]
+        else:
+            if not _same(entry[0], value):
+                entry[0] = value
+                entry[1] += 1
+            entry[2] = versions
+        return entry
@@ -0,0 +1,216 @@
+"""Differential comparison of two algorithm versions over their whole input space.
+
+``First_Try_app.py`` and ``Prostate-Cancer1.py`` implement different
+versions of the Localized and BCR decisions (e.g. BCR by PSADT < 9 alone vs.
+``get_bcr_risk`` behind the EMBARK check). ``COMPARISONS`` pairs their rules
+from ``rules.py`` and maps the old outcomes onto the new keys::
+
+    python -m prostate_core.differential [--samples 5000000] [-o report.json]
+
+For each pair:
+
+1. Exhaustive: every ``FLOAT`` input is cut at the union of both rules'
+   thresholds (below, at and between breakpoints, above; the apps never
+   pass NaN), the categorical inputs are enumerated, and both rules are
+   evaluated on every combination. Rules only compare against these
+   breakpoints, so this finds every region where the versions disagree;
+   adjacent disagreeing cells are merged into boxes such as
+   ``9 <= psadt <= 12, isup_idx in (0, 1, 2)``.
+2. Sampled: ``--samples`` random inputs (continuous values uniform over
+   ``[0, 1.5 x largest breakpoint]``) are scored by both versions
+   side by side, in chunks on ``--workers`` threads (NumPy releases the
+   GIL). This estimates the share of the input space that disagrees and
+   checks that every sampled disagreement lies in an enumerated region.
+
+Exit status is 1 if the versions disagree anywhere, like ``diff``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import codes, rules
+from .spec import BOOL, FLOAT, representatives
+
+# name -> (old rule, new rule, old outcome -> new outcome)
+COMPARISONS = {
+    "localized": (
+        rules.LOCALIZED_FIRST_TRY,
+        rules.LOCALIZED,
+        {"low": "rec_as_extended", "int_fav": "rec_as_extended", "int": "rec_curative", "high": "rec_multi_high"},
+    ),
+    "bcr": (
+        rules.BCR_FIRST_TRY,
+        rules.BCR_PANEL,
+        {"embark": "rec_bcr_embark", "standard": "rec_bcr_low"},
+    ),
+}
+
+# Labels of categorical codes in the region report.
+LABELS = {
+    "pirads": ("PIRADS 1-2", "PIRADS 3", "PIRADS 4-5"),
+    "primary": ("RP", "EBRT"),
+    "prior": ("ADT only", "ADT + Docetaxel", "ADT + ARPI", "Triple"),
+    "isup_idx": codes.ISUP_OPTS,
+    "t_idx": codes.TSTAGE_OPTS,
+}
+
+CHUNK_ROWS = 1 << 20
+
+
+class Comparison:
+    """Two rules over the union of their inputs, with outcomes in one code space."""
+
+    def __init__(self, old, new, mapping):
+        self.old, self.new = old, new
+        self.inputs = {**new.inputs, **old.inputs}
+        self.keys = tuple(dict.fromkeys(new.outcomes + tuple(mapping.values())))
+        codes = {key: i for i, key in enumerate(self.keys)}
+        self._old = old.vectorized({out: codes[mapping[out]] for out in old.outcomes})
+        self._new = new.vectorized(codes)
+
+        self.breaks = {}
+        self.domains = {}
+        for name, kind in self.inputs.items():
+            if kind is FLOAT:
+                found = set(old.thresholds().get(name, ())) | set(new.thresholds().get(name, ()))
+                self.breaks[name] = sorted(found)
+                self.domains[name] = representatives(self.breaks[name])[:-1]  # without NaN
+            else:
+                self.domains[name] = [False, True] if kind is BOOL else list(range(len(kind))) if isinstance(kind, tuple) else list(kind)
+
+    def evaluate(self, columns):
+        """``(old, new)`` code arrays for columns of every input (option inputs as indices)."""
+        old = self._old(*(columns[name] for name in self.old.inputs))
+        new = self._new(*(columns[name] for name in self.new.inputs))
+        return old, new
+
+    def enumerate(self):
+        """Every cell of the discretized input space: ``(cell index grid, columns)``."""
+        shape = [len(dom) for dom in self.domains.values()]
+        index = np.indices(shape).reshape(len(shape), -1)
+        columns = {name: np.asarray(dom)[idx] for (name, dom), idx in zip(self.domains.items(), index)}
+        return index, columns
+
+    def regions(self):
+        """Disagreeing boxes of the exhaustive grid, with cell and disagreeing cell counts."""
+        index, columns = self.enumerate()
+        old, new = self.evaluate(columns)
+        bad = np.flatnonzero(old != new)
+        names = list(self.inputs)
+        boxes = [
+            ({name: (int(index[k, i]), int(index[k, i])) for k, name in enumerate(names)},
+             (int(old[i]), int(new[i])))
+            for i in bad
+        ]
+        for axis in names:
+            boxes.sort(key=lambda b: (b[1], [b[0][n] for n in names if n != axis], b[0][axis]))
+            merged = []
+            for box, pair in boxes:
+                if merged:
+                    last, last_pair = merged[-1]
+                    if (last_pair == pair and last[axis][1] + 1 == box[axis][0]
+                            and all(last[n] == box[n] for n in names if n != axis)):
+                        last[axis] = (last[axis][0], box[axis][1])
+                        continue
+                merged.append((dict(box), pair))
+            boxes = merged
+        return [self._describe(box, pair) for box, pair in boxes], old.size, bad.size
+
+    def _describe(self, box, pair):
+        parts = []
+        for name, (lo, hi) in box.items():
+            dom = self.domains[name]
+            if name in self.breaks:
+                parts.append(_interval(name, self.breaks[name], lo, hi))
+            elif hi - lo + 1 < len(dom):  # a categorical input restricted to some values
+                labels = LABELS.get(name, dom)
+                values = [labels[i] for i in range(lo, hi + 1)]
+                parts.append(f"{name} = {values[0]}" if lo == hi else f"{name} in ({', '.join(map(str, values))})")
+        return {"region": ", ".join(p for p in parts if p), "old": self.keys[pair[0]], "new": self.keys[pair[1]]}
+
+    def sample(self, n, seed=0, workers=None):
+        """Score ``n`` random inputs with both versions; returns counts and the check."""
+        grid_old, grid_new = self.evaluate(self.enumerate()[1])
+        self._grid_agrees = grid_old == grid_new
+        chunks = [(seed, i, min(CHUNK_ROWS, n - start)) for i, start in enumerate(range(0, n, CHUNK_ROWS))]
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            results = list(pool.map(self._sample_chunk, chunks))
+        return {
+            "samples": n,
+            "disagree": sum(r[0] for r in results),
+            "outside_regions": sum(r[1] for r in results),
+        }
+
+    def _sample_chunk(self, task):
+        seed, chunk, size = task
+        rng = np.random.default_rng([seed, chunk])
+        columns = {}
+        cell = np.zeros(size, dtype=np.int64)
+        for name, dom in self.domains.items():
+            if name in self.breaks:
+                hi = 1.5 * max(self.breaks[name], default=1.0)
+                col = rng.uniform(0.0, hi, size)
+                breaks = np.asarray(self.breaks[name])
+                idx = np.searchsorted(breaks, col, "left") + np.searchsorted(breaks, col, "right")
+            else:
+                idx = rng.integers(0, len(dom), size)
+                col = np.asarray(dom)[idx]
+            columns[name] = col
+            cell = cell * len(dom) + idx
+        old, new = self.evaluate(columns)
+        disagree = old != new
+        # every sampled disagreement must fall in a disagreeing cell of the grid
+        outside = disagree & self._grid_agrees[cell]
+        return int(disagree.sum()), int(outside.sum())
+
+
+def _interval(name, breaks, lo, hi):
+    """Text for the bucket range ``lo..hi`` of ``representatives(breaks)``."""
+    if lo == hi and lo % 2:
+        return f"{name} = {breaks[lo // 2]:g}"
+    low = "" if lo == 0 else f"{breaks[lo // 2 - 1]:g} < " if lo % 2 == 0 else f"{breaks[lo // 2]:g} <= "
+    high = "" if hi == 2 * len(breaks) else f" < {breaks[hi // 2]:g}" if hi % 2 == 0 else f" <= {breaks[hi // 2]:g}"
+    return f"{low}{name}{high}" if low or high else ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.differential", description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5_000_000, help="random inputs per comparison (default 5M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="threads for the sampled pass (0 = all cores)")
+    parser.add_argument("--only", choices=COMPARISONS, action="append", help="run only this comparison")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for name in args.only or COMPARISONS:
+        comp = Comparison(*COMPARISONS[name])
+        start = time.perf_counter()
+        regions, cells, bad_cells = comp.regions()
+        sampled = comp.sample(args.samples, args.seed, args.workers or None) if args.samples else None
+        elapsed = time.perf_counter() - start
+        report[name] = {"old": comp.old.name, "new": comp.new.name, "cells": cells,
+                        "disagreeing_cells": bad_cells, "regions": regions, "sampled": sampled}
+
+        print(f"{name}: {comp.old.name} vs {comp.new.name} - {bad_cells} of {cells} cells disagree"
+              f" ({2 * (cells + args.samples) / elapsed / 1e6:.1f}M evaluations/s)")
+        for r in regions:
+            print(f"  {r['region'] or 'everywhere'}: {r['old']} -> {r['new']}")
+        if sampled:
+            print(f"  sampled: {sampled['disagree'] / sampled['samples']:.2%} of {sampled['samples']:,} inputs disagree,"
+                  f" {sampled['outside_regions']} outside the regions above")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+    return 1 if any(r["disagreeing_cells"] for r in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""Asynchronous ingestion of decision inputs from a FHIR server.
+
+    python -m prostate_core.fhir ingest https://fhir.example.org/r4 -o inputs.csv [--concurrency 32]
+    python -m prostate_core.fhir bench --patients 5000 [--error-rate 0.02] [--latency-ms 5]
+
+``FhirClient`` keeps one pooled HTTP/1.1 client (``httpx.AsyncClient``, at
+most ``concurrency`` keep-alive connections) and a semaphore with as many
+slots, so no more requests are in flight than the pool holds. ``get``
+retries connection errors, timeouts and 429/5xx answers with exponential
+backoff and full jitter (or the server's ``Retry-After``), sleeping outside
+its slot; ``search`` follows a searchset Bundle's ``next`` links.
+``ingest`` pages through ``/Patient`` (or takes a list of ids) and hands
+batches of ``batch_size`` patients to a fixed number of workers through a
+bounded queue. A batch costs one Observation and one Procedure search
+(``subject=Patient/1,Patient/2,...``), run concurrently, instead of two
+requests per patient. ``ingest`` yields a ``Result`` per patient as its
+batch completes; a batch that fails for any reason fails its patients, and
+resources ``inputs`` cannot map (a malformed date, a PIRADS score or ISUP
+grade out of range) fail only their patient.
+
+``inputs`` maps the resources onto the ``record.Patient`` fields of
+``get_diagnosis_rec`` and ``get_bcr_risk``: the latest PSA (LOINC 2857-1),
+prostate volume, PIRADS score (1-5, coded to ``PIRADS_1_2``/``_3``/``_4_5``),
+DRE, family history, ISUP grade and genetic result, and from the latest
+completed primary therapy (RP or EBRT) the phase (``PHASE_BCR``, otherwise
+``PHASE_DIAG``), PSADT over the PSA values after therapy
+(``kinetics.psa_kinetics``) and the months from therapy to biochemical
+recurrence (PSA >= 0.2 after RP, nadir + 2 after EBRT). Codes other than
+PSA use ``LOCAL_SYSTEM``; add a site's own codings to ``OBSERVATIONS`` and
+``PROCEDURES``.
+
+``ingest`` writes the patients as a CSV with ``cli.py`` columns, ready for
+``prostate_core.cli`` or ``store build``. ``bench`` runs it against
+``fhir_mock`` on a local port and checks every patient against the
+generator's ground truth. Needs the ``httpx`` package.
+"""
+
+import argparse
+import asyncio
+import collections
+import csv
+import datetime
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from . import kinetics, record
+from .codes import (GENETIC_BRCA, GENETIC_HRR, GENETIC_MSI, GENETIC_NEGATIVE, PHASE_BCR, PHASE_DIAG, PIRADS_1_2,
+                    PIRADS_3, PIRADS_4_5, PRIMARY_EBRT, PRIMARY_RP)
+
+LOINC = "http://loinc.org"
+LOCAL_SYSTEM = "urn:prostate-core"
+PSA_CODE = "2857-1"  # PSA [Mass/volume] in Serum or Plasma
+
+# (system, code) -> what an Observation holds
+OBSERVATIONS = {
+    (LOINC, PSA_CODE): "psa",
+    (LOCAL_SYSTEM, "prostate-volume"): "vol",
+    (LOCAL_SYSTEM, "pirads"): "pirads",
+    (LOCAL_SYSTEM, "dre-abnormal"): "dre_abnormal",
+    (LOCAL_SYSTEM, "family-history"): "fam_hist",
+    (LOCAL_SYSTEM, "isup-grade"): "isup",
+    (LOCAL_SYSTEM, "genetic"): "genetic",
+}
+# (system, code) -> primary therapy of a Procedure
+PROCEDURES = {
+    (LOCAL_SYSTEM, "radical-prostatectomy"): PRIMARY_RP,
+    (LOCAL_SYSTEM, "ebrt"): PRIMARY_EBRT,
+}
+GENETIC = {"negative": GENETIC_NEGATIVE, "brca": GENETIC_BRCA, "hrr": GENETIC_HRR, "msi": GENETIC_MSI}
+
+BCR_PSA_RP = 0.2  # ng/ml after radical prostatectomy
+BCR_NADIR_PLUS = 2.0  # ng/ml above nadir after radiotherapy (Phoenix)
+RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+Result = collections.namedtuple("Result", "patient_id patient error")
+
+
+class FhirError(Exception):
+    """A request failed with a non-retryable status or after all retries."""
+
+
+def pirads_idx(score):
+    """PIRADS option code of a PIRADS 1-5 score."""
+    if not 1 <= score <= 5:
+        raise ValueError(f"PIRADS score {score} is not 1-5")
+    return PIRADS_1_2 if score <= 2 else PIRADS_3 if score == 3 else PIRADS_4_5
+
+
+def _date(text):
+    return datetime.date.fromisoformat(text[:10])
+
+
+def _lookup(concept, table):
+    for coding in concept.get("coding", ()):
+        key = (coding.get("system"), coding.get("code"))
+        if key in table:
+            return table[key]
+    return None
+
+
+def _value(obs):
+    if "valueQuantity" in obs:
+        return obs["valueQuantity"].get("value")
+    if "valueCodeableConcept" in obs:
+        codings = obs["valueCodeableConcept"].get("coding", ())
+        return codings[0].get("code") if codings else None
+    return obs.get("valueInteger", obs.get("valueBoolean"))
+
+
+def _bcr_interval(primary, therapy_date, psa):
+    """Months from therapy to the first PSA meeting the BCR definition, or ``None``."""
+    nadir = math.inf
+    for when, value in psa:
+        nadir = min(nadir, value)
+        threshold = BCR_PSA_RP if primary == PRIMARY_RP else nadir + BCR_NADIR_PLUS
+        if value >= threshold:
+            return (when - therapy_date).days / kinetics.DAYS_PER_MONTH
+    return None
+
+
+def inputs(observations, procedures=()):
+    """``record.Patient`` from a patient's Observation and Procedure resources.
+
+    Raises ``ValueError`` for resources that cannot be mapped: a malformed
+    date, or a PIRADS score or ISUP grade out of range.
+    """
+    series = {}
+    for obs in observations:
+        if obs.get("status") in ("entered-in-error", "cancelled"):
+            continue
+        name = _lookup(obs.get("code", {}), OBSERVATIONS)
+        value = _value(obs)
+        when = obs.get("effectiveDateTime")
+        if name is not None and value is not None and when:
+            series.setdefault(name, []).append((_date(when), value))
+    for points in series.values():
+        points.sort(key=lambda p: p[0])
+    latest = {name: points[-1][1] for name, points in series.items()}
+
+    fields = {"phase": PHASE_DIAG}
+    if "psa" in latest:
+        fields["psa"] = float(latest["psa"])
+    if "vol" in latest:
+        fields["vol"] = float(latest["vol"])
+    if "pirads" in latest:
+        fields["pirads_idx"] = pirads_idx(int(latest["pirads"]))
+    if "dre_abnormal" in latest:
+        fields["dre_abnormal"] = bool(latest["dre_abnormal"])
+    if "fam_hist" in latest:
+        fields["fam_hist"] = bool(latest["fam_hist"])
+    if "isup" in latest:
+        grade = int(latest["isup"])
+        if not 1 <= grade <= 5:
+            raise ValueError(f"ISUP grade {grade} is not 1-5")
+        fields["isup_idx"] = grade - 1
+    if latest.get("genetic") in GENETIC:
+        fields["genetic"] = GENETIC[latest["genetic"]]
+
+    therapy = None
+    for proc in procedures:
+        primary = _lookup(proc.get("code", {}), PROCEDURES)
+        when = proc.get("performedDateTime")
+        if primary is not None and when and proc.get("status") == "completed":
+            if therapy is None or _date(when) >= therapy[0]:
+                therapy = (_date(when), primary)
+    if therapy is not None:
+        day, primary = therapy
+        after = [(when, float(v)) for when, v in series.get("psa", ()) if when > day]
+        fields.update(phase=PHASE_BCR, primary_idx=primary,
+                      psadt=kinetics.psa_kinetics([w for w, _ in after], [v for _, v in after])[0])
+        interval = _bcr_interval(primary, day, after)
+        if interval is not None:
+            fields["interval"] = interval
+    return record.Patient(**fields)
+
+
+def _result(patient_id, observations, procedures):
+    """``Result`` of one patient; unusable resources fail this patient only."""
+    try:
+        return Result(patient_id, inputs(observations, procedures), None)
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        return Result(patient_id, None, exc)
+
+
+def _retry_after(resp):
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class FhirClient:
+    """Pooled, retrying async client for the searches ``inputs`` needs."""
+
+    def __init__(self, base_url, concurrency=32, retries=5, backoff=0.1, max_backoff=5.0, timeout=30.0,
+                 page_size=500, transport=None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.page_size = page_size
+        self.transport = transport  # httpx transport, e.g. httpx.ASGITransport(fhir_mock.create_app()) in tests
+        self.requests = 0
+        self.retried = 0
+
+    async def __aenter__(self):
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._http = httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=self.timeout,
+                                       headers={"Accept": "application/fhir+json"}, transport=self.transport)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._http.aclose()
+
+    async def get(self, url, params=None):
+        """JSON body of ``GET url`` (relative to the base URL), retried as described above."""
+        import httpx
+
+        for attempt in range(self.retries + 1):
+            wait = None
+            async with self._slots:
+                self.requests += 1
+                try:
+                    resp = await self._http.get(url, params=params)
+                except httpx.TransportError as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                else:
+                    if resp.status_code == 200:
+                        try:
+                            return resp.json()
+                        except ValueError as exc:
+                            raise FhirError(f"GET {resp.url}: invalid JSON ({exc})") from None
+                    if resp.status_code not in RETRY_STATUS:
+                        raise FhirError(f"GET {resp.url}: HTTP {resp.status_code}")
+                    error = f"HTTP {resp.status_code}"
+                    wait = _retry_after(resp)
+            if attempt == self.retries:
+                raise FhirError(f"GET {url}: {error} after {self.retries} retries")
+            self.retried += 1
+            await asyncio.sleep(wait if wait is not None else
+                                random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+
+    async def search(self, resource_type, **params):
+        """Resources matching a search, following the Bundle ``next`` links."""
+        url, query = resource_type, {"_count": self.page_size, **params}
+        while url:
+            bundle = await self.get(url, query)
+            for entry in bundle.get("entry", ()):
+                if "resource" in entry:
+                    yield entry["resource"]
+            url = next((link["url"] for link in bundle.get("link", ()) if link.get("relation") == "next"), None)
+            query = None  # the next link carries the query
+
+    async def _by_subject(self, resource_type, ids):
+        """Resources of the patients ``ids`` (one search, paged), grouped by patient id."""
+        found = {pid: [] for pid in ids}
+        subject = ",".join(f"Patient/{pid}" for pid in ids)
+        async for resource in self.search(resource_type, subject=subject):
+            pid = resource.get("subject", {}).get("reference", "").rsplit("/", 1)[-1]
+            if pid in found:
+                found[pid].append(resource)
+        return found
+
+    async def resources(self, ids):
+        """``{id: (observations, procedures)}`` for a batch of patient ids.
+
+        One Observation and one Procedure search cover the whole batch (FHIR
+        ORs comma-separated references), run concurrently.
+        """
+        ids = [str(pid) for pid in ids]
+        observations, procedures = await asyncio.gather(self._by_subject("Observation", ids),
+                                                        self._by_subject("Procedure", ids))
+        return {pid: (observations[pid], procedures[pid]) for pid in ids}
+
+    async def patients(self, ids):
+        """``{id: record.Patient}`` for a batch of patient ids (``inputs`` of ``resources``)."""
+        return {pid: inputs(*found) for pid, found in (await self.resources(ids)).items()}
+
+    async def patient(self, patient_id):
+        """``record.Patient`` of one patient."""
+        return (await self.patients([patient_id]))[str(patient_id)]
+
+    async def ingest(self, ids=None, batch_size=25, workers=None):
+        """``Result`` per patient in ``ids`` (default: every ``/Patient``), in completion order.
+
+        Patients are fetched ``batch_size`` at a time by ``workers`` tasks
+        (default: half the pool, two searches per batch). A failed batch
+        (``FhirError`` after the retries, or any other error) gives a failed
+        ``Result`` for each of its patients; resources ``inputs`` cannot map
+        fail only their patient.
+        """
+        workers = workers or max(1, self.concurrency // 2)
+        todo = asyncio.Queue(maxsize=2 * workers)
+        done = asyncio.Queue()
+
+        async def produce():
+            try:
+                source = _aiter(ids) if ids is not None else self.search("Patient")
+                batch = []
+                async for item in source:
+                    batch.append(item["id"] if isinstance(item, dict) else str(item))
+                    if len(batch) == batch_size:
+                        await todo.put(batch)
+                        batch = []
+                if batch:
+                    await todo.put(batch)
+            finally:
+                for _ in range(workers):
+                    await todo.put(None)
+
+        async def work():
+            try:
+                while (batch := await todo.get()) is not None:
+                    try:
+                        found = await self.resources(batch)
+                    except Exception as exc:  # noqa: BLE001  reported per patient, the other batches go on
+                        results = [Result(pid, None, exc) for pid in batch]
+                    else:
+                        results = [_result(pid, *found[pid]) for pid in found]
+                    done.put_nowait(results)
+            finally:
+                done.put_nowait(None)  # ingest waits for one per worker
+
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(workers)]
+        try:
+            running = workers
+            while running:
+                results = await done.get()
+                if results is None:
+                    running -= 1
+                else:
+                    for result in results:
+                        yield result
+            await tasks[0]  # raises if listing the patients failed
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _ingest(url, output, ids, args):
+    """Write every patient to ``output`` (CSV, or None); returns ``(patients, failed, client)``."""
+    fh = open(output, "w", newline="", encoding="utf-8") if output else None
+    try:
+        writer = csv.writer(fh) if fh else None
+        if writer:
+            writer.writerow(["patient_id", *record.FIELDS])
+        patients = {}
+        failed = []
+        async with FhirClient(url, args.concurrency, args.retries, page_size=args.page_size) as client:
+            async for result in client.ingest(ids, args.batch_size):
+                if result.error is not None:
+                    failed.append(result)
+                    continue
+                patients[result.patient_id] = result.patient
+                if writer:
+                    writer.writerow([result.patient_id, *result.patient.values()])
+        return patients, failed, client
+    finally:
+        if fh:
+            fh.close()
+
+
+def _report(patients, failed, client, elapsed):
+    print(f"{len(patients)} patients in {elapsed:.2f}s ({len(patients) / elapsed * 60:,.0f}/min), "
+          f"{client.requests} requests ({client.requests / elapsed:,.0f}/s), {client.retried} retried, "
+          f"{len(failed)} failed", file=sys.stderr)
+    for result in failed[:10]:
+        print(f"  {result.patient_id}: {result.error}", file=sys.stderr)
+
+
+class MockServer:
+    """``fhir_mock`` on a free local port, in its own process."""
+
+    def __init__(self, patients, seed=0, error_rate=0.0, latency_ms=0.0):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "prostate_core.fhir_mock", f"--port={self.port}", f"--patients={patients}",
+             f"--seed={seed}", f"--error-rate={error_rate}", f"--latency-ms={latency_ms}"],
+        )
+        self.url = f"http://127.0.0.1:{self.port}"
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                with urllib.request.urlopen(f"{self.url}/metadata", timeout=1):
+                    break
+            except OSError:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    self.close()
+                    raise RuntimeError("mock FHIR server did not start")
+                time.sleep(0.2)
+
+    def close(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float):
+        return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.fhir", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_ingest = sub.add_parser("ingest", help="fetch every patient (or --ids) into a CSV of decision inputs")
+    p_ingest.add_argument("url", help="FHIR base URL")
+    p_ingest.add_argument("-o", "--output", required=True, help="CSV with patient_id and record.FIELDS columns")
+    p_ingest.add_argument("--ids", help="file with one patient id per line (default: search /Patient)")
+    p_bench = sub.add_parser("bench", help="ingest from a local fhir_mock server and check the results")
+    p_bench.add_argument("--patients", type=int, default=5000)
+    p_bench.add_argument("--seed", type=int, default=0)
+    p_bench.add_argument("--error-rate", type=float, default=0.0, help="share of requests the mock answers 429/503")
+    p_bench.add_argument("--latency-ms", type=float, default=0.0, help="mock server delay per response")
+    p_bench.add_argument("-o", "--output", help="also write the CSV")
+    for p in (p_ingest, p_bench):
+        p.add_argument("--concurrency", type=int, default=32, help="pooled connections / requests in flight")
+        p.add_argument("--retries", type=int, default=5)
+        p.add_argument("--page-size", type=int, default=500, help="_count of every search")
+        p.add_argument("--batch-size", type=int, default=25, help="patients per Observation/Procedure search")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "ingest":
+        ids = None
+        if args.ids:
+            with open(args.ids, encoding="utf-8") as fh:
+                ids = [line.strip() for line in fh if line.strip()]
+        start = time.perf_counter()
+        patients, failed, client = asyncio.run(_ingest(args.url, args.output, ids, args))
+        _report(patients, failed, client, time.perf_counter() - start)
+        return 1 if failed else 0
+
+    from . import fhir_mock
+
+    server = MockServer(args.patients, args.seed, args.error_rate, args.latency_ms)
+    try:
+        start = time.perf_counter()
+        patients, failed, client = asyncio.run(_ingest(server.url, args.output, None, args))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.close()
+    _report(patients, failed, client, elapsed)
+    wrong = [pid for pid, patient in patients.items()
+             if not all(_same(a, b) for a, b in zip(patient.values(), fhir_mock.truth(pid, args.seed).values()))]
+    print(f"{len(patients) - len(wrong)} of {args.patients} patients match the generated inputs", file=sys.stderr)
+    for pid in wrong[:5]:
+        print(f"  {pid}: got {patients[pid]}, expected {fhir_mock.truth(pid, args.seed)}", file=sys.stderr)
+    return 1 if wrong or failed or len(patients) != args.patients else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
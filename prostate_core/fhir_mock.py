@@ -0,0 +1,220 @@
+"""Local mock of a FHIR server with synthetic prostate patients, for ``fhir.py``.
+
+    python -m prostate_core.fhir_mock --port 8080 --patients 5000 [--error-rate 0.02] [--latency-ms 5]
+
+Serves ``GET /metadata``, ``GET /Patient``, ``GET /Observation?subject=``
+and ``GET /Procedure?subject=`` (one or more comma-separated patient
+references) as searchset Bundles paged with ``_count`` and ``_offset``
+(``next`` links). Patients ``1..patients`` are generated
+from ``(seed, id)``: about half are in diagnostic work-up (PSA series,
+prostate volume, PIRADS score, DRE, family history), the rest have had a
+radical prostatectomy or EBRT followed by an exponentially rising PSA
+series, plus ISUP grade, a genetic result on some and an unrelated
+haemoglobin value. ``truth(patient_id, seed)`` is the ``record.Patient``
+the generator started from (PSADT is the series' exact doubling time), so
+an ingestion run can be checked field by field.
+
+``--error-rate`` answers that share of requests with 503 or 429 (with
+``Retry-After: 0``) and ``--latency-ms`` delays every response, to exercise
+retries and concurrency.
+"""
+
+import argparse
+import asyncio
+import datetime
+import functools
+import random
+import sys
+from typing import Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+
+from . import fhir, kinetics, record
+from .codes import (GENETIC_BRCA, GENETIC_HRR, GENETIC_MSI, GENETIC_NEGATIVE, PHASE_BCR, PHASE_DIAG,
+                    PRIMARY_EBRT, PRIMARY_RP)
+
+_GENETIC = {GENETIC_NEGATIVE: "negative", GENETIC_BRCA: "brca", GENETIC_HRR: "hrr", GENETIC_MSI: "msi"}
+_PROCEDURE = {PRIMARY_RP: "radical-prostatectomy", PRIMARY_EBRT: "ebrt"}
+_EPOCH = datetime.date(2022, 1, 1)
+
+
+def _coding(system, code):
+    return {"coding": [{"system": system, "code": code}]}
+
+
+def _observation(pid, k, code, day, value, system=fhir.LOCAL_SYSTEM):
+    obs = {
+        "resourceType": "Observation",
+        "id": f"{pid}-{k}",
+        "status": "final",
+        "subject": {"reference": f"Patient/{pid}"},
+        "code": _coding(system, code),
+        "effectiveDateTime": day.isoformat(),
+    }
+    if isinstance(value, bool):
+        obs["valueBoolean"] = value
+    elif isinstance(value, int):
+        obs["valueInteger"] = value
+    elif isinstance(value, str):
+        obs["valueCodeableConcept"] = _coding(fhir.LOCAL_SYSTEM, value)
+    else:
+        obs["valueQuantity"] = {"value": value[0], "unit": value[1]}
+    return obs
+
+
+@functools.lru_cache(maxsize=4096)
+def _patient(pid, seed):
+    """``(truth fields, observations, procedures)`` of patient ``pid``."""
+    rng = random.Random(f"{seed}:{pid}")
+    truth = {}
+    obs = []
+    procs = []
+    day = _EPOCH + datetime.timedelta(days=rng.randrange(365))
+
+    def add(code, when, value, system=fhir.LOCAL_SYSTEM):
+        obs.append(_observation(pid, len(obs) + 1, code, when, value, system))
+
+    if rng.random() < 0.5:
+        truth["phase"] = PHASE_DIAG
+        for _ in range(rng.randint(1, 4)):
+            truth["psa"] = round(rng.uniform(1.0, 30.0), 2)
+            add(fhir.PSA_CODE, day, (truth["psa"], "ng/mL"), fhir.LOINC)
+            day += datetime.timedelta(days=rng.randint(30, 120))
+        if rng.random() < 0.9:
+            truth["vol"] = round(rng.uniform(15.0, 100.0), 1)
+            add("prostate-volume", day, (truth["vol"], "mL"))
+        if rng.random() < 0.9:
+            score = rng.randint(1, 5)
+            truth["pirads_idx"] = fhir.pirads_idx(score)
+            add("pirads", day, score)
+        if rng.random() < 0.9:
+            truth["dre_abnormal"] = rng.random() < 0.3
+            add("dre-abnormal", day, truth["dre_abnormal"])
+        if rng.random() < 0.5:
+            truth["fam_hist"] = rng.random() < 0.2
+            add("family-history", day, truth["fam_hist"])
+    else:
+        truth["phase"] = PHASE_BCR
+        truth["primary_idx"] = primary = rng.choice((PRIMARY_RP, PRIMARY_EBRT))
+        add(fhir.PSA_CODE, day - datetime.timedelta(days=30), (round(rng.uniform(4.0, 40.0), 2), "ng/mL"), fhir.LOINC)
+        truth["isup_idx"] = rng.randint(1, 5) - 1
+        add("isup-grade", day - datetime.timedelta(days=20), truth["isup_idx"] + 1)
+        procs.append({
+            "resourceType": "Procedure",
+            "id": f"{pid}-p1",
+            "status": "completed",
+            "subject": {"reference": f"Patient/{pid}"},
+            "code": _coding(fhir.LOCAL_SYSTEM, _PROCEDURE[primary]),
+            "performedDateTime": day.isoformat(),
+        })
+        # rising PSA after therapy with an exact doubling time
+        psadt = rng.uniform(3.0, 30.0)
+        first = rng.uniform(0.03, 0.15) if primary == PRIMARY_RP else rng.uniform(0.3, 1.5)
+        threshold = fhir.BCR_PSA_RP if primary == PRIMARY_RP else first + fhir.BCR_NADIR_PLUS
+        start = day + datetime.timedelta(days=rng.randint(60, 120))
+        when = start
+        for _ in range(rng.randint(3, 8)):
+            value = first * 2 ** ((when - start).days / kinetics.DAYS_PER_MONTH / psadt)
+            truth["psa"] = value
+            add(fhir.PSA_CODE, when, (value, "ng/mL"), fhir.LOINC)
+            if value >= threshold and "interval" not in truth:
+                truth["interval"] = (when - day).days / kinetics.DAYS_PER_MONTH
+            when += datetime.timedelta(days=rng.randint(60, 120))
+        truth["psadt"] = psadt
+    if rng.random() < 0.3:
+        truth["genetic"] = rng.choice(list(_GENETIC))
+        add("genetic", day, _GENETIC[truth["genetic"]])
+    add("718-7", day, (round(rng.uniform(11.0, 16.0), 1), "g/dL"), fhir.LOINC)  # haemoglobin, not used
+    rng.shuffle(obs)
+    return truth, tuple(obs), tuple(procs)
+
+
+def truth(patient_id, seed=0):
+    """The ``record.Patient`` patient ``patient_id`` was generated from."""
+    return record.Patient(**_patient(int(patient_id), seed)[0])
+
+
+def _bundle(request, resources, offset, count):
+    page = resources[offset:offset + count]
+    links = [{"relation": "self", "url": str(request.url)}]
+    if offset + count < len(resources):
+        links.append({"relation": "next", "url": str(request.url.include_query_params(_offset=offset + count))})
+    return JSONResponse({"resourceType": "Bundle", "type": "searchset", "total": len(resources), "link": links,
+                         "entry": [{"resource": r} for r in page]})
+
+
+def create_app(patients=1000, seed=0, error_rate=0.0, latency_ms=0.0):
+    """ASGI app serving ``patients`` synthetic patients."""
+    faults = random.Random(seed)
+
+    async def inject():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if error_rate and faults.random() < error_rate:
+            status = 429 if faults.random() < 0.5 else 503
+            raise HTTPException(status, detail="injected fault", headers={"Retry-After": "0"})
+
+    app = FastAPI(title="Mock FHIR server", dependencies=[Depends(inject)])
+
+    def subjects(subject, patient):
+        """Patient ids of a ``subject``/``patient`` search value (comma-separated references)."""
+        ids = []
+        for ref in (subject or patient or "").split(","):
+            ref = ref.rsplit("/", 1)[-1]
+            if ref.isdigit() and 1 <= int(ref) <= patients:
+                ids.append(int(ref))
+        return ids
+
+    @app.get("/metadata")
+    async def metadata():
+        return {"resourceType": "CapabilityStatement", "status": "active", "kind": "instance", "fhirVersion": "4.0.1"}
+
+    @app.get("/Patient")
+    async def search_patients(request: Request, count: int = Query(100, alias="_count", ge=1, le=1000),
+                              offset: int = Query(0, alias="_offset", ge=0)):
+        ids = range(1 + offset, min(patients, offset + count) + 1)
+        page = {"resourceType": "Bundle", "type": "searchset", "total": patients,
+                "link": [{"relation": "self", "url": str(request.url)}],
+                "entry": [{"resource": {"resourceType": "Patient", "id": str(pid)}} for pid in ids]}
+        if offset + count < patients:
+            page["link"].append({"relation": "next",
+                                 "url": str(request.url.include_query_params(_offset=offset + count))})
+        return JSONResponse(page)
+
+    @app.get("/Observation")
+    async def search_observations(request: Request, subject: Optional[str] = None, patient: Optional[str] = None,
+                                  count: int = Query(100, alias="_count", ge=1, le=1000),
+                                  offset: int = Query(0, alias="_offset", ge=0)):
+        resources = [obs for pid in subjects(subject, patient) for obs in _patient(pid, seed)[1]]
+        return _bundle(request, resources, offset, count)
+
+    @app.get("/Procedure")
+    async def search_procedures(request: Request, subject: Optional[str] = None, patient: Optional[str] = None,
+                                count: int = Query(100, alias="_count", ge=1, le=1000),
+                                offset: int = Query(0, alias="_offset", ge=0)):
+        resources = [proc for pid in subjects(subject, patient) for proc in _patient(pid, seed)[2]]
+        return _bundle(request, resources, offset, count)
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.fhir_mock", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 429/503")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay of every response")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    app = create_app(args.patients, args.seed, args.error_rate, args.latency_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
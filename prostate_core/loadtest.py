@@ -0,0 +1,316 @@
+"""Concurrent-session load test of the Streamlit app.
+
+    python -m prostate_core.loadtest --sessions 1 8 32 --cases 5 [-o load.json]
+
+Starts ``streamlit run Prostate-Cancer1.py`` on a free local port (or uses
+``--url`` of a running server) and opens N websocket sessions per level,
+speaking the same protobuf protocol as the browser. Each session works
+through random cases: pick a language and a phase, then change that phase's
+inputs one by one (PSA, volume, PIRADS, PSADT, prior therapy, ...), each
+change being one script rerun. A rerun's latency is the time from sending
+the widget states to the server's ``script_finished``.
+
+Per level it reports p50/p95/p99 rerun latency, reruns per second, server
+RSS growth per connected session and server CPU use (100% = one core; a
+single Streamlit process runs scripts under one GIL, so it saturates near
+100%). One unmeasured warm-up session runs first. ``--slo-ms`` (p95, default
+500) turns the levels into a capacity figure: the largest number of
+concurrent sessions that still meets it.
+
+CPU and memory are read from ``/proc`` (Linux) for the server started here.
+Needs the ``websockets`` package; Streamlit is only imported for its
+protobuf message classes.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from . import catalog
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Prostate-Cancer1.py")
+
+# Per phase: (label, value) steps. Labels are catalog keys or literal labels;
+# values are option indices for selectbox/radio, numbers for number_input and
+# bools for checkboxes. Callables draw a fresh value per case.
+FLOWS = {
+    "diagnosis": [
+        ("psa_label", lambda r: round(r.uniform(1, 30), 1)),
+        ("vol_label", lambda r: r.randrange(15, 100, 5)),
+        ("dre_label", lambda r: r.randrange(2)),
+        ("pirads_label", lambda r: r.randrange(3)),
+    ],
+    "localized": [
+        ("psa_label", lambda r: round(r.uniform(2, 30), 1)),
+        ("isup_label", lambda r: r.randrange(5)),
+        ("tstage_label", lambda r: r.randrange(4)),
+    ],
+    "locally_advanced": [
+        ("n_stage_label", lambda r: r.randrange(2)),
+    ],
+    "bcr": [
+        ("primary_tx_label", lambda r: r.randrange(2)),
+        ("isup_label", lambda r: r.randrange(5)),
+        ("psadt_label", lambda r: round(r.uniform(2, 24), 1)),
+        ("recurrence_time_label", lambda r: r.randrange(3, 48)),  # EBRT only
+    ],
+    "nmcrpc": [
+        ("psadt_label", lambda r: round(r.uniform(2, 24), 1)),
+    ],
+    "metastatic": [
+        ("meta_state_label", lambda r: r.randrange(2)),
+        ("High Volume (Visceral/4+ Bone)?", lambda r: r.random() < 0.5),  # mHSPC only
+        ("Prior Therapy", lambda r: r.randrange(4)),  # mCRPC only
+        ("Bone Mets Count", lambda r: r.randrange(0, 8)),
+    ],
+}
+PHASES = tuple(FLOWS)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Session:
+    """One browser-like websocket session."""
+
+    def __init__(self, url):
+        self.url = url
+        self.widgets = {}  # label -> (kind, element proto) from the last run
+        self.states = {}  # widget id -> WidgetState sent with every rerun
+        self.latencies = []
+        self.errors = 0
+        self._ws = None
+
+    async def __aenter__(self):
+        import websockets
+
+        self._ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._ws.close()
+
+    async def rerun(self):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        widgets = {}
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self._ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "script_finished":
+                break
+            if kind != "delta" or fwd.delta.WhichOneof("type") != "new_element":
+                continue
+            element = fwd.delta.new_element
+            el_kind = element.WhichOneof("type")
+            if el_kind == "exception":
+                self.errors += 1
+            elif el_kind in ("selectbox", "radio", "number_input", "checkbox"):
+                proto = getattr(element, el_kind)
+                widgets[proto.label] = (el_kind, proto)
+        self.latencies.append(time.perf_counter() - start)
+        self.widgets = widgets
+
+    async def set(self, label, value):
+        """Change the widget labelled ``label``; False if it is not on the page."""
+        from streamlit.proto.NumberInput_pb2 import NumberInput
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if label not in self.widgets:
+            return False
+        kind, proto = self.widgets[label]
+        state = WidgetState(id=proto.id)
+        if kind in ("selectbox", "radio"):
+            state.string_value = proto.options[value % len(proto.options)]
+        elif kind == "checkbox":
+            state.bool_value = bool(value)
+        elif proto.data_type == NumberInput.INT:
+            state.int_value = int(value)
+        else:
+            state.double_value = float(value)
+        self.states[proto.id] = state
+        await self.rerun()
+        return True
+
+    async def case(self, rng):
+        """One patient: language, phase, then the phase's inputs."""
+        lang_name = rng.choice(list(catalog.LANGUAGES))
+        await self.set("Select", list(catalog.LANGUAGES).index(lang_name))
+        t = catalog.load(lang_name)
+        phase = rng.randrange(len(PHASES))
+        await self.set(t["extent_label"], phase)
+        for label, value in FLOWS[PHASES[phase]]:
+            await self.set(t.get(label, label), value(rng))
+
+
+class ServerProcess:
+    """``streamlit run`` on a free local port, with /proc-based resource readings."""
+
+    def __init__(self, app=APP):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", app, "--server.headless=true",
+             f"--server.port={self.port}", "--server.address=127.0.0.1",
+             "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    self.close()
+                    raise RuntimeError("streamlit server did not start")
+                time.sleep(0.2)
+
+    def rss(self):
+        """Resident set size in bytes."""
+        with open(f"/proc/{self.proc.pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def cpu_seconds(self):
+        with open(f"/proc/{self.proc.pid}/stat") as fh:
+            fields = fh.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def close(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+async def run_level(url, n_sessions, cases, server=None, seed=0):
+    """Run ``n_sessions`` concurrent sessions of ``cases`` cases each."""
+    sessions = [Session(url) for _ in range(n_sessions)]
+    rss_before = server.rss() if server else None
+    for s in sessions:
+        await s.__aenter__()
+    peak_rss = 0
+
+    async def sample():
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss, server.rss())
+            await asyncio.sleep(0.25)
+
+    async def drive(i, session):
+        rng = random.Random(seed * 100_003 + i)
+        await session.rerun()  # first page load
+        for _ in range(cases):
+            await session.case(rng)
+
+    sampler = asyncio.ensure_future(sample()) if server else None
+    cpu_start = server.cpu_seconds() if server else None
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(drive(i, s) for i, s in enumerate(sessions)))
+    finally:
+        elapsed = time.perf_counter() - start
+        cpu = server.cpu_seconds() - cpu_start if server else None
+        if sampler:
+            sampler.cancel()
+        rss_connected = server.rss() if server else None
+        for s in sessions:
+            await s.__aexit__(None, None, None)
+
+    latencies = sorted(x for s in sessions for x in s.latencies)
+    result = {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "errors": sum(s.errors for s in sessions),
+        "elapsed_s": elapsed,
+        "reruns_per_s": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1e3,
+        "p95_ms": _percentile(latencies, 0.95) * 1e3,
+        "p99_ms": _percentile(latencies, 0.99) * 1e3,
+        "mean_ms": statistics.fmean(latencies) * 1e3,
+    }
+    if server:
+        result.update({
+            "cpu_percent": 100 * cpu / elapsed,  # 100 = one core busy
+            "cpu_cores": os.cpu_count(),
+            "rss_mb": max(peak_rss, rss_connected) / 2**20,
+            "rss_per_session_mb": max(0, max(peak_rss, rss_connected) - rss_before) / 2**20 / n_sessions,
+        })
+    return result
+
+
+def _print_level(res):
+    line = (f"{res['sessions']:4d} sessions  {res['reruns']:6d} reruns  {res['reruns_per_s']:7.1f}/s  "
+            f"p50 {res['p50_ms']:7.1f}  p95 {res['p95_ms']:7.1f}  p99 {res['p99_ms']:7.1f} ms")
+    if "cpu_percent" in res:
+        line += (f"  cpu {res['cpu_percent']:5.0f}%  rss {res['rss_mb']:6.1f} MB"
+                 f" (+{res['rss_per_session_mb']:.2f}/session)")
+    if res["errors"]:
+        line += f"  {res['errors']} errors"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16],
+                        help="concurrent sessions per level (default 1 4 16)")
+    parser.add_argument("--cases", type=int, default=5, help="cases per session and level (default 5)")
+    parser.add_argument("--url", help="websocket URL of a running app instead of starting one "
+                                      "(e.g. ws://127.0.0.1:8501/_stcore/stream; no CPU/memory figures)")
+    parser.add_argument("--slo-ms", type=float, default=500.0, help="p95 target for the capacity figure")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    server = None if args.url else ServerProcess()
+    url = args.url or server.url
+    levels = []
+    try:
+        # warm-up: imports, caches and pre-rendered diagrams in the server
+        asyncio.run(run_level(url, 1, 2, None, seed=-1))
+        for n in args.sessions:
+            res = asyncio.run(run_level(url, n, args.cases, server, args.seed))
+            levels.append(res)
+            _print_level(res)
+    finally:
+        if server:
+            server.close()
+
+    ok = [lv["sessions"] for lv in levels if lv["p95_ms"] <= args.slo_ms and not lv["errors"]]
+    capacity = max(ok) if ok else 0
+    print(f"capacity: {capacity} concurrent sessions at p95 <= {args.slo_ms:g} ms")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"slo_ms": args.slo_ms, "capacity_sessions": capacity, "levels": levels}, fh, indent=2)
+            fh.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
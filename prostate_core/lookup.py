@@ -0,0 +1,148 @@
+"""Decision rules compiled into dense lookup tables.
+
+``CompiledRule`` takes a ``spec.Rule``, splits each ``FLOAT`` input at the
+thresholds the rule compares it against (PSA 10/15/20, PSAD 0.10/0.15,
+PSADT 12, interval 18, ...) into buckets below, at and between those
+breakpoints plus a NaN bucket, and enumerates the other inputs. The rule is
+evaluated once per bucket combination, so classifying a patient is a single
+index into a ``uint8`` array of ``cohort.REC_KEYS`` codes.
+
+Tables are rebuilt from ``rules.py`` at import (a few hundred scalar calls)
+and checked against the scalar rule on both sides of every breakpoint, so
+they cannot drift from the rule definitions. ``cohort.score_sidebar`` and
+``score_cohort`` classify through ``CompiledRule.codes``. Run
+``python -m prostate_core.lookup`` to print the breakpoints and table sizes.
+"""
+
+import bisect
+import math
+
+import numpy as np
+
+from . import rules
+from .codes import NO_REC, OUTCOME_CODES, REC_KEYS
+from .spec import BOOL, FLOAT, representatives
+
+
+class CompiledRule:
+    """A scalar rule backed by a dense table; callable like the original."""
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.func = rule.scalar
+        self.name = rule.name
+        self.args = tuple(rule.inputs)
+        self.breakpoints = rule.thresholds()
+
+        self._axes = []  # per argument: (breakpoints, None, None) or (None, {value: index}, other)
+        values = []
+        for arg, kind in rule.inputs.items():
+            if kind is FLOAT:
+                breaks = self.breakpoints[arg]
+                self._axes.append((list(breaks), None, None))
+                values.append(representatives(breaks))
+            else:
+                # a trailing None stands for "any other option string"; exact
+                # because rules only test option inputs for equality
+                dom = (False, True) if kind is BOOL else tuple(kind) + ((None,) if isinstance(kind, tuple) else ())
+                index = {v: i for i, v in enumerate(dom) if v is not None}
+                self._axes.append((None, index, dom.index(None) if None in dom else None))
+                values.append(list(dom))
+
+        self.table = np.empty([len(v) for v in values], dtype=np.uint8)
+        for idx in np.ndindex(self.table.shape):
+            key = self.func(*(v[i] for v, i in zip(values, idx)))
+            self.table[idx] = OUTCOME_CODES[key]
+        self._table_flat = self.table.ravel()
+        self._index_dtype = np.int16 if self.table.size <= np.iinfo(np.int16).max else np.int32
+        self._flat = self._table_flat.tolist()
+        self._strides = [s // self.table.itemsize for s in self.table.strides]
+        self._check()
+
+    def __call__(self, *args):
+        pos = 0
+        for (breaks, index, other), stride, x in zip(self._axes, self._strides, args):
+            if breaks is not None:
+                if x != x:
+                    pos += stride * (2 * len(breaks) + 1)
+                else:
+                    pos += stride * (bisect.bisect_left(breaks, x) + bisect.bisect_right(breaks, x))
+            elif x in index:
+                pos += stride * index[x]
+            elif other is not None and isinstance(x, str):
+                pos += stride * other
+            else:
+                return self.func(*args)  # outside the compiled domain
+        code = self._flat[pos]
+        return REC_KEYS[code] if code != NO_REC else None
+
+    def codes(self, *columns):
+        """Vectorized lookup; categorical columns hold domain indices.
+
+        Rows with an index outside an input's domain get ``NO_REC`` rather
+        than the code of some other cell. Buckets and flat indices are
+        ``int16`` (the tables have a few hundred cells), which keeps the
+        passes over the columns short.
+        """
+        flat = None
+        invalid = None
+        for (breaks, _, _), size, stride, col in zip(self._axes, self.table.shape, self._strides, columns):
+            if breaks is None:
+                col = np.asarray(col)
+                if col.dtype.kind == "b":
+                    col = col.view(np.uint8)
+                if col.size and (col.min() < 0 or col.max() >= size):
+                    bad = (col < 0) | (col >= size)
+                    invalid = bad if invalid is None else invalid | bad
+                    col = np.where(bad, 0, col)
+                part = col.astype(self._index_dtype)
+            else:
+                col = np.asarray(col, dtype=np.float64)
+                part = np.zeros(col.shape, dtype=self._index_dtype)
+                for b in breaks:
+                    part += col >= b
+                    part += col > b
+                part[np.isnan(col)] = 2 * len(breaks) + 1
+            if stride != 1:
+                part *= self._index_dtype(stride)
+            if flat is None:
+                flat = part
+            else:
+                flat += part
+        out = self._table_flat.take(flat)
+        if invalid is not None:
+            out[invalid] = NO_REC
+        return out
+
+    def _check(self):
+        """Compare table and rule just below, at and just above each breakpoint."""
+        probes = []
+        for (breaks, index, other) in self._axes:
+            if breaks is None:
+                probes.append(list(index) + (["<other>"] if other is not None else []))
+            else:
+                pts = [math.nan] + [p for b in breaks for p in (math.nextafter(b, -math.inf), b, math.nextafter(b, math.inf))]
+                probes.append(pts or [0.0])
+        for combo in np.ndindex(*[len(p) for p in probes]):
+            args = [p[i] for p, i in zip(probes, combo)]
+            if self(*args) != self.func(*args):
+                raise AssertionError(f"{self.name}: lookup table disagrees with rule at {args}")
+
+
+TABLES = {rule.name: CompiledRule(rule) for rule in (
+    rules.DIAGNOSIS, rules.LOCALIZED, rules.BCR, rules.BCR_PANEL, rules.LOCALLY_ADVANCED, rules.NMCRPC,
+    rules.MHSPC, rules.MCRPC)}
+
+# ``cohort`` scores through ``TABLES[...].codes``. Per call the tables are
+# slower than the generated ``rules.*.scalar`` functions (bisect per axis),
+# which the apps use; these aliases are for checks and benchmarks.
+get_diagnosis_rec = TABLES["get_diagnosis_rec"]
+calculate_risk_local = TABLES["calculate_risk_local"]
+get_bcr_risk = TABLES["get_bcr_risk"]
+
+
+if __name__ == "__main__":
+    for rule in TABLES.values():
+        print(f"{rule.name}: table {rule.table.shape} ({rule.table.size} cells)")
+        for arg, breaks in rule.breakpoints.items():
+            print(f"  {arg}: {', '.join(f'{b:g}' for b in breaks)}")
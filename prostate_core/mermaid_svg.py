@@ -0,0 +1,204 @@
+"""Offline Mermaid-to-SVG rendering for the pathway diagrams.
+
+Covers the flowchart subset the apps emit: a ``graph TD``/``graph LR``
+header, ``A --> B`` chains, ``-->|label|`` edge labels and ``[box]``,
+``{decision}`` and ``(round)`` node shapes with optional quoted text.
+Layout is layered (longest path from the start nodes), which suits the
+small top-down pathways here; no browser, node.js or CDN is needed.
+
+``render`` caches each SVG under the SHA-256 of its Mermaid source, in
+memory and, if ``MERMAID_SVG_CACHE_DIR`` is set, on disk. ``prerender``
+fills the cache for a known set of diagrams at startup.
+"""
+
+import hashlib
+import html
+import os
+import re
+
+_NODE = re.compile(
+    r'\s*([A-Za-z0-9_]+)\s*'
+    r'(\[(?:"[^"]*"|[^\]]*)\]|\{(?:"[^"]*"|[^}]*)\}|\((?:"[^"]*"|[^)]*)\))?'
+)
+_ARROW = re.compile(r'\s*-->\s*(?:\|([^|]*)\|)?')
+
+CHAR_W = 7.2
+NODE_H = 40
+LAYER_GAP = 70
+NODE_GAP = 30
+MARGIN = 20
+
+_cache = {}
+
+
+class MermaidSyntaxError(ValueError):
+    pass
+
+
+def cache_key(code):
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def _node_text(raw):
+    text = raw[1:-1].strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    return text
+
+
+def parse(code):
+    """Return (direction, nodes, edges); nodes map id -> (text, shape)."""
+    lines = [ln.strip() for ln in code.strip().splitlines() if ln.strip()]
+    if not lines or not re.match(r"^(graph|flowchart)\s+(TD|TB|LR)\b", lines[0]):
+        raise MermaidSyntaxError("expected 'graph TD' or 'graph LR' header")
+    direction = lines[0].split()[1]
+    nodes, edges = {}, []
+
+    def node_at(line, pos):
+        m = _NODE.match(line, pos)
+        if not m:
+            raise MermaidSyntaxError(f"cannot parse node in {line!r}")
+        node_id, shape = m.group(1), m.group(2)
+        if shape:
+            nodes[node_id] = (_node_text(shape), shape[0])
+        else:
+            nodes.setdefault(node_id, (node_id, "["))
+        return node_id, m.end()
+
+    for line in lines[1:]:
+        src, pos = node_at(line, 0)
+        while pos < len(line):
+            arrow = _ARROW.match(line, pos)
+            if not arrow:
+                raise MermaidSyntaxError(f"unsupported syntax in {line!r}")
+            dst, pos = node_at(line, arrow.end())
+            edges.append((src, dst, (arrow.group(1) or "").strip()))
+            src = dst
+    return direction, nodes, edges
+
+
+def _layers(nodes, edges):
+    layer = {n: 0 for n in nodes}
+    for _ in range(len(nodes)):  # longest path; bounded so cycles terminate
+        changed = False
+        for src, dst, _ in edges:
+            if src != dst and layer[dst] < layer[src] + 1:
+                layer[dst] = layer[src] + 1
+                changed = True
+        if not changed:
+            break
+    return layer
+
+
+def to_svg(code):
+    """Lay out and draw ``code`` as a standalone SVG string."""
+    direction, nodes, edges = parse(code)
+    layer = _layers(nodes, edges)
+    rows = {}
+    for n in nodes:
+        rows.setdefault(layer[n], []).append(n)
+
+    size = {}
+    for n, (text, shape) in nodes.items():
+        w = max(60, len(text) * CHAR_W + 24)
+        h = NODE_H + (16 if shape == "{" else 0)
+        size[n] = (w + (24 if shape == "{" else 0), h)
+
+    horizontal = direction == "LR"
+    pos = {}
+    extent = 0.0
+    offset = MARGIN
+    for i in sorted(rows):
+        row = rows[i]
+        if horizontal:
+            depth = max(size[n][0] for n in row)
+            span = sum(size[n][1] for n in row) + NODE_GAP * (len(row) - 1)
+        else:
+            depth = max(size[n][1] for n in row)
+            span = sum(size[n][0] for n in row) + NODE_GAP * (len(row) - 1)
+        extent = max(extent, span)
+        pos[i] = (offset, depth, span)
+        offset += depth + LAYER_GAP
+    total_depth = offset - LAYER_GAP + MARGIN
+
+    center = {}
+    for i, row in rows.items():
+        start, depth, span = pos[i]
+        cursor = MARGIN + (extent - span) / 2
+        for n in row:
+            w, h = size[n]
+            if horizontal:
+                center[n] = (start + depth / 2, cursor + h / 2)
+                cursor += h + NODE_GAP
+            else:
+                center[n] = (cursor + w / 2, start + depth / 2)
+                cursor += w + NODE_GAP
+
+    width, height = (total_depth, extent + 2 * MARGIN) if horizontal else (extent + 2 * MARGIN, total_depth)
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="sans-serif" font-size="12">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="#333"/></marker></defs>',
+    ]
+
+    def anchor(n, outgoing):
+        (x, y), (w, h) = center[n], size[n]
+        if horizontal:
+            return (x + w / 2, y) if outgoing else (x - w / 2, y)
+        return (x, y + h / 2) if outgoing else (x, y - h / 2)
+
+    for src, dst, label in edges:
+        (x1, y1), (x2, y2) = anchor(src, True), anchor(dst, False)
+        out.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                   'stroke="#333" stroke-width="1.5" marker-end="url(#arrow)"/>')
+        if label:
+            mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+            lw = len(label) * CHAR_W + 8
+            out.append(f'<rect x="{mx - lw / 2:.1f}" y="{my - 9:.1f}" width="{lw:.1f}" height="18" fill="#fff"/>')
+            out.append(f'<text x="{mx:.1f}" y="{my + 4:.1f}" text-anchor="middle">{html.escape(label)}</text>')
+
+    for n, (text, shape) in nodes.items():
+        (x, y), (w, h) = center[n], size[n]
+        style = 'fill="#ECECFF" stroke="#9370DB" stroke-width="1.5"'
+        if shape == "{":
+            pts = f"{x:.1f},{y - h / 2:.1f} {x + w / 2:.1f},{y:.1f} {x:.1f},{y + h / 2:.1f} {x - w / 2:.1f},{y:.1f}"
+            out.append(f'<polygon points="{pts}" {style}/>')
+        else:
+            rx = h / 2 if shape == "(" else 4
+            out.append(f'<rect x="{x - w / 2:.1f}" y="{y - h / 2:.1f}" width="{w:.1f}" height="{h:.1f}" rx="{rx:.0f}" {style}/>')
+        out.append(f'<text x="{x:.1f}" y="{y + 4:.1f}" text-anchor="middle">{html.escape(text)}</text>')
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def render(code):
+    """SVG for ``code``, from the content-hashed cache when possible."""
+    key = cache_key(code)
+    svg = _cache.get(key)
+    if svg is not None:
+        return svg
+    cache_dir = os.environ.get("MERMAID_SVG_CACHE_DIR")
+    path = os.path.join(cache_dir, key + ".svg") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as fh:
+            svg = fh.read()
+    else:
+        svg = to_svg(code)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(svg)
+            os.replace(tmp, path)
+    _cache[key] = svg
+    return svg
+
+
+def prerender(codes):
+    """Render every diagram in ``codes`` into the cache; returns how many."""
+    count = 0
+    for code in codes:
+        render(code)
+        count += 1
+    return count
@@ -0,0 +1,171 @@
+"""Per-rerun stage timings as Prometheus histograms.
+
+A ``RerunTimer`` measures the stages of one script run::
+
+    timer = RerunTimer(registry)
+    timer.mark("sidebar")
+    with timer.stage("translation"):
+        t = load_text(lang)
+    ...
+    timer.mark("main")
+    ...
+    timer.finish(phase="bcr", lang="de")
+
+A stage's time excludes the stages nested inside it, so the stage times of
+a rerun add up to its total. ``finish`` adds every stage (and ``total``)
+to the ``prostate_app_stage_seconds`` histogram, labelled by stage, phase
+and language.
+
+``Registry.exposition()`` renders the Prometheus text format. It can be
+written to a file for the node_exporter textfile collector
+(``write_textfile``) or served on ``/metrics`` from a background thread
+(``serve``).
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; a rerun takes tens of milliseconds, single stages far less.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (thread safe via its registry)."""
+
+    def __init__(self, name, help_text, label_names, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for label_values, series in sorted(self._series.items()):
+            pairs = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{{{_labels(pairs + [('le', le)])}}} {cumulative}"
+            yield f"{self.name}_sum{{{_labels(pairs)}}} {series[-1]!r}"
+            yield f"{self.name}_count{{{_labels(pairs)}}} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = Histogram(
+            "prostate_app_stage_seconds",
+            "Time per script rerun spent in each stage (exclusive of nested stages).",
+            ("stage", "phase", "lang"),
+        )
+
+    def observe(self, stages, phase, lang):
+        with self._lock:
+            for stage, seconds in stages.items():
+                self.stage_seconds.observe(seconds, stage, phase, lang)
+
+    def exposition(self):
+        h = self.stage_seconds
+        with self._lock:
+            lines = [f"# HELP {h.name} {h.help}", f"# TYPE {h.name} histogram", *h.samples()]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically replace ``path`` with the current exposition."""
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.exposition())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve ``/metrics`` from a daemon thread; returns the server."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+class RerunTimer:
+    """Exclusive wall-clock time per stage of one script run.
+
+    ``mark(name)`` starts a top-level stage that lasts until the next mark;
+    ``with stage(name):`` nests a stage inside the current one. ``finished``
+    is set once ``finish`` has recorded the run.
+    """
+
+    def __init__(self, registry, first="setup"):
+        self.registry = registry
+        self.stages = {}
+        self.finished = False
+        self._start = time.perf_counter()
+        self._stack = [[first, self._start]]  # [stage, running since]
+
+    def _close_top(self, now):
+        name, since = self._stack[-1]
+        self.stages[name] = self.stages.get(name, 0.0) + now - since
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self._close_top(now)
+        self._stack[-1] = [name, now]
+
+    @contextmanager
+    def stage(self, name):
+        now = time.perf_counter()
+        self._close_top(now)
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._close_top(end)
+            self._stack.pop()
+            self._stack[-1][1] = end
+
+    def finish(self, phase, lang):
+        """Record this run's stages and total under ``phase`` and ``lang``."""
+        end = time.perf_counter()
+        self._close_top(end)
+        self._stack[-1][1] = end
+        stages = dict(self.stages, total=end - self._start)
+        self.registry.observe(stages, phase, lang)
+        self.finished = True
+        return stages
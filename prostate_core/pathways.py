@@ -0,0 +1,62 @@
+"""Mermaid source of the pathway diagram shown for each decision."""
+
+
+def diagnosis(psad):
+    return f"""
+    graph TD
+    Start[Suspicion] --> Risk{{Rotterdam Risk}}
+    Risk -->|High| MRI[mpMRI]
+    MRI -->|PIRADS 4-5| Bx[Biopsy]
+    MRI -->|PIRADS 3| PSAD{{PSAD {psad:.2f}}}
+    PSAD -->|>=0.10| Bx
+    PSAD -->|<0.10| Obs[Observation]
+    """
+
+
+def localized(res_key):
+    return "graph TD\nStart --> Risk{Risk Calc} --> " + ("Multi[Multimodal]" if res_key=="rec_multi_high" else "Single[AS or Curative]")
+
+
+def locally_advanced(cn1):
+    if cn1:
+        return "graph TD\nStart --> cN1 --> STAMPEDE[ADT + RT + Abiraterone]"
+    return "graph TD\nStart --> cN0 --> HR[EBRT + 2-3y ADT]"
+
+
+BCR = {
+    "embark": "graph TD\nStart --> Embark[Enzalutamide + ADT]",  # PSADT < 9
+    "high": "graph TD\nStart --> HighRisk --> EarlySalvage",
+    "low": "graph TD\nStart --> LowRisk --> Obs[Observation/Salvage]",
+}
+
+
+def nmcrpc(high):
+    if high:
+        return "graph TD\nnmCRPC --> PSADT{< 10 mo}\nPSADT -->|Yes| ARPI[Apa/Enza/Daro]"
+    return "graph TD\nnmCRPC --> PSADT{> 10 mo}\nPSADT -->|No| Obs[Observation]"
+
+
+def mhspc(high_vol):
+    if high_vol:
+        return "graph TD\nmHSPC --> Vol{High Vol}\nVol --> Triple[Triple Therapy]"
+    return "graph TD\nmHSPC --> Vol{Low Vol}\nVol --> Double[Doublet + RT]"
+
+
+def mcrpc(prior):
+    return f"""
+        graph TD
+        mCRPC --> Prior{{{prior}}}
+        Prior -->|ADT| ARPI[Enza/Abi]
+        Prior -->|ARPI| Chemo[Docetaxel 75q3w/50q2w]
+        Prior -->|Docetaxel| 2ndLine[Cabazitaxel/Lu177]
+        """
+
+
+def finite_diagrams(prior_opts=()):
+    """Every diagram that does not depend on a continuous input."""
+    codes = [localized("rec_multi_high"), localized("rec_curative")]
+    codes += [locally_advanced(True), locally_advanced(False)]
+    codes += list(BCR.values())
+    codes += [nmcrpc(True), nmcrpc(False), mhspc(True), mhspc(False)]
+    codes += [mcrpc(p) for p in prior_opts]
+    return codes
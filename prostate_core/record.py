@@ -0,0 +1,181 @@
+"""Compact patient records coded with the small integers of ``codes.py``.
+
+``Patient`` holds one patient in ``__slots__``: option inputs are codes
+(``ISUP_3``, ``PRIMARY_EBRT``, ``PRIOR_ARPI``, ``GENETIC_BRCA``, ...), never
+display strings, so decisions do not depend on the UI language. It reads
+like a mapping of ``FIELDS`` names, so ``decision.score_patient(patient)``
+and ``dict(patient, psadt=8.0)`` work as with a dict record.
+
+``PatientArray`` stores many patients as one ``array.array`` per field:
+one byte per code and eight per measurement, 44 bytes per patient (about
+44 MB for a million; as dicts of Python values they take about 570 MB,
+as ``Patient`` objects about 260 MB). ``columns()`` hands
+the arrays to NumPy without copying, so ``score()`` runs
+``cohort.score_sidebar`` on them directly. This module itself does not
+import NumPy.
+"""
+
+import array
+import collections.abc
+
+from .codes import GENETIC_UNKNOWN, SIDEBAR_COLUMNS
+
+# field -> array typecode: "B" = code (0-255), "d" = float64 measurement
+FIELDS = {
+    "phase": "B",
+    "psa": "d",
+    "vol": "d",
+    "isup_idx": "B",
+    "t_idx": "B",
+    "pirads_idx": "B",
+    "dre_abnormal": "B",
+    "fam_hist": "B",
+    "primary_idx": "B",
+    "psadt": "d",
+    "interval": "d",
+    "n_idx": "B",
+    "m_idx": "B",
+    "high_vol": "B",
+    "prior_idx": "B",
+    "genetic": "B",
+}
+DEFAULTS = {**SIDEBAR_COLUMNS, "genetic": GENETIC_UNKNOWN}
+BOOLS = frozenset(name for name, value in DEFAULTS.items() if isinstance(value, bool))
+
+
+def coerce(name, value):
+    """``value`` as stored in field ``name``: its default for None, a float, bool or code (0-255)."""
+    if value is None:
+        return DEFAULTS[name]
+    if FIELDS[name] == "d":
+        return float(value)
+    if name in BOOLS:
+        return bool(value)
+    value = int(value)
+    if not 0 <= value <= 255:
+        raise ValueError(f"{name}: code {value} is out of range")
+    return value
+
+
+def _extend_from_numpy(name, col, values):
+    if col.typecode == "d":
+        col.frombytes(values.astype("<f8").tobytes())
+        return
+    if values.dtype.kind not in "biu":
+        raise ValueError(f"{name}: codes must be integers or booleans, got {values.dtype}")
+    if values.size and (values.min() < 0 or values.max() > (1 if name in BOOLS else 255)):
+        raise ValueError(f"{name}: code out of range")
+    col.frombytes(values.astype("u1").tobytes())
+
+
+class Patient(collections.abc.Mapping):
+    """One patient; missing fields take the ``codes.SIDEBAR_COLUMNS`` defaults."""
+
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, **values):
+        unknown = set(values) - set(FIELDS)
+        if unknown:
+            raise TypeError(f"unknown patient fields: {sorted(unknown)}")
+        for name in FIELDS:
+            setattr(self, name, coerce(name, values.get(name)))
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except (AttributeError, TypeError):
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return "Patient(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS) + ")"
+
+
+class PatientArray:
+    """Column store of patients, one ``array.array`` per field."""
+
+    def __init__(self):
+        self._columns = {name: array.array(code) for name, code in FIELDS.items()}
+
+    @classmethod
+    def from_columns(cls, columns):
+        """From equally long sequences keyed by field name (missing fields: defaults)."""
+        n = len(next(iter(columns.values()))) if columns else 0
+        unknown = set(columns) - set(FIELDS)
+        if unknown:
+            raise TypeError(f"unknown patient fields: {sorted(unknown)}")
+        self = cls()
+        for name, col in self._columns.items():
+            if name in columns:
+                values = columns[name]
+                if len(values) != n:
+                    raise ValueError(f"column '{name}' has {len(values)} rows, expected {n}")
+                if hasattr(values, "dtype"):  # NumPy column: one bulk copy
+                    _extend_from_numpy(name, col, values)
+                else:
+                    col.extend(coerce(name, v) for v in values)
+            else:
+                col.extend(array.array(col.typecode, [DEFAULTS[name]]) * n)
+        return self
+
+    def __len__(self):
+        return len(self._columns["phase"])
+
+    def append(self, patient=None, **values):
+        """Add a ``Patient`` (or the fields as keywords)."""
+        if patient is None:
+            patient = Patient(**values)
+        for name, col in self._columns.items():
+            col.append(getattr(patient, name))
+
+    def __getitem__(self, i):
+        patient = Patient.__new__(Patient)
+        for name, col in self._columns.items():
+            value = col[i]
+            setattr(patient, name, bool(value) if name in BOOLS else value)
+        return patient
+
+    @property
+    def nbytes(self):
+        return sum(col.itemsize * len(col) for col in self._columns.values())
+
+    def columns(self):
+        """NumPy views of the columns (no copy), keyed by field name."""
+        import numpy as np
+
+        dtypes = {"B": np.uint8, "d": np.float64}
+        return {name: np.frombuffer(col, dtype=dtypes[col.typecode]) if len(col) else np.empty(0, dtypes[col.typecode])
+                for name, col in self._columns.items()}
+
+    def score(self):
+        """Recommendation codes of every patient (``cohort.score_sidebar``)."""
+        from . import cohort
+
+        return cohort.score_sidebar(self.columns())
+
+    def by_id(self, ids):
+        """Read-only mapping ``patient id -> Patient``; ``ids`` lists the id of each row."""
+        rows = {pid: i for i, pid in enumerate(ids)}
+        if len(rows) != len(self):
+            raise ValueError("ids must be unique and match the number of patients")
+        return _ById(self, rows)
+
+
+class _ById(collections.abc.Mapping):
+    def __init__(self, patients, rows):
+        self._patients = patients
+        self._rows = rows
+
+    def __getitem__(self, pid):
+        return self._patients[self._rows[pid]]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
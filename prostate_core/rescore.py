@@ -0,0 +1,198 @@
+"""Incremental rescoring of a cohort store when a rule threshold changes.
+
+    python -m prostate_core.rescore cohort.store get_bcr_risk interval 18 24 [--apply] [-o flips.csv]
+
+A comparison ``x op t`` can only change its result for values ``x``
+between the old and the new ``t`` (both included), so only those patients
+can get a different recommendation. The boundary index keeps, per rule and
+thresholded input, the patients routed to that rule sorted by the input
+(``boundary/<rule>.<input>.rows`` / ``.values`` in the store directory,
+built on first use; ``psad`` is derived from PSA and volume). A change
+binary-searches the two cut-offs, rescores the patients in between with the
+changed rule and compares them with the stored ``rec`` codes.
+
+The result lists exactly which patients flipped, from which key to which.
+``--apply`` writes the new codes into ``rec.bin``, moves the flipped rows
+between the ``rec`` bitmaps and records the threshold in ``meta.json``, so
+later changes and queries start from the updated registry. A cut-off
+cannot be moved onto another cut-off of the same input (e.g. PSADT 12
+onto the BCR panel's 9): the two could no longer be told apart. Rules
+covered: ``RULES`` (the decisions ``cohort.score_sidebar`` stores, with
+``get_bcr_risk`` standing for the BCR panel including the PSADT < 9
+check).
+"""
+
+import argparse
+import collections
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import cohort, rules, store as store_mod
+from .codes import OUTCOME_CODES, PHASE_BCR, PHASE_DIAG, PHASE_LOCAL, PHASE_NMCRPC, REC_KEYS
+
+# rule name -> (rule as applied by score_sidebar, phase routed to it)
+RULES = {
+    "get_diagnosis_rec": (rules.DIAGNOSIS, PHASE_DIAG),
+    "calculate_risk_local": (rules.LOCALIZED, PHASE_LOCAL),
+    "get_bcr_risk": (rules.BCR_PANEL, PHASE_BCR),
+    "get_nmcrpc_rec": (rules.NMCRPC, PHASE_NMCRPC),
+}
+# rule input -> store column, where the names differ
+_COLUMN = {"pirads": "pirads_idx", "primary": "primary_idx", "prior": "prior_idx"}
+
+Flips = collections.namedtuple("Flips", "rule input old new candidates rows old_codes new_codes")
+
+
+def store_inputs(store, rule, rows):
+    """Rule inputs of ``rows`` read from the store columns."""
+    columns = []
+    for name in rule.inputs:
+        if name == "psad":
+            columns.append(cohort.psa_density(store.column("psa", rows), store.column("vol", rows)))
+        else:
+            columns.append(store.column(_COLUMN.get(name, name), rows))
+    return columns
+
+
+def effective_rule(store, name):
+    """``RULES[name]`` with the threshold changes already applied to ``store``."""
+    rule = RULES[name][0]
+    changes = store.meta.get("thresholds", {}).get(name, [])
+    return rule.with_thresholds({(inp, orig): cur for inp, orig, cur in changes}) if changes else rule
+
+
+class BoundaryIndex:
+    """Patients of each rule's phase sorted by a thresholded input, stored with the store."""
+
+    def __init__(self, store):
+        self.store = store
+        self.dir = os.path.join(store.path, "boundary")
+
+    def _paths(self, name, inp):
+        base = os.path.join(self.dir, f"{name}.{inp}")
+        return base + ".rows", base + ".values"
+
+    def sorted(self, name, inp):
+        """``(values, rows)``: the input of every patient routed to ``name``, ascending."""
+        rows_path, values_path = self._paths(name, inp)
+        if not os.path.exists(values_path):
+            self.build(name, inp)
+        size = os.path.getsize(values_path) // 8
+        if size == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        return (np.memmap(values_path, dtype="<f8", mode="r", shape=size),
+                np.memmap(rows_path, dtype="<i8", mode="r", shape=size))
+
+    def build(self, name, inp):
+        rule, phase = RULES[name]
+        if inp not in rule.thresholds():
+            raise ValueError(f"{name} has no thresholded input '{inp}'")
+        os.makedirs(self.dir, exist_ok=True)
+        rows = self.store.where(phase=phase).rows()
+        if inp == "psad":
+            values = cohort.psa_density(self.store.column("psa", rows), self.store.column("vol", rows))
+        else:
+            values = np.asarray(self.store.column(inp, rows), dtype=np.float64)
+        order = np.argsort(values, kind="stable")  # NaN sorts last
+        rows_path, values_path = self._paths(name, inp)
+        rows[order].astype("<i8").tofile(rows_path)
+        values[order].astype("<f8").tofile(values_path)
+
+    def invalidate(self, columns):
+        """Drop the sorted files that depend on the store ``columns`` (rebuilt on next use)."""
+        if not os.path.isdir(self.dir):
+            return
+        columns = set(columns)
+        for filename in os.listdir(self.dir):
+            _, inp, _ = filename.split(".")
+            depends = {"psa", "vol"} if inp == "psad" else {_COLUMN.get(inp, inp)}
+            if "phase" in columns or depends & columns:
+                os.remove(os.path.join(self.dir, filename))
+
+    def between(self, name, inp, lo, hi):
+        """Rows whose input lies in ``[lo, hi]``."""
+        values, rows = self.sorted(name, inp)
+        start = np.searchsorted(values, lo, "left")
+        stop = np.searchsorted(values, hi, "right")
+        return np.sort(rows[start:stop])
+
+
+def rescore(store, name, inp, old, new, index=None):
+    """Patients whose recommendation flips when ``name``'s ``inp`` cut-off moves from ``old`` to ``new``."""
+    rule = effective_rule(store, name)
+    old, new = float(old), float(new)
+    if old not in rule.thresholds().get(inp, ()):
+        raise ValueError(f"{name}: '{inp}' is not compared against {old:g} "
+                         f"(current cut-offs: {rule.thresholds().get(inp, ())})")
+    if new != old and new in rule.thresholds()[inp]:
+        # both comparisons would then move together, but meta.json records one
+        raise ValueError(f"{name}: '{inp}' is already compared against {new:g}; "
+                         f"moving {old:g} onto it would merge the two cut-offs")
+    changed = rule.with_thresholds({(inp, old): new})
+    index = index or BoundaryIndex(store)
+    rows = index.between(name, inp, min(old, new), max(old, new))
+    old_codes = np.asarray(store.column("rec", rows))
+    new_codes = changed.vectorized(OUTCOME_CODES)(*store_inputs(store, changed, rows))
+    flipped = old_codes != new_codes
+    return Flips(name, inp, old, new, rows.size, rows[flipped], old_codes[flipped], new_codes[flipped])
+
+
+def apply(store, flips):
+    """Write ``flips`` into the store's ``rec`` column, bitmaps and threshold record."""
+    store_mod.update(store, "rec", flips.rows, flips.new_codes)
+    changes = store.meta.setdefault("thresholds", {}).setdefault(flips.rule, [])
+    for entry in changes:
+        if entry[0] == flips.input and entry[2] == flips.old:
+            entry[2] = flips.new
+            break
+    else:
+        changes.append([flips.input, flips.old, flips.new])
+    store_mod.write_meta(store)
+
+
+def rec_key(code):
+    """Translation key of a ``rec`` code (``None`` for ``NO_REC``)."""
+    return REC_KEYS[code] if code < len(REC_KEYS) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.rescore", description=__doc__.splitlines()[0])
+    parser.add_argument("store", help="cohort store directory (prostate_core.store build)")
+    parser.add_argument("rule", choices=RULES)
+    parser.add_argument("input", help="thresholded input, e.g. psa, psad, psadt, interval")
+    parser.add_argument("old", type=float, help="current cut-off")
+    parser.add_argument("new", type=float, help="new cut-off")
+    parser.add_argument("--apply", action="store_true", help="update the stored recommendations")
+    parser.add_argument("-o", "--output", help="write the flipped patients as CSV")
+    args = parser.parse_args(argv)
+
+    store = store_mod.CohortStore(args.store)
+    start = time.perf_counter()
+    flips = rescore(store, args.rule, args.input, args.old, args.new)
+    elapsed = time.perf_counter() - start
+    print(f"{args.rule}: {args.input} {args.old:g} -> {args.new:g}: {flips.candidates} patients between the "
+          f"cut-offs rescored, {flips.rows.size} flipped ({elapsed * 1e3:.1f} ms)")
+    pairs = collections.Counter(zip(flips.old_codes.tolist(), flips.new_codes.tolist()))
+    for (a, b), k in sorted(pairs.items()):
+        print(f"  {rec_key(a)} -> {rec_key(b)}: {k}")
+
+    if args.output:
+        ids = store.column("patient_id", flips.rows) if "patient_id" in store.meta["columns"] else flips.rows
+        with open(args.output, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["patient_id", "row", "old_key", "new_key"])
+            for pid, row, a, b in zip(ids.tolist(), flips.rows.tolist(), flips.old_codes.tolist(),
+                                      flips.new_codes.tolist()):
+                writer.writerow([pid, row, rec_key(a), rec_key(b)])
+    if args.apply:
+        apply(store, flips)
+        print(f"applied to {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Guideline rules as data (see ``spec.py`` for the format).
+
+To move a threshold for a new S3/EAU version, edit it here: the scalar
+functions used by the apps, the cohort engine and the lookup tables are all
+generated from these definitions.
+"""
+
+from .codes import (
+    ISUP_1, ISUP_2, ISUP_3, ISUP_4, PIRADS_3, PIRADS_4_5, PRIMARY_RP, PRIOR_ADT, PRIOR_ARPI, PRIOR_DOCETAXEL,
+    T_CT2A, T_CT2B, T_CT2C,
+)
+from .spec import BOOL, FLOAT, Rule, all_of, any_of
+
+# Categorical inputs are the small-integer codes of ``codes.py``, never
+# display strings, so the rules behave the same in every language.
+PIRADS_IDX = range(3)  # PIRADS_1_2, PIRADS_3, PIRADS_4_5
+PRIMARY_IDX = range(2)  # PRIMARY_RP, PRIMARY_EBRT
+PRIOR_IDX = range(4)  # PRIOR_ADT, PRIOR_DOCETAXEL, PRIOR_ARPI, PRIOR_TRIPLE
+ISUP_IDX = range(5)  # ISUP_1 ... ISUP_5
+T_IDX = range(4)  # T_CT1C, T_CT2A, T_CT2B, T_CT2C
+
+# --- Prostate-Cancer1.py (EAU / S3 2025) ---
+
+_rotterdam_risk = any_of("dre_abnormal", ("psad", ">", 0.15), "fam_hist")
+
+ROTTERDAM = Rule(
+    "get_rotterdam_risk",
+    {"psad": FLOAT, "dre_abnormal": BOOL, "fam_hist": BOOL},
+    [(_rotterdam_risk, "rotterdam_high")],
+    default="rotterdam_low",
+)
+
+DIAGNOSIS = Rule(
+    "get_diagnosis_rec",
+    {"pirads": PIRADS_IDX, "psad": FLOAT, "dre_abnormal": BOOL, "fam_hist": BOOL},
+    [
+        (all_of(_rotterdam_risk, ("pirads", "in", (PIRADS_3, PIRADS_4_5))), "rec_diag_biopsy"),
+        (_rotterdam_risk, "rec_diag_consider"),
+        (("pirads", "==", PIRADS_4_5), "rec_diag_biopsy"),
+        (all_of(("pirads", "==", PIRADS_3), ("psad", ">=", 0.10)), "rec_diag_consider"),
+    ],
+    default="rec_diag_obs",
+)
+
+_local_intermediate = any_of(("psa", ">=", 10), ("isup_idx", "in", (ISUP_2, ISUP_3)), ("t_idx", ">=", T_CT2B))
+
+LOCALIZED = Rule(
+    "calculate_risk_local",
+    {"psa": FLOAT, "isup_idx": ISUP_IDX, "t_idx": T_IDX},
+    [
+        (any_of(("psa", ">", 20), ("isup_idx", ">=", ISUP_4), ("t_idx", ">=", 4)), "rec_multi_high"),
+        # S3 Germany: AS up to PSA 15 for ISUP 1, cT1c/2a
+        (all_of(_local_intermediate, ("psa", "<=", 15), ("isup_idx", "==", ISUP_1), ("t_idx", "<=", T_CT2A)), "rec_as_extended"),
+        (_local_intermediate, "rec_curative"),
+    ],
+    default="rec_as_extended",
+)
+
+_bcr_inputs = {"primary": PRIMARY_IDX, "psadt": FLOAT, "isup_idx": ISUP_IDX, "interval": FLOAT}
+_bcr_branches = [
+    (all_of(("primary", "==", PRIMARY_RP), ("psadt", ">", 12), ("isup_idx", "<", ISUP_4)), "rec_bcr_low"),
+    (("primary", "==", PRIMARY_RP), "rec_bcr_embark"),
+    (all_of(("interval", ">", 18), ("isup_idx", "<", ISUP_4)), "rec_bcr_low"),
+]
+
+BCR = Rule("get_bcr_risk", _bcr_inputs, _bcr_branches, default="rec_bcr_embark")
+
+# Main panel: PSADT < 9 (EMBARK) is checked before get_bcr_risk.
+BCR_PANEL_EMBARK = 0  # index of that branch (``BCR_PANEL.scalar_branch``)
+BCR_PANEL = Rule(
+    "get_bcr_panel_rec",
+    _bcr_inputs,
+    [(("psadt", "<", 9), "rec_bcr_embark"), *_bcr_branches],
+    default="rec_bcr_embark",
+)
+
+LOCALLY_ADVANCED = Rule(
+    "get_la_rec",
+    {"cn1": BOOL},
+    [("cn1", "rec_la_cn1")],
+    default="rec_la_cn0",
+)
+
+NMCRPC = Rule(
+    "get_nmcrpc_rec",
+    {"psadt": FLOAT},
+    [(("psadt", "<", 10), "rec_nmcrpc_high")],
+    default="rec_nmcrpc_low",
+)
+
+MHSPC = Rule(
+    "get_mhspc_rec",
+    {"high_vol": BOOL},
+    [("high_vol", "rec_mhspc_high")],
+    default="rec_mhspc_low",
+)
+
+MCRPC = Rule(
+    "get_mcrpc_line",
+    {"prior": PRIOR_IDX},
+    [
+        (("prior", "==", PRIOR_ADT), "line1_naive"),
+        (("prior", "==", PRIOR_ARPI), "line1_post_arpi"),
+        (("prior", "==", PRIOR_DOCETAXEL), "line2_post_doc"),
+    ],
+    default=None,  # triple therapy: no line shown
+)
+
+# --- First_Try_app.py (earlier S3 2025 / EAU version) ---
+
+_first_try_intermediate = any_of(("psa", ">=", 10), ("isup_idx", ">=", ISUP_2), ("t_idx", "==", T_CT2B))
+
+LOCALIZED_FIRST_TRY = Rule(
+    "first_try_risk_local",
+    {"psa": FLOAT, "isup_idx": ISUP_IDX, "t_idx": T_IDX},
+    [
+        (any_of(("psa", ">", 20), ("isup_idx", ">=", ISUP_4), ("t_idx", "==", T_CT2C)), "high"),
+        # German S3 exception for AS
+        (all_of(_first_try_intermediate, ("psa", "<=", 15), ("isup_idx", "==", ISUP_1)), "int_fav"),
+        (_first_try_intermediate, "int"),
+    ],
+    default="low",
+)
+
+# Main panel: EMBARK box for PSADT < 9, otherwise only the post-RP/post-RT advice.
+BCR_FIRST_TRY = Rule(
+    "first_try_bcr_rec",
+    {"psadt": FLOAT},
+    [(("psadt", "<", 9), "embark")],
+    default="standard",
+)
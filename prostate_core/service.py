@@ -0,0 +1,189 @@
+"""Headless ASGI scoring service (FastAPI) around the sidebar decision logic.
+
+    uvicorn prostate_core.service:app --workers 4
+    python -m prostate_core.service serve --port 8000
+    python -m prostate_core.service bench          # in-process test client
+
+Endpoints (``?lang=en|de|es`` selects the language of returned text):
+
+- ``POST /score``: one patient, scored with the scalar rules
+- ``POST /score/batch``: ``{"patients": [...]}`` with up to ``MAX_BATCH``
+  records, scored column-wise with ``cohort.score_sidebar``; ``results``
+  holds one ``/score`` response per patient, in order, without ``text``:
+  each distinct recommendation text is returned once in ``texts``
+- ``GET /health``
+
+Patients use the ``cohort.SIDEBAR_COLUMNS`` fields with ``phase`` given as
+one of ``cohort.PHASE_KEYS``. Out-of-range codes, unknown fields and missing
+phase-specific inputs are rejected with the usual 422 validation error.
+"""
+
+import argparse
+import sys
+import time
+from typing import Literal, Optional, Union
+
+import numpy as np
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from . import catalog, cohort
+
+MAX_BATCH = 100_000
+
+LANG_CODES = {code: name for name, code in catalog.LANGUAGES.items()}
+Lang = Literal["en", "de", "es"]
+
+# Inputs the sidebar always asks for in a phase; everything else has a default.
+REQUIRED = {
+    "diagnosis": ("psa", "vol"),
+    "localized": ("psa",),
+    "bcr": ("psadt",),
+    "nmcrpc": ("psadt",),
+}
+
+
+class Patient(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    patient_id: Optional[Union[int, str]] = None
+    phase: Literal[cohort.PHASE_KEYS]
+    psa: Optional[float] = Field(None, ge=0)
+    vol: Optional[float] = Field(None, ge=0)
+    isup_idx: int = Field(0, ge=0, le=4)
+    t_idx: int = Field(0, ge=0, le=3)
+    pirads_idx: int = Field(0, ge=0, le=2)
+    dre_abnormal: bool = False
+    fam_hist: bool = False
+    primary_idx: int = Field(0, ge=0, le=1)
+    psadt: Optional[float] = Field(None, ge=0)
+    interval: float = Field(0.0, ge=0)
+    n_idx: int = Field(0, ge=0, le=1)
+    m_idx: int = Field(0, ge=0, le=1)
+    high_vol: bool = False
+    prior_idx: int = Field(0, ge=0, le=3)
+
+    @model_validator(mode="after")
+    def _phase_inputs(self):
+        missing = [f for f in REQUIRED.get(self.phase, ()) if getattr(self, f) is None]
+        if missing:
+            raise ValueError(f"phase '{self.phase}' requires {', '.join(missing)}")
+        return self
+
+
+class Batch(BaseModel):
+    patients: list[Patient] = Field(..., max_length=MAX_BATCH)
+
+
+_PHASE_INDEX = {key: i for i, key in enumerate(cohort.PHASE_KEYS)}
+
+app = FastAPI(title="Prostate Cancer Algorithm scoring service")
+
+
+def _text(lang):
+    return catalog.load(LANG_CODES[lang])
+
+
+def _psad(psa, vol):
+    return psa / vol if vol > 0 else 0.0
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/score")
+async def score(patient: Patient, lang: Lang = Query("en")):
+    record = patient.model_dump()
+    record["phase"] = _PHASE_INDEX[patient.phase]
+    rec_key = cohort.score_patient(record)
+    psad = _psad(patient.psa, patient.vol) if patient.phase == "diagnosis" else None
+    return {
+        "patient_id": patient.patient_id,
+        "phase": patient.phase,
+        "rec_key": rec_key,
+        "psad": psad,
+        "text": _text(lang)[rec_key] if rec_key else None,
+    }
+
+
+@app.post("/score/batch")
+def score_batch(batch: Batch, lang: Lang = Query("en")):
+    # sync endpoint: FastAPI runs it in the thread pool, off the event loop
+    patients = batch.patients
+    columns = {}
+    for name, default in cohort.SIDEBAR_COLUMNS.items():
+        if name == "phase":
+            columns[name] = np.fromiter((_PHASE_INDEX[p.phase] for p in patients), np.int8, len(patients))
+            continue
+        values = [getattr(p, name) for p in patients]
+        columns[name] = np.array([default if v is None else v for v in values])
+    codes = cohort.score_sidebar(columns)
+    psad = cohort.psa_density(columns["psa"], columns["vol"])
+    is_diag = columns["phase"] == cohort.PHASE_DIAG
+
+    keys = cohort.decode(codes).tolist()
+    psad_out = np.where(is_diag, psad, np.nan).tolist()
+    results = [
+        {"patient_id": p.patient_id, "phase": p.phase, "rec_key": k, "psad": None if d != d else d}
+        for p, k, d in zip(patients, keys, psad_out)
+    ]
+    text = _text(lang)
+    texts = {k: text[k] for k in set(keys) if k is not None}
+    return JSONResponse({"results": results, "texts": texts})
+
+
+def _bench(n_single, batch_size, n_batches):
+    from fastapi.testclient import TestClient
+
+    rng = np.random.default_rng(0)
+    client = TestClient(app)
+    patient = {"phase": "localized", "psa": 12.0, "isup_idx": 0, "t_idx": 1}
+    client.post("/score", json=patient).raise_for_status()
+
+    start = time.perf_counter()
+    for _ in range(n_single):
+        client.post("/score", json=patient)
+    single = n_single / (time.perf_counter() - start)
+
+    phases = rng.integers(0, len(cohort.PHASE_KEYS), batch_size)
+    records = [
+        {"patient_id": i, "phase": cohort.PHASE_KEYS[ph], "psa": float(rng.uniform(0, 30)),
+         "vol": float(rng.uniform(10, 80)), "psadt": float(rng.uniform(0, 24)),
+         "isup_idx": int(rng.integers(0, 5)), "pirads_idx": int(rng.integers(0, 3))}
+        for i, ph in enumerate(phases)
+    ]
+    start = time.perf_counter()
+    for _ in range(n_batches):
+        client.post("/score/batch", json={"patients": records}).raise_for_status()
+    batch = n_batches * batch_size / (time.perf_counter() - start)
+    print(f"POST /score:       {single:,.0f} requests/s (in-process test client)")
+    print(f"POST /score/batch: {batch:,.0f} patients/s ({batch_size} per request)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.service")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve = sub.add_parser("serve", help="run with uvicorn")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=1)
+    bench = sub.add_parser("bench", help="benchmark with the in-process test client")
+    bench.add_argument("--single", type=int, default=2000, help="single-patient requests")
+    bench.add_argument("--batch-size", type=int, default=5000)
+    bench.add_argument("--batches", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        import uvicorn
+
+        uvicorn.run("prostate_core.service:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        _bench(args.single, args.batch_size, args.batches)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Declarative rule format and its scalar and vectorized backends.
+
+A ``Rule`` is pure data: named inputs with their kind, an ordered list of
+``(condition, outcome)`` branches where the first matching branch wins, and
+a default outcome. Conditions are nested tuples:
+
+- ``"name"``: a boolean input is true
+- ``("name", op, value)`` with op in ``< <= > >= == != in``
+- ``any_of(c1, c2, ...)`` / ``all_of(c1, c2, ...)``
+
+Input kinds: ``FLOAT`` (continuous), ``BOOL``, a ``range`` of integer codes,
+or a tuple of option strings. Option inputs are compared with their display
+string by the scalar backend and passed as an index into the tuple to the
+vectorized backend.
+
+``rule.scalar`` is a plain Python function generated from the branches, so
+it runs as fast as a hand-written if/elif chain. ``rule.vectorized(codes)``
+returns a NumPy function over column arrays that yields ``codes[outcome]``;
+NumPy is imported on that first call, so the scalar path starts without it.
+"""
+
+import math
+
+FLOAT = float
+BOOL = bool
+
+_SCALAR_OPS = {"<", "<=", ">", ">=", "==", "!=", "in"}
+
+
+def any_of(*conds):
+    return ("any", conds)
+
+
+def all_of(*conds):
+    return ("all", conds)
+
+
+def _is_group(cond):
+    return isinstance(cond, tuple) and len(cond) == 2 and cond[0] in ("any", "all")
+
+
+def iter_atoms(cond):
+    """Yield every ``(name, op, value)`` or bare-name atom of a condition."""
+    if _is_group(cond):
+        for sub in cond[1]:
+            yield from iter_atoms(sub)
+    else:
+        yield cond
+
+
+def representatives(breaks):
+    """One value per bucket of ``breaks`` (``Rule.thresholds()``): below, at
+    and between the breakpoints, above, NaN."""
+    if not breaks:
+        return [0.0, math.nan]
+    reps = [breaks[0] - 1.0]
+    for lo, hi in zip(breaks, breaks[1:]):
+        reps += [lo, (lo + hi) / 2]
+    reps += [breaks[-1], breaks[-1] + 1.0, math.nan]
+    return reps
+
+
+class Rule:
+    """One decision (e.g. the Localized phase) expressed as data."""
+
+    def __init__(self, name, inputs, branches, default):
+        self.name = name
+        self.inputs = dict(inputs)
+        self.branches = tuple(branches)
+        self.default = default
+        for cond, _ in self.branches:
+            for atom in iter_atoms(cond):
+                self._validate(atom)
+        self._scalar = None
+        self._scalar_branch = None
+
+    def _validate(self, atom):
+        if isinstance(atom, str):
+            if self.inputs.get(atom) is not BOOL:
+                raise ValueError(f"{self.name}: '{atom}' is not a boolean input")
+            return
+        name, op, value = atom
+        if name not in self.inputs:
+            raise ValueError(f"{self.name}: unknown input '{name}'")
+        if op not in _SCALAR_OPS:
+            raise ValueError(f"{self.name}: unsupported operator '{op}'")
+        kind = self.inputs[name]
+        if isinstance(kind, tuple):
+            values = value if op == "in" else (value,)
+            if op not in ("==", "!=", "in") or any(v not in kind for v in values):
+                raise ValueError(f"{self.name}: '{name}' must be tested for equality with one of {kind}")
+
+    @property
+    def outcomes(self):
+        """Distinct outcomes in branch order, default last."""
+        seen = []
+        for out in [o for _, o in self.branches] + [self.default]:
+            if out not in seen:
+                seen.append(out)
+        return tuple(seen)
+
+    def thresholds(self):
+        """Sorted constants each ``FLOAT`` input is compared against."""
+        found = {name: set() for name, kind in self.inputs.items() if kind is FLOAT}
+        for cond, _ in self.branches:
+            for atom in iter_atoms(cond):
+                if not isinstance(atom, str) and atom[0] in found:
+                    found[atom[0]].add(float(atom[2]))
+        return {name: tuple(sorted(v)) for name, v in found.items()}
+
+    def with_thresholds(self, changes):
+        """Copy of the rule with ``FLOAT`` constants replaced, ``{(input, old): new}``.
+
+        Every comparison of ``input`` against ``old`` gets ``new`` instead,
+        e.g. ``{("psad", 0.15): 0.20}``.
+        """
+        current = {(name, v) for name, values in self.thresholds().items() for v in values}
+        changes = {(name, float(old)): float(new) for (name, old), new in changes.items()}
+        unknown = set(changes) - current
+        if unknown:
+            raise ValueError(f"{self.name}: no comparisons against {sorted(unknown)}")
+
+        def sub(cond):
+            if _is_group(cond):
+                return (cond[0], tuple(sub(c) for c in cond[1]))
+            if isinstance(cond, str) or self.inputs[cond[0]] is not FLOAT:
+                return cond
+            name, op, value = cond
+            return (name, op, changes.get((name, float(value)), value))
+
+        return Rule(self.name, self.inputs, [(sub(c), o) for c, o in self.branches], self.default)
+
+    # --- scalar backend ---
+
+    def _scalar_expr(self, cond):
+        if _is_group(cond):
+            joiner = " or " if cond[0] == "any" else " and "
+            return "(" + joiner.join(self._scalar_expr(c) for c in cond[1]) + ")"
+        if isinstance(cond, str):
+            return cond
+        name, op, value = cond
+        if op == "in":
+            value = tuple(value)
+        return f"{name} {op} {value!r}"
+
+    def scalar_source(self, branch_index=False):
+        """Source of the generated scalar function.
+
+        With ``branch_index`` it returns the index of the matching branch
+        (``None`` for the default) instead of the outcome.
+        """
+        lines = [f"def {self.name}({', '.join(self.inputs)}):"]
+        for i, (cond, outcome) in enumerate(self.branches):
+            lines.append(f"    if {self._scalar_expr(cond)}: return {i if branch_index else outcome!r}")
+        lines.append(f"    return {None if branch_index else self.default!r}")
+        return "\n".join(lines) + "\n"
+
+    def _compile(self, branch_index):
+        namespace = {}
+        exec(compile(self.scalar_source(branch_index), f"<rule {self.name}>", "exec"), namespace)
+        return namespace[self.name]
+
+    @property
+    def scalar(self):
+        if self._scalar is None:
+            self._scalar = self._compile(False)
+        return self._scalar
+
+    @property
+    def scalar_branch(self):
+        """Scalar function returning which branch decides (index, ``None`` for the default)."""
+        if self._scalar_branch is None:
+            self._scalar_branch = self._compile(True)
+        return self._scalar_branch
+
+    # --- vectorized backend ---
+
+    def vectorized(self, codes, dtype=None):
+        """NumPy evaluator returning ``codes[outcome]`` per row (``uint8`` by default)."""
+        import numpy as np
+
+        if dtype is None:
+            dtype = np.uint8
+        names = tuple(self.inputs)
+        kinds = self.inputs
+        choices = [dtype(codes[o]) for _, o in self.branches]
+        default = dtype(codes[self.default])
+
+        def atom(cols, cache, cond):
+            if cond in cache:
+                return cache[cond]
+            if _is_group(cond):
+                parts = [atom(cols, cache, c) for c in cond[1]]
+                res = parts[0]
+                for p in parts[1:]:
+                    res = (res | p) if cond[0] == "any" else (res & p)
+            elif isinstance(cond, str):
+                res = np.asarray(cols[cond], dtype=bool)
+            else:
+                name, op, value = cond
+                col = cols[name]
+                kind = kinds[name]
+                if isinstance(kind, tuple):
+                    value = [kind.index(v) for v in value] if op == "in" else kind.index(value)
+                if op == "in":
+                    res = np.zeros(col.shape, dtype=bool)
+                    for v in value:
+                        res |= col == v
+                elif op == "<":
+                    res = col < value
+                elif op == "<=":
+                    res = col <= value
+                elif op == ">":
+                    res = col > value
+                elif op == ">=":
+                    res = col >= value
+                elif op == "==":
+                    res = col == value
+                else:
+                    res = col != value
+            cache[cond] = res
+            return res
+
+        def evaluate(*columns):
+            cols = {}
+            for name, col in zip(names, columns):
+                cols[name] = np.asarray(col, dtype=np.float64) if kinds[name] is FLOAT else np.asarray(col)
+            cache = {}
+            conds = [atom(cols, cache, c) for c, _ in self.branches]
+            shape = np.broadcast_shapes(*(c.shape for c in cols.values()))
+            out = np.full(shape, default, dtype=dtype)
+            # last branch first so earlier (higher priority) branches win
+            for mask, choice in zip(reversed(conds), reversed(choices)):
+                out[mask] = choice
+            return out
+
+        evaluate.__name__ = f"{self.name}_vectorized"
+        return evaluate
@@ -0,0 +1,338 @@
+"""On-disk columnar cohort store with bitmap indexes, opened with mmap.
+
+    python -m prostate_core.store build cohort.parquet cohort.store
+    python -m prostate_core.store query cohort.store "isup_idx>=4" "n_idx=1" "genetic=2"
+    python -m prostate_core.store query cohort.store "rec=rec_nmcrpc_high"
+
+A store is a directory: one raw little-endian file per ``record.FIELDS``
+column, ``rec.bin`` with the ``cohort.score_sidebar`` code of every patient,
+``patient_id.bin`` if the input had integer ids, and per categorical column
+(codes, flags and ``rec``) a bitmap index: for each value present one bit
+per patient, packed into 64-bit words. ``meta.json`` describes the layout.
+
+``CohortStore`` maps these files with ``numpy.memmap``; nothing is read until
+a query touches it. ``where(isup_idx=(ISUP_4, ISUP_5), n_idx=N_CN1,
+genetic=GENETIC_BRCA)`` ORs the bitmaps of the listed values per field and
+ANDs the fields: a few word-wise operations over n/8 bytes per bitmap (a
+couple of milliseconds for 10 million patients) instead of a scan of the
+columns. The resulting ``Bitmap`` counts itself, combines with ``& | ~``
+and yields row numbers to read other columns for the subgroup only
+(``store.column("psa", bitmap)``).
+
+Building streams the input in batches (``cli.iter_batches``), appends the
+columns to their files and then indexes them from the mapped files in
+chunks, so neither building nor querying holds the cohort in memory.
+``update`` rewrites single cells in place and moves the rows between the
+bitmaps of an indexed column; ``write_meta`` then saves ``meta.json``.
+"""
+
+import argparse
+import json
+import operator
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import cohort, record
+from .codes import REC_CODES, REC_KEYS
+
+FORMAT_VERSION = 1
+_DTYPES = {"B": "<u1", "d": "<f8"}
+INDEXED = tuple(name for name, code in record.FIELDS.items() if code == "B") + ("rec",)
+CHUNK_ROWS = 1 << 23  # multiple of 64, so chunks start on a word boundary
+
+
+def _words(n):
+    return (n + 63) // 64
+
+
+def _count_bits(words):
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+class Bitmap:
+    """Set of rows of a store, one bit per patient in ``uint64`` words."""
+
+    __slots__ = ("words", "n")
+
+    def __init__(self, words, n):
+        self.words = words
+        self.n = n
+
+    @classmethod
+    def full(cls, n):
+        return cls(np.full(_words(n), np.iinfo(np.uint64).max, dtype=np.uint64), n)._clear_tail()
+
+    def _clear_tail(self):
+        tail = self.n % 64
+        if tail and self.words.size:
+            self.words[-1] &= np.uint64((1 << tail) - 1)
+        return self
+
+    def __and__(self, other):
+        return Bitmap(self.words & other.words, self.n)
+
+    def __or__(self, other):
+        return Bitmap(self.words | other.words, self.n)
+
+    def __invert__(self):
+        return Bitmap(~self.words, self.n)._clear_tail()
+
+    def count(self):
+        return _count_bits(self.words)
+
+    __len__ = count
+
+    def rows(self):
+        """Row numbers in the set, ascending."""
+        bits = np.unpackbits(self.words.view(np.uint8), count=self.n, bitorder="little")
+        return np.flatnonzero(bits)
+
+
+def _parse_term(term):
+    for op_text, op in (("!=", operator.ne), (">=", operator.ge), ("<=", operator.le),
+                        ("=", operator.eq), (">", operator.gt), ("<", operator.lt)):
+        if op_text in term:
+            name, value = term.split(op_text, 1)
+            return name.strip(), op, value.strip()
+    raise ValueError(f"cannot parse '{term}' (expected e.g. isup_idx>=3 or rec=rec_bcr_embark)")
+
+
+class CohortStore:
+    """Read-only view of a store directory; columns and indexes are memory-mapped."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            self.meta = json.load(fh)
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported store version {self.meta['version']}")
+        self.n = self.meta["rows"]
+        self._columns = {}
+        self._indexes = {}
+
+    def __len__(self):
+        return self.n
+
+    def _map(self, filename, dtype, shape):
+        if self.n == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, filename), dtype=dtype, mode="r", shape=shape)
+
+    def column(self, name, rows=None):
+        """Column ``name`` (mapped), or only its values at ``rows`` (a ``Bitmap`` or row numbers)."""
+        if name not in self._columns:
+            dtype = self.meta["columns"][name]
+            self._columns[name] = self._map(f"{name}.bin", dtype, self.n)
+        col = self._columns[name]
+        if rows is None:
+            return col
+        return col[rows.rows() if isinstance(rows, Bitmap) else rows]
+
+    def _index(self, name):
+        if name not in self._indexes:
+            values = self.meta["indexes"][name]
+            words = self._map(f"{name}.idx", np.uint64, (len(values), _words(self.n)))
+            self._indexes[name] = ({v: i for i, v in enumerate(values)}, words)
+        return self._indexes[name]
+
+    def values(self, name):
+        """Values present in the indexed column ``name``."""
+        return list(self.meta["indexes"][name])
+
+    def bitmap(self, name, values):
+        """Rows whose indexed column ``name`` holds one of ``values``."""
+        positions, words = self._index(name)
+        if isinstance(values, (int, str, np.integer)):
+            values = (values,)
+        values = [REC_CODES[v] if name == "rec" and isinstance(v, str) else int(v) for v in values]
+        out = np.zeros(words.shape[1], dtype=np.uint64)
+        for v in values:
+            if v in positions:
+                out |= words[positions[v]]
+        return Bitmap(out, self.n)
+
+    def where(self, **conditions):
+        """AND over fields of the OR over each field's values, e.g. ``where(phase=3, isup_idx=(3, 4))``."""
+        result = None
+        for name, values in conditions.items():
+            bm = self.bitmap(name, values)
+            result = bm if result is None else result & bm
+        return result if result is not None else Bitmap.full(self.n)
+
+    def query(self, *terms):
+        """``where`` from text terms such as ``"isup_idx>=3"``, ``"n_idx=1"``, ``"rec=rec_bcr_embark"``."""
+        conditions = {}
+        for term in terms:
+            name, op, value = _parse_term(term)
+            if name not in self.meta["indexes"]:
+                raise ValueError(f"'{name}' has no index (indexed: {', '.join(self.meta['indexes'])})")
+            target = REC_CODES[value] if name == "rec" and value in REC_CODES else int(value)
+            selected = [v for v in self.values(name) if op(v, target)]
+            if name in conditions:
+                selected = [v for v in conditions[name] if v in selected]
+            conditions[name] = selected
+        return self.where(**conditions)
+
+
+def update(store, name, rows, values):
+    """Write ``values`` into column ``name`` at ``rows`` (unique row numbers), in place.
+
+    Indexed columns keep their bitmaps in step; a value not seen before gets
+    a new bitmap, listed in ``store.meta`` (save it with ``write_meta``).
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    if rows.size == 0:
+        return
+    dtype = store.meta["columns"][name]
+    values = np.broadcast_to(np.asarray(values).astype(dtype), rows.shape)
+    col = np.memmap(os.path.join(store.path, f"{name}.bin"), dtype=dtype, mode="r+", shape=store.n)
+    old = np.array(col[rows])
+    col[rows] = values
+    col.flush()
+    if name not in store.meta["indexes"]:
+        return
+
+    known = store.meta["indexes"][name]
+    n_words = _words(store.n)
+    for v in np.unique(values):
+        if int(v) not in known:  # first patient with this value: append an empty bitmap
+            with open(os.path.join(store.path, f"{name}.idx"), "ab") as fh:
+                np.zeros(n_words, dtype="<u8").tofile(fh)
+            known.append(int(v))
+    store._indexes.pop(name, None)
+    words = np.memmap(os.path.join(store.path, f"{name}.idx"), dtype="<u8", mode="r+", shape=(len(known), n_words))
+    word = rows // 64
+    bit = np.left_shift(np.uint64(1), (rows % 64).astype(np.uint64))
+    pos = np.zeros(256, dtype=np.int64)
+    pos[known] = np.arange(len(known))
+    np.bitwise_and.at(words, (pos[old], word), ~bit)
+    np.bitwise_or.at(words, (pos[values.astype(np.int64)], word), bit)
+    words.flush()
+
+
+def write_meta(store):
+    """Save ``store.meta`` (replacing ``meta.json`` atomically)."""
+    path = os.path.join(store.path, "meta.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(store.meta, fh, indent=2)
+        fh.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def build(src, dst, batch_rows=1_000_000):
+    """Score ``src`` (CSV/Parquet, ``cli.py`` columns) into a new store at ``dst``; returns rows."""
+    import pyarrow.types
+
+    from . import cli
+
+    os.makedirs(dst, exist_ok=False)
+    names = list(record.FIELDS)
+    files = {name: open(os.path.join(dst, f"{name}.bin"), "wb") for name in names + ["rec"]}
+    ids = None
+    n = 0
+    try:
+        for batch in cli.iter_batches(src, batch_rows, extra=("genetic",)):
+            if batch.num_rows == 0:
+                continue
+            present = set(batch.schema.names)
+            columns = {name: cli.batch_column(batch, name) for name in cohort.SIDEBAR_COLUMNS if name in present}
+            if "genetic" in present:
+                arr = batch.column("genetic")
+                columns["genetic"] = arr.fill_null(record.DEFAULTS["genetic"]).to_numpy(zero_copy_only=False)
+            patients = record.PatientArray.from_columns(columns).columns()
+            for name in names:
+                files[name].write(patients[name].tobytes())
+            files["rec"].write(cohort.score_sidebar(patients).astype("<u1").tobytes())
+            if cli.ID_COLUMN in present and pyarrow.types.is_integer(batch.schema.field(cli.ID_COLUMN).type):
+                if ids is None:
+                    if n:
+                        raise ValueError("patient_id is missing from the first batches")
+                    ids = open(os.path.join(dst, "patient_id.bin"), "wb")
+                ids.write(batch.column(cli.ID_COLUMN).to_numpy().astype("<i8").tobytes())
+            n += batch.num_rows
+    finally:
+        for fh in files.values():
+            fh.close()
+        if ids is not None:
+            ids.close()
+
+    dtypes = {name: _DTYPES[record.FIELDS[name]] for name in names}
+    dtypes["rec"] = "<u1"
+    if ids is not None:
+        dtypes["patient_id"] = "<i8"
+    indexes = {name: _write_index(dst, name, n) for name in INDEXED}
+    meta = {"version": FORMAT_VERSION, "rows": n, "columns": dtypes, "indexes": indexes,
+            "rec_keys": list(REC_KEYS)}
+    with open(os.path.join(dst, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+        fh.write("\n")
+    return n
+
+
+def _write_index(dst, name, n):
+    """Bitmaps of the column file ``name.bin``, built chunk by chunk; returns the values."""
+    col = np.memmap(os.path.join(dst, f"{name}.bin"), dtype="<u1", mode="r", shape=n) if n else np.empty(0, "<u1")
+    counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, n, CHUNK_ROWS):
+        counts += np.bincount(col[start:start + CHUNK_ROWS], minlength=256)
+    values = [int(v) for v in np.flatnonzero(counts)]
+    words = np.zeros((len(values), _words(n)), dtype="<u8")
+    for start in range(0, n, CHUNK_ROWS):
+        chunk = np.asarray(col[start:start + CHUNK_ROWS])
+        w0 = start // 64
+        for i, v in enumerate(values):
+            packed = np.packbits(chunk == v, bitorder="little")
+            packed = np.pad(packed, (0, -packed.size % 8))
+            words[i, w0:w0 + packed.size // 8] = packed.view("<u8")
+    words.tofile(os.path.join(dst, f"{name}.idx"))
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.store", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="score a CSV/Parquet cohort into a new store directory")
+    p_build.add_argument("src")
+    p_build.add_argument("dst")
+    p_build.add_argument("--batch-rows", type=int, default=1_000_000)
+    p_query = sub.add_parser("query", help="count (and optionally list) the patients matching all terms")
+    p_query.add_argument("store")
+    p_query.add_argument("terms", nargs="*", help="e.g. isup_idx>=3 n_idx=1 genetic=2 rec=rec_nmcrpc_high")
+    p_query.add_argument("--by", help="also break the count down by this indexed column (e.g. rec)")
+    p_query.add_argument("--show", type=int, default=0, metavar="N", help="print the first N matching rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        rows = build(args.src, args.dst, args.batch_rows)
+        print(f"{rows} patients in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return 0
+
+    store = CohortStore(args.store)
+    start = time.perf_counter()
+    hits = store.query(*args.terms)
+    count = hits.count()
+    elapsed = time.perf_counter() - start
+    print(f"{count} of {len(store)} patients ({elapsed * 1e3:.1f} ms)")
+    if args.by:
+        for v in store.values(args.by):
+            k = (hits & store.bitmap(args.by, v)).count()
+            if k:
+                label = (REC_KEYS[v] if v < len(REC_KEYS) else "none") if args.by == "rec" else v
+                print(f"  {args.by}={label}: {k}")
+    if args.show:
+        rows = hits.rows()[:args.show]
+        names = list(store.meta["columns"])
+        print("row," + ",".join(names))
+        for r in rows:
+            print(f"{r}," + ",".join(str(store.column(name)[r]) for name in names))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
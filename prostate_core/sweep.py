@@ -0,0 +1,187 @@
+"""Threshold sensitivity sweeps over a cohort.
+
+How many patients would be biopsied, or stay on active surveillance, if the
+PSAD cut-offs moved away from 0.10/0.15 or the S3 PSA <= 15 exception for
+AS changed? ``sweep`` answers this for ``get_diagnosis_rec`` and
+``calculate_risk_local`` over a grid of alternative thresholds::
+
+    python -m prostate_core.sweep cohort.parquet \\
+        --psad-high 0.10 0.15 0.20 --psad-pirads3 0.05 0.10 --as-psa-max 10 15 20
+
+prints (or writes with ``-o``) one CSV row per grid point with the count of
+every recommendation. Input columns are those of ``cli.py``; only
+Diagnosis-phase rows count for ``get_diagnosis_rec`` and Localized-phase
+rows for ``calculate_risk_local``.
+
+The cohort is read once. Each ``FLOAT`` input is cut at the union of the
+rule's own thresholds and every candidate value in the grid, and patients
+are counted per combination of bucket and categorical value (``Sweep.add``).
+Inside one such cell every comparison a grid point can make has the same
+result, so a grid point only evaluates the rule once per occupied cell,
+weighted by its count: its cost does not depend on the cohort size, and
+the counts are exactly those of rescoring every patient.
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import sys
+import time
+
+import numpy as np
+
+from . import cohort, rules
+from .codes import OUTCOME_CODES, PHASE_DIAG, PHASE_LOCAL, REC_KEYS
+from .spec import BOOL, FLOAT, representatives
+
+# name -> (decision, rule input, current threshold)
+PARAMETERS = {
+    "psad_high": ("diagnosis", "psad", 0.15),  # Rotterdam high risk: PSAD > 0.15
+    "psad_pirads3": ("diagnosis", "psad", 0.10),  # PIRADS 3 biopsy: PSAD >= 0.10
+    "as_psa_max": ("localized", "psa", 15),  # S3 AS exception: PSA <= 15
+}
+DECISIONS = {"diagnosis": rules.DIAGNOSIS, "localized": rules.LOCALIZED}
+
+
+
+class Sweep:
+    """Cell counts of a cohort for one rule, binned for a set of candidate thresholds."""
+
+    def __init__(self, rule, candidates=None):
+        """``candidates`` maps ``FLOAT`` inputs to the threshold values to be tried."""
+        candidates = candidates or {}
+        self.rule = rule
+        self.names = tuple(rule.inputs)
+        self._axes = []  # per input: sorted breakpoints, or categorical domain
+        values = []
+        for name, kind in rule.inputs.items():
+            if kind is FLOAT:
+                breaks = sorted(set(rule.thresholds()[name]) | {float(v) for v in candidates.get(name, ())})
+                self._axes.append(np.array(breaks))
+                values.append(representatives(breaks))
+            else:
+                dom = (False, True) if kind is BOOL else list(range(len(kind))) if isinstance(kind, tuple) else list(kind)
+                self._axes.append(None)
+                values.append(dom)
+        self.shape = tuple(len(v) for v in values)
+        self._values = values
+        self.cell_counts = np.zeros(math.prod(self.shape), dtype=np.int64)
+        self.skipped = 0  # rows with a categorical value outside the rule's domain
+
+    def add(self, columns):
+        """Count the rows of ``columns`` (rule input name -> array) into the cells."""
+        cell = None
+        valid = None
+        for name, breaks, dom, size in zip(self.names, self._axes, self._values, self.shape):
+            col = np.asarray(columns[name])
+            if breaks is not None:
+                col = col.astype(np.float64)
+                idx = np.searchsorted(breaks, col, "left") + np.searchsorted(breaks, col, "right")
+                idx[np.isnan(col)] = size - 1
+            else:
+                idx = col.astype(np.int64) - int(dom[0])
+                ok = (idx >= 0) & (idx < size)
+                valid = ok if valid is None else valid & ok
+            cell = idx if cell is None else cell * size + idx
+        if valid is not None and not valid.all():
+            self.skipped += int((~valid).sum())
+            cell = cell[valid]
+        self.cell_counts += np.bincount(cell, minlength=self.cell_counts.size)
+
+    def counts(self, changes=None):
+        """``{outcome: patients}`` with the thresholds in ``changes`` (``{(input, old): new}``)."""
+        rule = self.rule.with_thresholds(changes) if changes else self.rule
+        occupied = np.flatnonzero(self.cell_counts)
+        index = np.unravel_index(occupied, self.shape)
+        reps = [np.asarray(v)[i] for v, i in zip(self._values, index)]
+        codes = rule.vectorized(OUTCOME_CODES)(*reps)
+        totals = np.bincount(codes, weights=self.cell_counts[occupied], minlength=len(REC_KEYS))
+        return {out: int(totals[OUTCOME_CODES[out]]) for out in rule.outcomes}
+
+
+def rule_inputs(columns):
+    """Rows and inputs of each decision from cohort columns (``cli.py`` names)."""
+    phase = np.asarray(columns["phase"])
+
+    def col(name, sel):
+        if name in columns:
+            return np.take(columns[name], sel)
+        return np.full(sel.size, cohort.SIDEBAR_COLUMNS[name])
+
+    sel = np.flatnonzero(phase == PHASE_DIAG)
+    diagnosis = {
+        "pirads": col("pirads_idx", sel),
+        "psad": cohort.psa_density(col("psa", sel), col("vol", sel)),
+        "dre_abnormal": col("dre_abnormal", sel),
+        "fam_hist": col("fam_hist", sel),
+    }
+    sel = np.flatnonzero(phase == PHASE_LOCAL)
+    localized = {"psa": col("psa", sel), "isup_idx": col("isup_idx", sel), "t_idx": col("t_idx", sel)}
+    return {"diagnosis": diagnosis, "localized": localized}
+
+
+def sweeps(grid):
+    """One empty ``Sweep`` per decision a parameter of ``grid`` belongs to."""
+    candidates = {}
+    for param, values in grid.items():
+        decision, name, _ = PARAMETERS[param]
+        candidates.setdefault(decision, {}).setdefault(name, []).extend(values)
+    return {decision: Sweep(DECISIONS[decision], cands) for decision, cands in candidates.items()}
+
+
+def table(sweeps_, grid):
+    """One row per grid point and decision: parameter values and outcome counts."""
+    rows = []
+    for decision, sw in sweeps_.items():
+        params = [p for p in grid if PARAMETERS[p][0] == decision]
+        for point in itertools.product(*(grid[p] for p in params)):
+            changes = {(PARAMETERS[p][1], PARAMETERS[p][2]): v for p, v in zip(params, point)}
+            counts = sw.counts(changes)
+            rows.append({"decision": decision, **dict(zip(params, point)),
+                         "patients": sum(counts.values()), **counts})
+    return rows
+
+
+def main(argv=None):
+    from . import cli
+
+    parser = argparse.ArgumentParser(prog="python -m prostate_core.sweep", description=__doc__.splitlines()[0])
+    parser.add_argument("src", help="cohort .csv or .parquet file (columns as for prostate_core.cli)")
+    for param, (decision, name, current) in PARAMETERS.items():
+        parser.add_argument("--" + param.replace("_", "-"), type=float, nargs="+", default=[current],
+                            metavar="X", help=f"{decision}: values for the {name} threshold {current:g}")
+    parser.add_argument("--batch-rows", type=int, default=1_000_000)
+    parser.add_argument("-o", "--output", help="write the table as CSV (default: stdout)")
+    args = parser.parse_args(argv)
+
+    grid = {param: getattr(args, param) for param in PARAMETERS}
+    start = time.perf_counter()
+    sw = sweeps(grid)
+    for batch in cli.iter_batches(args.src, args.batch_rows):
+        names = set(batch.schema.names)
+        columns = {name: cli.batch_column(batch, name) for name in cohort.SIDEBAR_COLUMNS if name in names}
+        for decision, inputs in rule_inputs(columns).items():
+            if decision in sw:
+                sw[decision].add(inputs)
+    binned = time.perf_counter()
+    rows = table(sw, grid)
+    done = time.perf_counter()
+
+    fields = ["decision", *PARAMETERS, "patients"]
+    for row in rows:
+        fields += [k for k in row if k not in fields]
+    fh = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(fh, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    print(f"cohort binned in {binned - start:.2f}s, {len(rows)} grid points in {done - binned:.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
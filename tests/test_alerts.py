@@ -0,0 +1,57 @@
+import datetime
+import json
+import math
+
+import pytest
+
+from prostate_core import alerts, kinetics
+from prostate_core.codes import PHASE_BCR, PRIMARY_RP
+
+# RP, ISUP 1: slow rise (rec_bcr_low), then PSADT drops below 9 months (EMBARK);
+# dates and timestamps mixed as in a real lab feed
+FEED = [
+    (datetime.date(2024, 1, 1), 0.20),
+    (datetime.datetime(2024, 7, 1, 8), 0.21),
+    (datetime.date(2024, 10, 1), 0.60),
+    (datetime.datetime(2024, 12, 1, 10, 30), 1.50),
+]
+
+
+def test_trend_matches_full_refit_on_mixed_times():
+    times = [t for t, _ in FEED]
+    trend = None
+    for t, (_, psa) in zip(times, FEED):
+        t = kinetics.to_days(t)
+        trend = trend or alerts.PsaTrend(t)
+        trend.add(t, psa)
+    psadt, velocity = kinetics.psa_kinetics(times, [psa for _, psa in FEED])
+    assert trend.psadt() == pytest.approx(psadt)
+    assert trend.velocity() == pytest.approx(velocity)
+    assert math.isfinite(psadt) and psadt < 9
+
+
+def test_alert_on_mixed_date_and_timestamp_feed():
+    stream = alerts.AlertStream(default={"phase": PHASE_BCR, "primary_idx": PRIMARY_RP})
+    fired = [a for a in (stream.push(1, t, psa) for t, psa in FEED) if a]
+    assert [(a.old_key, a.new_key, a.time, a.n_psa) for a in fired] == [
+        ("rec_bcr_low", "rec_bcr_embark", FEED[2][0], 3)]
+
+
+def test_cli_prints_alerts(tmp_path, capsys):
+    feed = tmp_path / "feed.csv"
+    rows = "".join(f"1,{t.isoformat()},{psa}\n" for t, psa in FEED)  # dates and timestamps
+    feed.write_text("patient_id,date,psa\n" + rows, encoding="utf-8")
+    assert alerts.main([str(feed)]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(a["old_key"], a["new_key"], a["time"]) for a in lines] == [
+        ("rec_bcr_low", "rec_bcr_embark", "2024-10-01")]
+
+
+def test_memory_is_bounded():
+    stream = alerts.AlertStream(max_patients=10, max_idle_days=30)
+    for pid in range(50):
+        stream.push(pid, pid, 1.0)
+    assert len(stream) == 10
+    stream.push(99, 1000, 1.0)
+    assert list(stream.trends) == [99]
+    assert stream.evicted == 50
@@ -0,0 +1,67 @@
+import csv
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from prostate_core import cli, cohort
+from prostate_core.codes import PHASE_BCR, PHASE_DIAG, PRIMARY_EBRT
+
+# rows of the first CSV block (1 MB at this batch size) are all typed alike
+FIRST_BLOCK = 80_000
+ROWS = 100_000
+
+
+def _write(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(rows[0].keys())
+        for row in rows:
+            writer.writerow(row.values())
+
+
+def _score(path, tmp_path):
+    out = tmp_path / "out.parquet"
+    cli.score_file(str(path), str(out), batch_rows=1000)
+    return pq.read_table(out)
+
+
+def test_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5000
+    columns = {
+        "phase": rng.integers(0, 6, n),
+        "psa": rng.uniform(0, 40, n).round(2),
+        "vol": rng.uniform(10, 90, n).round(1),
+        "isup_idx": rng.integers(0, 5, n),
+        "t_idx": rng.integers(0, 4, n),
+        "pirads_idx": rng.integers(0, 3, n),
+        "dre_abnormal": rng.random(n) < 0.3,
+        "primary_idx": rng.integers(0, 2, n),
+        "psadt": rng.uniform(1, 30, n).round(1),
+        "interval": rng.uniform(0, 40, n).round(1),
+        "prior_idx": rng.integers(0, 4, n),
+    }
+    path = tmp_path / "in.csv"
+    _write(path, [{"patient_id": i, **{k: v[i].item() for k, v in columns.items()}} for i in range(n)])
+
+    table = _score(path, tmp_path)
+    assert table.column("patient_id").to_pylist() == list(range(n))
+    expected = cohort.decode(cohort.score_sidebar(columns))
+    assert table.column("rec_key").to_pylist() == list(expected)
+
+
+def test_csv_types_do_not_drift_after_first_block(tmp_path):
+    # interval: whole months in the first block, 12.5 later (was inferred as
+    # int64 and failed); psa, vol: blank in the first block (inferred as null)
+    rows = [{"phase": PHASE_BCR, "primary_idx": PRIMARY_EBRT, "psadt": 10.0,
+             "interval": 20 if i < FIRST_BLOCK else 12.5, "psa": "", "vol": ""} for i in range(ROWS)]
+    rows += [{"phase": PHASE_DIAG, "primary_idx": 0, "psadt": "", "interval": "", "psa": 6.0, "vol": 40.0}] * 10
+    path = tmp_path / "drift.csv"
+    _write(path, rows)
+
+    table = _score(path, tmp_path)
+    keys = table.column("rec_key").to_pylist()
+    assert table.num_rows == ROWS + 10
+    assert set(keys[:FIRST_BLOCK]) == {"rec_bcr_low"}
+    assert set(keys[FIRST_BLOCK:ROWS]) == {"rec_bcr_embark"}  # EBRT, interval < 18 months
+    assert table.column("psad").to_pylist()[ROWS:] == [0.15] * 10
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+
+from prostate_core import cohort, rules
+
+
+def test_score_sidebar_matches_score_patient():
+    rng = np.random.default_rng(0)
+    n = 20_000
+
+    def pick(values):
+        return np.asarray(values)[rng.integers(0, len(values), n)]
+
+    columns = {
+        "phase": rng.integers(0, 6, n),
+        "psa": pick([0.0, 4.0, 9.999, 10.0, 10.001, 15.0, 15.001, 20.0, 20.001, math.nan]),
+        "vol": pick([0.0, 40.0, 66.67, 100.0, 150.0, math.nan]),
+        "isup_idx": rng.integers(0, 5, n),
+        "t_idx": rng.integers(0, 4, n),
+        "pirads_idx": rng.integers(0, 3, n),
+        "dre_abnormal": rng.random(n) < 0.3,
+        "fam_hist": rng.random(n) < 0.3,
+        "primary_idx": rng.integers(0, 2, n),
+        "psadt": pick([0.0, 8.999, 9.0, 9.001, 10.0, 12.0, 12.001, 30.0, math.nan]),
+        "interval": pick([0.0, 18.0, 18.001, 40.0, math.nan]),
+        "n_idx": rng.integers(0, 2, n),
+        "m_idx": rng.integers(0, 2, n),
+        "high_vol": rng.random(n) < 0.5,
+        "prior_idx": rng.integers(0, 4, n),
+    }
+    keys = cohort.decode(cohort.score_sidebar(columns)).tolist()
+    for i in range(n):
+        record = {name: col[i].item() for name, col in columns.items()}
+        assert keys[i] == cohort.score_patient(record), record
+
+
+def test_score_cohort_matches_scalar_rules():
+    phase = np.array([cohort.PHASE_DIAG, cohort.PHASE_LOCAL, cohort.PHASE_BCR, cohort.PHASE_LA])
+    psa = np.array([math.nan, 15.0, math.nan, math.nan])
+    psad = np.array([0.15, math.nan, math.nan, math.nan])
+    codes = cohort.score_cohort(phase, psa, [0, 0, 3, 0], [0, 1, 0, 0], [1, 0, 0, 0], psad,
+                                [False] * 4, [False] * 4, [0, 0, 1, 0], [math.nan, math.nan, 13.0, math.nan],
+                                [math.nan, math.nan, 19.0, math.nan])
+    assert cohort.decode(codes).tolist() == [
+        rules.DIAGNOSIS.scalar(1, 0.15, False, False),
+        rules.LOCALIZED.scalar(15.0, 0, 1),
+        rules.BCR.scalar(1, 13.0, 3, 19.0),
+        None,
+    ]
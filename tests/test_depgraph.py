@@ -0,0 +1,66 @@
+import pytest
+
+from prostate_core import depgraph, rules
+from prostate_core.codes import PIRADS_3
+
+
+@pytest.fixture
+def graph():
+    graph = depgraph.Graph()
+    graph.add("psad", lambda psa, vol: psa / vol if vol > 0 else 0.0, "psa", "vol")
+    graph.add("diagnosis", rules.DIAGNOSIS.scalar, "pirads", "psad", "dre", "fam")
+    graph.add("label", str.upper, "diagnosis")
+    return graph
+
+
+def _run(graph, store, **inputs):
+    run = graph.bind(store)
+    run.set(**inputs)
+    return run
+
+
+def test_recomputes_only_what_changed(graph):
+    store = {}
+    inputs = {"psa": 6.0, "vol": 40.0, "pirads": PIRADS_3, "dre": False, "fam": False}
+    run = _run(graph, store, **inputs)
+    assert run["label"] == rules.DIAGNOSIS.scalar(PIRADS_3, 0.15, False, False).upper()
+    assert run.recomputed == ["psad", "diagnosis", "label"]
+
+    run = _run(graph, store, **inputs)
+    run["label"]
+    assert run.recomputed == []
+
+    run = _run(graph, store, **dict(inputs, fam=True))
+    run["label"]
+    assert run.recomputed == ["diagnosis", "label"]
+
+
+def test_unchanged_value_stops_propagation(graph):
+    store = {}
+    run = _run(graph, store, psa=6.0, vol=40.0, pirads=PIRADS_3, dre=False, fam=False)
+    run["label"]
+    # same PSA density, same decision: only psad is evaluated again
+    run = _run(graph, store, psa=3.0, vol=20.0, pirads=PIRADS_3, dre=False, fam=False)
+    run["label"]
+    assert run.recomputed == ["psad"]
+
+
+def test_values_of_another_type_count_as_changed():
+    graph = depgraph.Graph()
+    graph.add("kind", lambda x: type(x).__name__, "x")
+    store = {}
+    assert _run(graph, store, x=1)["kind"] == "int"
+    assert _run(graph, store, x=1.0)["kind"] == "float"
+    assert _run(graph, store, x=True)["kind"] == "bool"
+
+
+def test_on_demand_and_errors(graph):
+    run = _run(graph, {}, psa=6.0, vol=40.0)
+    assert run["psad"] == 0.15
+    assert run.recomputed == ["psad"]
+    with pytest.raises(KeyError, match="input 'pirads' has not been set"):
+        run["diagnosis"]
+    with pytest.raises(ValueError, match="computed node"):
+        run.set(psad=0.2)
+    with pytest.raises(ValueError, match="already defined"):
+        graph.add("psad", max, "psa")
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from prostate_core import differential
+
+
+@pytest.fixture(params=sorted(differential.COMPARISONS))
+def name(request):
+    return request.param
+
+
+def test_evaluate_matches_scalar_rules(name):
+    old_rule, new_rule, mapping = differential.COMPARISONS[name]
+    comp = differential.Comparison(old_rule, new_rule, mapping)
+    _, columns = comp.enumerate()
+    old, new = comp.evaluate(columns)
+    for i, row in enumerate(zip(*(col.tolist() for col in columns.values()))):
+        args = dict(zip(columns, row))
+        assert comp.keys[old[i]] == mapping[old_rule.scalar(*(args[n] for n in old_rule.inputs))], args
+        assert comp.keys[new[i]] == new_rule.scalar(*(args[n] for n in new_rule.inputs)), args
+
+
+def test_regions_cover_every_disagreeing_cell(name):
+    comp = differential.Comparison(*differential.COMPARISONS[name])
+    index, columns = comp.enumerate()
+    old, new = comp.evaluate(columns)
+    regions, cells, bad = comp.regions()
+    assert cells == index.shape[1]
+    assert bad == int((old != new).sum()) > 0
+    assert regions and all(r["old"] != r["new"] for r in regions)
+
+
+def test_samples_disagree_only_inside_regions(name):
+    sampled = differential.Comparison(*differential.COMPARISONS[name]).sample(200_000, seed=1, workers=2)
+    assert sampled["samples"] == 200_000
+    assert 0 < sampled["disagree"] < 200_000
+    assert sampled["outside_regions"] == 0
+
+
+@pytest.mark.parametrize("name, region, old, new", [
+    ("localized", "psa <= 15, isup_idx = ISUP 1, t_idx = cT2b", "rec_as_extended", "rec_curative"),
+    ("bcr", "9 <= psadt, isup_idx in (ISUP 4, ISUP 5)", "rec_bcr_low", "rec_bcr_embark"),
+    ("bcr", "primary = EBRT, 12 < psadt, isup_idx in (ISUP 1, ISUP 2, ISUP 3), interval <= 18", "rec_bcr_low",
+     "rec_bcr_embark"),
+])
+def test_region_texts(name, region, old, new):
+    regions, _, _ = differential.Comparison(*differential.COMPARISONS[name]).regions()
+    assert {"region": region, "old": old, "new": new} in regions
+
+
+def test_main_reports_and_exits_like_diff(tmp_path, capsys):
+    out = tmp_path / "report.json"
+    assert differential.main(["--samples", "10000", "--only", "localized", "-o", str(out)]) == 1
+    report = json.loads(out.read_text())
+    assert list(report) == ["localized"]
+    assert report["localized"]["sampled"]["outside_regions"] == 0
+    assert "rec_multi_high -> rec_curative" in capsys.readouterr().out
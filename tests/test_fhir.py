@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from prostate_core import fhir, fhir_mock
+
+TIMEOUT = 30  # seconds; ingest must finish, not hang
+
+
+def _ingest(transport, ids=None, **client_args):
+    async def run():
+        client_args.setdefault("backoff", 0.0)
+        async with fhir.FhirClient("http://fhir.test", transport=transport, **client_args) as client:
+            return [result async for result in client.ingest(ids, batch_size=10)], client
+
+    return asyncio.run(asyncio.wait_for(run(), TIMEOUT))
+
+
+def _matches_truth(result):
+    truth = fhir_mock.truth(result.patient_id)
+    return all(fhir._same(a, b) for a, b in zip(result.patient.values(), truth.values()))
+
+
+def test_ingest_matches_mock_truth():
+    results, client = _ingest(httpx.ASGITransport(fhir_mock.create_app(95, error_rate=0.3)), retries=20)
+    assert sorted(int(r.patient_id) for r in results) == list(range(1, 96))
+    assert all(r.error is None for r in results)
+    assert all(_matches_truth(r) for r in results)
+    assert client.retried > 0
+
+
+def test_ingest_fails_each_patient_after_retries():
+    results, client = _ingest(httpx.ASGITransport(fhir_mock.create_app(40, error_rate=1.0)), ids=range(1, 31),
+                              retries=2)
+    assert len(results) == 30
+    assert all(isinstance(r.error, fhir.FhirError) and r.patient is None for r in results)
+    assert client.requests == 3 * 3 * 2  # 3 batches, 2 searches, 1 + 2 retries each
+
+
+def test_ingest_timeout_fails_the_batch():
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    results, _ = _ingest(httpx.MockTransport(handler), ids=[1, 2], retries=1)
+    assert [r.patient_id for r in results] == ["1", "2"]
+    assert all(isinstance(r.error, fhir.FhirError) for r in results)
+
+
+def _observation(pid, code, value, when="2024-01-01"):
+    return {"resourceType": "Observation", "status": "final", "subject": {"reference": f"Patient/{pid}"},
+            "code": {"coding": [{"system": fhir.LOCAL_SYSTEM, "code": code}]}, "effectiveDateTime": when,
+            "valueInteger": value}
+
+
+def _bundle(resources):
+    return {"resourceType": "Bundle", "type": "searchset", "entry": [{"resource": r} for r in resources]}
+
+
+def test_ingest_malformed_resources_fail_their_patient():
+    observations = [_observation(1, "isup-grade", 0), _observation(2, "pirads", 4, when="2024-13-45"),
+                    _observation(3, "pirads", 4), _observation(4, "pirads", 9)]
+
+    def handler(request):
+        if request.url.path == "/Observation":
+            return httpx.Response(200, json=_bundle(observations))
+        return httpx.Response(200, json=_bundle([]))
+
+    results = {r.patient_id: r for r in _ingest(httpx.MockTransport(handler), ids=[1, 2, 3, 4])[0]}
+    assert [pid for pid, r in sorted(results.items()) if r.error is not None] == ["1", "2", "4"]
+    assert all(isinstance(results[pid].error, ValueError) for pid in ("1", "2", "4"))
+    assert results["3"].patient["pirads_idx"] == fhir.pirads_idx(4)
+
+
+def test_ingest_invalid_json_fails_the_batch():
+    def handler(request):
+        if request.url.path == "/Procedure":
+            return httpx.Response(200, content=b"{not json")
+        return httpx.Response(200, json=_bundle([]))
+
+    results, _ = _ingest(httpx.MockTransport(handler), ids=[1, 2])
+    assert all(isinstance(r.error, fhir.FhirError) and "invalid JSON" in str(r.error) for r in results)
+
+
+def test_ingest_unexpected_error_does_not_hang():
+    def handler(request):
+        return httpx.Response(200, json={"resourceType": "Bundle", "entry": [{"resource": None}]})
+
+    results, _ = _ingest(httpx.MockTransport(handler), ids=range(1, 26))
+    assert len(results) == 25
+    assert all(r.error is not None for r in results)
+
+
+@pytest.mark.parametrize("score, code", [(1, fhir.PIRADS_1_2), (2, fhir.PIRADS_1_2), (3, fhir.PIRADS_3),
+                                         (5, fhir.PIRADS_4_5)])
+def test_pirads_idx(score, code):
+    assert fhir.pirads_idx(score) == code
+
+
+@pytest.mark.parametrize("score", [0, 6])
+def test_pirads_idx_out_of_range(score):
+    with pytest.raises(ValueError):
+        fhir.pirads_idx(score)
+
+
+def test_bench_against_mock_server(tmp_path, capsys):
+    output = tmp_path / "inputs.csv"
+    assert fhir.main(["bench", "--patients", "60", "--error-rate", "0.05", "-o", str(output)]) == 0
+    assert len(output.read_text().splitlines()) == 61
+    assert "60 of 60 patients match" in capsys.readouterr().err
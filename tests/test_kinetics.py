@@ -0,0 +1,62 @@
+import datetime
+import math
+
+import numpy as np
+import pytest
+
+from prostate_core import kinetics
+
+START = datetime.date(2024, 1, 1)
+
+
+def _series(psadt_months, n=5, step_days=60):
+    days = [i * step_days for i in range(n)]
+    return days, [0.5 * 2 ** (d / kinetics.DAYS_PER_MONTH / psadt_months) for d in days]
+
+
+def test_exact_doubling_time():
+    days, psa = _series(6.0)
+    psadt, velocity = kinetics.psa_kinetics(days, psa)
+    assert psadt == pytest.approx(6.0)
+    assert velocity > 0
+
+
+def test_flat_and_short_series():
+    assert kinetics.psa_kinetics([0, 30, 60], [2.0, 2.0, 2.0])[0] == math.inf
+    assert all(math.isnan(v) for v in kinetics.psa_kinetics([0], [2.0]))
+    assert all(math.isnan(v) for v in kinetics.psa_kinetics([0, 0], [1.0, 2.0]))
+
+
+def test_time_types_count_from_one_epoch():
+    day = kinetics.to_days(START)
+    assert day == 19723.0
+    assert kinetics.to_days(datetime.datetime(2024, 1, 1, 12)) == day + 0.5
+    assert kinetics.to_days(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)) == day
+    assert kinetics.to_days(np.datetime64("2024-01-01T06:00")) == day + 0.25
+
+
+def test_mixed_dates_and_datetimes():
+    times = [START, datetime.datetime(2024, 4, 1, 9), datetime.date(2024, 7, 1)]
+    psadt, _ = kinetics.psa_kinetics(times, [1.0, 2.0, 4.0])
+    as_dates, _ = kinetics.psa_kinetics([START, datetime.date(2024, 4, 1), datetime.date(2024, 7, 1)], [1.0, 2.0, 4.0])
+    assert psadt == pytest.approx(as_dates, rel=1e-2)
+    assert 2.9 < psadt < 3.1
+
+    ids, n, grouped_psadt, _ = kinetics.grouped([7, 7, 7], np.array(times, dtype=object), [1.0, 2.0, 4.0])
+    assert ids.tolist() == [7] and n.tolist() == [3]
+    assert grouped_psadt[0] == pytest.approx(psadt)
+
+
+def test_grouped_matches_per_patient():
+    rng = np.random.default_rng(0)
+    ids = rng.integers(0, 200, 3000)
+    days = rng.uniform(0, 1500, 3000).round()
+    psa = rng.lognormal(0, 1, 3000)
+    psa[rng.random(3000) < 0.05] = np.nan
+    out_ids, n, psadt, velocity = kinetics.grouped(ids, days, psa)
+    for pid, count, dt, vel in zip(out_ids, n, psadt, velocity):
+        sel = ids == pid
+        expected = kinetics.psa_kinetics(days[sel].tolist(), [v if v == v else None for v in psa[sel].tolist()])
+        assert count == np.count_nonzero(psa[sel] > 0)
+        assert dt == pytest.approx(expected[0], rel=1e-9, nan_ok=True)
+        assert vel == pytest.approx(expected[1], rel=1e-9, abs=1e-12, nan_ok=True)
@@ -0,0 +1,56 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from prostate_core import cohort, lookup, rules
+from prostate_core.codes import NO_REC, OUTCOME_CODES, REC_CODES
+from prostate_core.spec import BOOL, FLOAT, representatives
+
+
+def _grid(rule):
+    breaks = rule.thresholds()
+    probes = []
+    for name, kind in rule.inputs.items():
+        if kind is FLOAT:
+            near = [p for b in breaks[name] for p in (math.nextafter(b, -math.inf), math.nextafter(b, math.inf))]
+            probes.append(representatives(breaks[name]) + near)
+        else:
+            probes.append([False, True] if kind is BOOL else list(kind))
+    return list(itertools.product(*probes))
+
+
+@pytest.mark.parametrize("name", sorted(lookup.TABLES))
+def test_table_matches_rule(name):
+    table = lookup.TABLES[name]
+    for args in _grid(table.rule):
+        assert table(*args) == table.rule.scalar(*args), args
+
+
+@pytest.mark.parametrize("name", sorted(lookup.TABLES))
+def test_codes_match_scalar_rule(name):
+    table = lookup.TABLES[name]
+    grid = _grid(table.rule)
+    columns = [np.array(col) for col in zip(*grid)]
+    assert table.codes(*columns).tolist() == [OUTCOME_CODES[table.rule.scalar(*args)] for args in grid]
+
+
+def test_cohort_scores_through_tables():
+    rng = np.random.default_rng(0)
+    n = 1000
+    columns = [rng.integers(0, 2, n), rng.choice([5.0, 9.0, 12.0, 15.0, np.nan], n), rng.integers(0, 5, n),
+               rng.choice([12.0, 18.0, 24.0], n)]
+    expected = [OUTCOME_CODES[rules.BCR.scalar(*args)] for args in zip(*[c.tolist() for c in columns])]
+    assert cohort.bcr_codes(*columns).tolist() == expected
+
+
+def test_codes_out_of_range_is_no_rec():
+    table = lookup.TABLES["get_bcr_risk"]
+    codes = table.codes(np.array([0, 2, -1, 1]), np.full(4, 20.0), np.array([0, 0, 0, 5]), np.full(4, 24.0))
+    assert codes.tolist() == [REC_CODES["rec_bcr_low"], NO_REC, NO_REC, NO_REC]
+
+
+def test_call_outside_domain_falls_back_to_rule():
+    table = lookup.TABLES["calculate_risk_local"]
+    assert table(12.0, 7, 0) == table.rule.scalar(12.0, 7, 0)
@@ -0,0 +1,71 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from prostate_core import catalog, mermaid_svg, pathways
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _diagrams():
+    codes = pathways.finite_diagrams(catalog.load("English")["prior_opts"])
+    return codes + [pathways.diagnosis(0.12), pathways.mcrpc("ADT + ARPI & <Docetaxel>")]
+
+
+def test_parse_shapes_and_labels():
+    direction, nodes, edges = mermaid_svg.parse(pathways.diagnosis(0.12))
+    assert direction == "TD"
+    assert nodes["Risk"] == ("Rotterdam Risk", "{")
+    assert nodes["PSAD"] == ("PSAD 0.12", "{")
+    assert nodes["Start"] == ("Suspicion", "[")
+    assert ("PSAD", "Obs", "<0.10") in edges
+    assert ("Start", "Risk", "") in edges
+
+    _, nodes, edges = mermaid_svg.parse('graph LR\nA("quoted [text]") --> B --> C(round)')
+    assert nodes == {"A": ("quoted [text]", "("), "B": ("B", "["), "C": ("round", "(")}
+    assert [e[:2] for e in edges] == [("A", "B"), ("B", "C")]
+
+
+@pytest.mark.parametrize("code", _diagrams())
+def test_every_pathway_renders_as_svg(code):
+    root = ET.fromstring(mermaid_svg.to_svg(code))
+    _, nodes, edges = mermaid_svg.parse(code)
+    labels = [text.text for text in root.iter(SVG + "text")]
+    assert sorted(t for t, _ in nodes.values()) == sorted(labels[len(labels) - len(nodes):])
+    assert len(list(root.iter(SVG + "line"))) == len(edges)
+
+
+def test_layers_follow_direction():
+    def size(code):
+        root = ET.fromstring(mermaid_svg.to_svg(code))
+        return float(root.get("width")), float(root.get("height"))
+
+    width, height = size("graph TD\nA --> B --> C --> D")
+    assert height > width
+    width, height = size("graph LR\nA --> B --> C --> D")
+    assert width > height
+
+
+@pytest.mark.parametrize("code", ["", "sequenceDiagram\nA->>B: hi", "graph TD\nA --- B", "graph TD\nA --> "])
+def test_syntax_errors(code):
+    with pytest.raises(mermaid_svg.MermaidSyntaxError):
+        mermaid_svg.to_svg(code)
+
+
+def test_render_caches_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("MERMAID_SVG_CACHE_DIR", str(tmp_path))
+    code = "graph TD\nDiskCache --> Written"
+    svg = mermaid_svg.render(code)
+    assert svg == mermaid_svg.to_svg(code)
+    assert (tmp_path / f"{mermaid_svg.cache_key(code)}.svg").read_text() == svg
+    assert mermaid_svg.render(code) is svg
+
+    # another process finds the rendered file
+    code = "graph TD\nDiskCache --> Read"
+    (tmp_path / f"{mermaid_svg.cache_key(code)}.svg").write_text("<svg/>")
+    assert mermaid_svg.render(code) == "<svg/>"
+
+
+def test_prerender_counts():
+    codes = pathways.finite_diagrams()
+    assert mermaid_svg.prerender(codes) == len(codes)
@@ -0,0 +1,75 @@
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from prostate_core import metrics
+
+
+def _sample(text, name, **labels):
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{{wanted}}} "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no sample {name}{{{wanted}}}")
+
+
+def test_stages_add_up_to_total():
+    registry = metrics.Registry()
+    timer = metrics.RerunTimer(registry)
+    timer.mark("sidebar")
+    with timer.stage("translation"):
+        time.sleep(0.01)
+    timer.mark("main")
+    with timer.stage("decision"):
+        with timer.stage("inner"):
+            time.sleep(0.005)
+    assert not timer.finished
+    stages = timer.finish(phase="bcr", lang="de")
+    assert timer.finished
+    assert set(stages) == {"setup", "sidebar", "translation", "main", "decision", "inner", "total"}
+    assert stages["translation"] >= 0.01 and stages["inner"] >= 0.005
+    assert stages["decision"] < 0.005  # exclusive of the nested stage
+    assert sum(v for k, v in stages.items() if k != "total") == pytest.approx(stages["total"])
+
+
+def test_exposition_is_cumulative():
+    registry = metrics.Registry()
+    registry.observe({"main": 0.003, "total": 0.02}, "diagnosis", "en")
+    registry.observe({"main": 0.2, "total": 0.3}, "diagnosis", "en")
+    text = registry.exposition()
+    assert text.startswith("# HELP prostate_app_stage_seconds ")
+    name = "prostate_app_stage_seconds"
+    assert _sample(text, f"{name}_bucket", stage="main", phase="diagnosis", lang="en", le="0.0025") == 0
+    assert _sample(text, f"{name}_bucket", stage="main", phase="diagnosis", lang="en", le="0.005") == 1
+    assert _sample(text, f"{name}_bucket", stage="main", phase="diagnosis", lang="en", le="+Inf") == 2
+    assert _sample(text, f"{name}_count", stage="main", phase="diagnosis", lang="en") == 2
+    assert _sample(text, f"{name}_sum", stage="main", phase="diagnosis", lang="en") == pytest.approx(0.203)
+
+
+def test_label_values_are_escaped():
+    registry = metrics.Registry()
+    registry.observe({"total": 0.1}, 'a"b', "x\\y")
+    assert 'phase="a\\"b",lang="x\\\\y"' in registry.exposition()
+
+
+def test_textfile_and_http(tmp_path):
+    registry = metrics.Registry()
+    registry.observe({"total": 0.1}, "bcr", "en")
+    path = tmp_path / "prostate.prom"
+    registry.write_textfile(str(path))
+    assert path.read_text() == registry.exposition()
+    assert list(tmp_path.iterdir()) == [path]
+
+    server = registry.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics") as resp:
+            assert resp.headers["Content-Type"] == metrics.CONTENT_TYPE
+            assert resp.read().decode() == registry.exposition()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pytest
+
+from prostate_core import cohort, decision, record
+from prostate_core.codes import GENETIC_BRCA, GENETIC_UNKNOWN, PHASE_BCR, PRIMARY_EBRT, PRIMARY_RP
+
+
+def _columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "phase": rng.integers(0, 6, n),
+        "psa": np.where(rng.random(n) < 0.1, math.nan, rng.uniform(0, 30, n)),
+        "vol": rng.uniform(10, 100, n),
+        "isup_idx": rng.integers(0, 5, n),
+        "t_idx": rng.integers(0, 4, n),
+        "pirads_idx": rng.integers(0, 3, n),
+        "dre_abnormal": rng.random(n) < 0.3,
+        "primary_idx": rng.integers(0, 2, n),
+        "psadt": rng.uniform(0, 30, n),
+        "interval": rng.uniform(0, 30, n),
+        "m_idx": rng.integers(0, 2, n),
+        "high_vol": rng.random(n) < 0.5,
+        "prior_idx": rng.integers(0, 4, n),
+        "genetic": rng.integers(0, 5, n),
+    }
+
+
+def test_patient_defaults_and_mapping():
+    patient = record.Patient(phase=PHASE_BCR, psadt=8, dre_abnormal=1)
+    assert patient["psadt"] == 8.0 and isinstance(patient["psadt"], float)
+    assert patient["dre_abnormal"] is True
+    assert math.isnan(patient["psa"])
+    assert patient["primary_idx"] == PRIMARY_RP
+    assert patient["genetic"] == GENETIC_UNKNOWN
+    assert list(patient) == list(record.FIELDS)
+    assert dict(patient, psadt=12.0)["psadt"] == 12.0
+    assert patient.get("missing") is None
+
+
+def test_patient_rejects_unknown_fields_and_codes():
+    with pytest.raises(TypeError, match="unknown patient fields"):
+        record.Patient(psa_level=4.0)
+    with pytest.raises(ValueError, match="out of range"):
+        record.Patient(isup_idx=-1)
+    with pytest.raises(ValueError, match="out of range"):
+        record.coerce("genetic", 256)
+
+
+def test_from_columns_numpy_and_lists_agree():
+    columns = _columns(500)
+    from_numpy = record.PatientArray.from_columns(columns)
+    from_lists = record.PatientArray.from_columns({name: col.tolist() for name, col in columns.items()})
+    assert len(from_numpy) == 500
+    for name, col in from_numpy.columns().items():
+        assert np.array_equal(col, from_lists.columns()[name], equal_nan=True), name
+    assert from_numpy.nbytes == 44 * 500
+    assert from_numpy[3]["n_idx"] == 0  # missing column: default
+
+
+def test_from_columns_checks_codes_and_lengths():
+    with pytest.raises(ValueError, match="out of range"):
+        record.PatientArray.from_columns({"dre_abnormal": np.array([0, 2])})
+    with pytest.raises(ValueError, match="must be integers"):
+        record.PatientArray.from_columns({"isup_idx": np.array([0.0, 1.0])})
+    with pytest.raises(ValueError, match="expected 2"):
+        record.PatientArray.from_columns({"phase": [0, 1], "psa": [1.0]})
+
+
+def test_append_and_rows_round_trip():
+    patients = record.PatientArray()
+    patients.append(phase=PHASE_BCR, primary_idx=PRIMARY_EBRT, psadt=8.0, high_vol=True, genetic=GENETIC_BRCA)
+    patients.append(record.Patient(psa=4.5))
+    assert repr(patients[0]) == repr(record.Patient(phase=PHASE_BCR, primary_idx=PRIMARY_EBRT, psadt=8.0,
+                                                    high_vol=True, genetic=GENETIC_BRCA))
+    assert patients[0]["high_vol"] is True
+    assert patients[1]["psa"] == 4.5
+
+
+def test_columns_are_views():
+    patients = record.PatientArray.from_columns(_columns(10))
+    patients.columns()["psa"][0] = 99.0
+    assert patients[0]["psa"] == 99.0
+
+
+def test_score_matches_score_patient():
+    patients = record.PatientArray.from_columns(_columns(5000))
+    keys = cohort.decode(patients.score()).tolist()
+    assert keys == [decision.score_patient(patients[i]) for i in range(len(patients))]
+
+
+def test_by_id():
+    patients = record.PatientArray.from_columns({"psa": [1.0, 2.0, 3.0]})
+    by_id = patients.by_id(["a", "b", "c"])
+    assert by_id["b"]["psa"] == 2.0
+    assert list(by_id) == ["a", "b", "c"]
+    with pytest.raises(ValueError, match="unique"):
+        patients.by_id(["a", "a", "c"])
@@ -0,0 +1,50 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from prostate_core import rules
+from prostate_core.spec import BOOL, FLOAT, Rule, representatives
+
+RULES = [value for value in vars(rules).values() if isinstance(value, Rule)]
+
+
+def _probes(kind, breaks):
+    if kind is FLOAT:
+        near = [p for b in breaks for p in (math.nextafter(b, -math.inf), math.nextafter(b, math.inf))]
+        return representatives(breaks) + near
+    if kind is BOOL:
+        return [False, True]
+    return list(kind)
+
+
+def _grid(rule):
+    """Every combination of inputs around each threshold, NaN included."""
+    breaks = rule.thresholds()
+    return list(itertools.product(*[_probes(kind, breaks.get(name)) for name, kind in rule.inputs.items()]))
+
+
+def _outcome_codes(rule):
+    outcomes = sorted({outcome for _, outcome in rule.branches} | {rule.default}, key=str)
+    return {outcome: i for i, outcome in enumerate(outcomes)}
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: rule.name)
+def test_vectorized_matches_scalar(rule):
+    grid = _grid(rule)
+    codes = _outcome_codes(rule)
+    columns = [np.array(col) for col in zip(*grid)]
+    got = rule.vectorized(codes)(*columns)
+    assert got.tolist() == [codes[rule.scalar(*args)] for args in grid]
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: rule.name)
+def test_scalar_branch_matches_scalar(rule):
+    for args in _grid(rule):
+        branch = rule.scalar_branch(*args)
+        assert rule.scalar(*args) == (rule.default if branch is None else rule.branches[branch][1])
+
+
+def test_bcr_panel_embark_branch_is_psadt():
+    assert rules.BCR_PANEL.branches[rules.BCR_PANEL_EMBARK] == (("psadt", "<", 9), "rec_bcr_embark")
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from prostate_core import catalog, cohort, service
+
+client = TestClient(service.app)
+
+RESULT_FIELDS = {"patient_id", "phase", "rec_key", "psad"}
+
+
+def _patients(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {"patient_id": i, "phase": cohort.PHASE_KEYS[int(rng.integers(6))], "psa": float(rng.uniform(0, 30)),
+         "vol": float(rng.uniform(10, 80)), "psadt": float(rng.uniform(0, 24)), "isup_idx": int(rng.integers(5)),
+         "pirads_idx": int(rng.integers(3)), "primary_idx": int(rng.integers(2)), "interval": float(rng.uniform(0, 30)),
+         "m_idx": int(rng.integers(2)), "prior_idx": int(rng.integers(4))}
+        for i in range(n)
+    ]
+
+
+def test_health():
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_score_schema():
+    response = client.post("/score?lang=de", json={"patient_id": "a1", "phase": "diagnosis", "psa": 6.0, "vol": 40.0,
+                                                   "pirads_idx": 2})
+    assert response.status_code == 200
+    assert response.json() == {"patient_id": "a1", "phase": "diagnosis", "rec_key": "rec_diag_biopsy",
+                               "psad": pytest.approx(0.15),
+                               "text": catalog.load("Deutsch")["rec_diag_biopsy"]}
+
+
+def test_batch_matches_single():
+    patients = _patients(300)
+    body = client.post("/score/batch?lang=es", json={"patients": patients}).json()
+    assert set(body) == {"results", "texts"}
+    assert len(body["results"]) == len(patients)
+    for patient, result in zip(patients, body["results"]):
+        single = client.post("/score?lang=es", json=patient).json()
+        assert set(result) == RESULT_FIELDS
+        assert result == {k: v for k, v in single.items() if k != "text"}
+        assert body["texts"].get(result["rec_key"]) == single["text"]
+    assert set(body["texts"]) == {r["rec_key"] for r in body["results"]} - {None}
+
+
+@pytest.mark.parametrize("patient, message", [
+    ({"phase": "diagnosis", "psa": 4.0}, "requires vol"),
+    ({"phase": "bcr"}, "requires psadt"),
+    ({"phase": "localized", "psa": 5.0, "isup_idx": 5}, "less than or equal to 4"),
+    ({"phase": "localized", "psa": -1.0}, "greater than or equal to 0"),
+    ({"phase": "localized", "psa": 5.0, "gleason": 7}, "Extra inputs"),
+    ({"phase": "screening"}, "Input should be"),
+])
+def test_invalid_patient_is_422(patient, message):
+    for path, body in (("/score", patient), ("/score/batch", {"patients": [patient]})):
+        response = client.post(path, json=body)
+        assert response.status_code == 422
+        assert message in str(response.json()["detail"])
+
+
+def test_unknown_language_is_422():
+    assert client.post("/score?lang=fr", json={"phase": "nmcrpc", "psadt": 8.0}).status_code == 422
+
+
+def test_batch_size_limit():
+    patient = {"phase": "locally_advanced"}
+    assert client.post("/score/batch", json={"patients": [patient] * service.MAX_BATCH}).status_code == 200
+    response = client.post("/score/batch", json={"patients": [patient] * (service.MAX_BATCH + 1)})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from prostate_core import cdc, cohort, record, rescore, store as store_mod
+from prostate_core.codes import OUTCOME_CODES
+
+N = 20_000
+# code field -> number of codes
+DOMAINS = {"phase": 6, "isup_idx": 5, "t_idx": 4, "pirads_idx": 3, "primary_idx": 2, "n_idx": 2, "m_idx": 2,
+           "prior_idx": 4, "genetic": 5}
+# measurement -> values on and around the rule thresholds
+MEASUREMENTS = {
+    "psa": [0.5, 4.0, 10.0, 12.0, 15.0, 20.0, 25.0, math.nan],
+    "vol": [0.0, 40.0, 60.0, 100.0],
+    "psadt": [3.0, 9.0, 10.0, 12.0, 20.0, math.nan],
+    "interval": [6.0, 12.0, 18.0, 20.0, 24.0, 30.0],
+}
+# rule input -> store column, where the names differ
+COLUMN = {"pirads": "pirads_idx", "primary": "primary_idx", "prior": "prior_idx"}
+
+
+def _random_value(rng, field):
+    if field in MEASUREMENTS:
+        values = MEASUREMENTS[field]
+        return values[rng.integers(len(values))] if rng.random() < 0.7 else float(rng.uniform(0, 40))
+    if field in DOMAINS:
+        return int(rng.integers(DOMAINS[field]))
+    return bool(rng.random() < 0.5)
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    columns = {"patient_id": 1000 + rng.permutation(N)}
+    for field in record.FIELDS:
+        columns[field] = np.array([_random_value(rng, field) for _ in range(N)])
+    src = tmp_path / "cohort.parquet"
+    pq.write_table(pa.table(columns), src)
+    store_mod.build(str(src), str(tmp_path / "cohort.store"), batch_rows=7000)
+    return store_mod.CohortStore(str(tmp_path / "cohort.store"))
+
+
+def _columns(store):
+    return {name: np.array(store.column(name)) for name in record.FIELDS}
+
+
+def _check_bitmaps(store):
+    for name in store_mod.INDEXED:
+        col = np.asarray(store.column(name))
+        assert sorted(store.values(name)) == np.unique(col).tolist(), name
+        for value in store.values(name):
+            assert np.array_equal(store.bitmap(name, value).rows(), np.flatnonzero(col == value)), (name, value)
+
+
+def test_build_matches_score_sidebar(store):
+    assert np.array_equal(store.column("rec"), cohort.score_sidebar(_columns(store)))
+    _check_bitmaps(store)
+
+
+def _full_rescore(columns, thresholds=None):
+    """``rec`` of every patient from scratch, with ``{rule name: {(input, old): new}}`` applied."""
+    codes = cohort.score_sidebar(columns)
+    for name, changes in (thresholds or {}).items():
+        rule, phase = rescore.RULES[name]
+        rule = rule.with_thresholds(changes)
+        sel = np.flatnonzero(columns["phase"] == phase)
+        inputs = [cohort.psa_density(columns["psa"][sel], columns["vol"][sel]) if inp == "psad"
+                  else columns[COLUMN.get(inp, inp)][sel] for inp in rule.inputs]
+        codes[sel] = rule.vectorized(OUTCOME_CODES)(*inputs)
+    return codes
+
+
+def test_rescore_matches_full_rescore(store):
+    columns = _columns(store)
+    before = np.array(store.column("rec"))
+
+    flips = rescore.rescore(store, "get_bcr_risk", "interval", 18, 24)
+    expected = _full_rescore(columns, {"get_bcr_risk": {("interval", 18): 24}})
+    assert np.array_equal(flips.rows, np.flatnonzero(before != expected))
+    rescore.apply(store, flips)
+    assert np.array_equal(store.column("rec"), expected)
+
+    # the second change of a cut-off starts from the applied one
+    rescore.apply(store, rescore.rescore(store, "get_bcr_risk", "interval", 24, 12))
+    rescore.apply(store, rescore.rescore(store, "get_diagnosis_rec", "psad", 0.15, 0.2))
+    thresholds = {"get_bcr_risk": {("interval", 18): 12}, "get_diagnosis_rec": {("psad", 0.15): 0.2}}
+    assert np.array_equal(store.column("rec"), _full_rescore(columns, thresholds))
+    assert store.meta["thresholds"] == {"get_bcr_risk": [["interval", 18.0, 12.0]],
+                                        "get_diagnosis_rec": [["psad", 0.15, 0.2]]}
+    _check_bitmaps(store)
+
+
+def test_rescore_rejects_merging_cut_offs(store):
+    # the BCR panel compares PSADT against 9 and 12
+    with pytest.raises(ValueError, match="already compared against 9"):
+        rescore.rescore(store, "get_bcr_risk", "psadt", 12, 9)
+    rescore.apply(store, rescore.rescore(store, "get_bcr_risk", "psadt", 12, 10))
+    with pytest.raises(ValueError, match="already compared against 10"):
+        rescore.rescore(store, "get_bcr_risk", "psadt", 9, 10)
+    rescore.apply(store, rescore.rescore(store, "get_bcr_risk", "psadt", 9, 8))
+
+    thresholds = {"get_bcr_risk": {("psadt", 12): 10, ("psadt", 9): 8}}
+    assert np.array_equal(store.column("rec"), _full_rescore(_columns(store), thresholds))
+    assert store.meta["thresholds"] == {"get_bcr_risk": [["psadt", 12.0, 10.0], ["psadt", 9.0, 8.0]]}
+
+
+def test_cdc_matches_full_rescore(store):
+    rng = np.random.default_rng(1)
+    columns = _columns(store)
+    ids = np.asarray(store.column("patient_id"))
+    rescore.apply(store, rescore.rescore(store, "get_bcr_risk", "interval", 18, 24))
+    thresholds = {"get_bcr_risk": {("interval", 18): 24}}
+
+    fields = list(record.FIELDS)
+    changes = []
+    for seq in range(1, 5001):
+        row = int(rng.integers(N))
+        field = fields[rng.integers(len(fields))]
+        value = _random_value(rng, field)
+        changes.append(cdc.Change(int(ids[row]), field, value, seq))
+        columns[field][row] = value
+    changes.append(cdc.Change(10 ** 9, "psa", 5.0, 5001))  # not in the store
+
+    scorer = cdc.IncrementalScorer(store)
+    before = np.array(store.column("rec"))
+    changed = []
+    for start in range(0, len(changes), 1000):
+        batch = scorer.apply(changes[start:start + 1000])
+        changed += batch.changed
+    assert batch.unknown == [10 ** 9]
+    assert scorer.seq == 5001
+
+    expected = _full_rescore(columns, thresholds)
+    for name in record.FIELDS:
+        assert np.array_equal(store.column(name), columns[name], equal_nan=True), name
+    assert np.array_equal(store.column("rec"), expected)
+    flipped = np.flatnonzero(before != expected)
+    assert {pid for pid, _, _ in changed} >= set(ids[flipped].tolist())
+    _check_bitmaps(store)
+
+    # a change log is not applied twice
+    assert scorer.apply(changes[:1000]).changes == 0
+
+    # the boundary index follows the updated columns
+    rescore.apply(store, rescore.rescore(store, "get_bcr_risk", "interval", 24, 18))
+    assert np.array_equal(store.column("rec"), _full_rescore(columns))
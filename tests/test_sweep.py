@@ -0,0 +1,92 @@
+import collections
+import csv
+import itertools
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from prostate_core import cohort, sweep
+
+GRID = {"psad_high": [0.1, 0.15, 0.2], "psad_pirads3": [0.05, 0.1, 0.125], "as_psa_max": [10, 15, 20]}
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(0)
+    n = 20_000
+
+    def pick(values):
+        return np.asarray(values)[rng.integers(0, len(values), n)]
+
+    return {
+        "phase": rng.integers(0, 3, n),
+        "psa": np.where(rng.random(n) < 0.5, pick([4.0, 5.0, 10.0, 15.0, 20.0, math.nan]), rng.uniform(0, 30, n)),
+        "vol": pick([25.0, 40.0, 50.0, 100.0, 0.0]),
+        "isup_idx": rng.integers(0, 5, n),
+        "t_idx": rng.integers(0, 4, n),
+        "pirads_idx": rng.integers(0, 3, n),
+        "dre_abnormal": rng.random(n) < 0.3,
+        "fam_hist": rng.random(n) < 0.3,
+    }
+
+
+def _rescored(decision, inputs, changes):
+    rule = sweep.DECISIONS[decision].with_thresholds(changes)
+    rows = zip(*(inputs[name].tolist() for name in rule.inputs))
+    return dict(collections.Counter(rule.scalar(*row) for row in rows))
+
+
+def test_counts_match_rescoring_every_patient(columns):
+    sw = sweep.sweeps(GRID)
+    inputs = sweep.rule_inputs(columns)
+    for decision, sw_ in sw.items():
+        # two batches, as main reads them
+        sw_.add({name: col[::2] for name, col in inputs[decision].items()})
+        sw_.add({name: col[1::2] for name, col in inputs[decision].items()})
+
+    rows = sweep.table(sw, GRID)
+    assert len(rows) == 3 * 3 + 3
+    for row in rows:
+        decision = row["decision"]
+        params = [p for p in GRID if sweep.PARAMETERS[p][0] == decision]
+        changes = {sweep.PARAMETERS[p][1:]: row[p] for p in params}
+        expected = _rescored(decision, inputs[decision], changes)
+        counts = {out: row[out] for out in sweep.DECISIONS[decision].outcomes if row[out]}
+        assert counts == expected, (decision, changes)
+        assert row["patients"] == sum(expected.values())
+
+
+def test_unchanged_thresholds_match_score_sidebar(columns):
+    sw = sweep.sweeps({param: [current] for param, (_, _, current) in sweep.PARAMETERS.items()})
+    for decision, inputs in sweep.rule_inputs(columns).items():
+        sw[decision].add(inputs)
+    keys = cohort.decode(cohort.score_sidebar(columns))
+    for decision, phase in (("diagnosis", cohort.PHASE_DIAG), ("localized", cohort.PHASE_LOCAL)):
+        expected = collections.Counter(keys[columns["phase"] == phase].tolist())
+        assert sw[decision].counts() == {out: expected[out] for out in sweep.DECISIONS[decision].outcomes}
+
+
+def test_out_of_domain_codes_are_skipped():
+    sw = sweep.Sweep(sweep.DECISIONS["localized"])
+    sw.add({"psa": np.array([5.0, 5.0, 5.0]), "isup_idx": np.array([0, 5, -1]), "t_idx": np.array([0, 0, 0])})
+    assert sw.skipped == 2
+    assert sum(sw.counts().values()) == 1
+
+
+def test_main_writes_one_row_per_grid_point(columns, tmp_path):
+    src, out = tmp_path / "cohort.parquet", tmp_path / "sweep.csv"
+    pq.write_table(pa.table(columns), src)
+    argv = [str(src), "-o", str(out), "--batch-rows", "7000"]
+    for param, values in GRID.items():
+        argv += ["--" + param.replace("_", "-"), *map(str, values)]
+    assert sweep.main(argv) == 0
+    with open(out, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    diagnosis = [row for row in rows if row["decision"] == "diagnosis"]
+    assert [(float(r["psad_high"]), float(r["psad_pirads3"])) for r in diagnosis] == \
+        list(itertools.product(GRID["psad_high"], GRID["psad_pirads3"]))
+    assert sum(int(r["patients"]) for r in rows if r["decision"] == "localized") == \
+        3 * int((columns["phase"] == cohort.PHASE_LOCAL).sum())